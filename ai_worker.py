@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+
+from threats import ThreatMap
+
+# Milliseconds between checks for a finished move; about one frame at 60 fps
+POLL_INTERVAL_MS = 16
+
+
+class PositionSnapshot:
+    """Private copy of the game state a ComputerPlayer reads while choosing a move."""
+
+    def __init__(self, game_mode):
+        self.name = game_mode.name
+        self.board = game_mode.board.copy()
+        self.threats = ThreatMap(self.board)
+        sos_count = getattr(game_mode, "sos_count", None)
+        self.sos_count = dict(sos_count) if sos_count else None
+
+
+def stop_search(player, thread):
+    """Stops a player's search running on thread and waits for the thread to end."""
+    while thread.is_alive():
+        # Repeat the request in case the search had not started (and reset its flag) yet
+        player.stop()
+        thread.join(0.01)
+
+
+class ComputerMoveWorker:
+    """Computes computer moves on a background thread and hands them back to the Tk event loop."""
+
+    def __init__(self, root):
+        self.root = root
+        self.results = queue.Queue()
+        self.generation = 0  # Bumped on every request and cancel; stale results carry an old value
+        self.poll_id = None
+        self.thinking = None  # (player, thread) of the latest move request
+        self.pondering = None  # (player, thread) while a computer thinks on the human's time
+
+    def start_pondering(self, player, game_mode):
+        """Lets a computer search the current position while its human opponent decides."""
+        self.stop_pondering()
+        snapshot = PositionSnapshot(game_mode)
+        thread = threading.Thread(target=player.ponder, args=(snapshot,), name="computer-ponder", daemon=True)
+        self.pondering = (player, thread)
+        thread.start()
+
+    def stop_pondering(self):
+        """Stops pondering and waits for the search to let go of the engine."""
+        if self.pondering is None:
+            return
+        player, thread = self.pondering
+        self.pondering = None
+        stop_search(player, thread)
+
+    def request_move(self, player, game_mode, on_move, delay_ms=0):
+        """Starts thinking for the player at once and calls on_move(move) no sooner than delay_ms."""
+        self.cancel()  # Also ends pondering, so the engine's tables are free for this search
+        generation = self.generation
+        snapshot = PositionSnapshot(game_mode)
+        ready_at = time.perf_counter() + delay_ms / 1000
+
+        def think():
+            try:
+                result = player.choose_move(snapshot)
+            except Exception as error:  # Re-raised on the Tk thread so it is reported there
+                result = error
+            self.results.put((generation, result))
+
+        thread = threading.Thread(target=think, name="computer-move", daemon=True)
+        self.thinking = (player, thread)
+        thread.start()
+        self.poll_id = self.root.after(POLL_INTERVAL_MS, lambda: self.poll(generation, ready_at, on_move))
+
+    def poll(self, generation, ready_at, on_move):
+        """Delivers a finished move on the Tk thread, dropping results from cancelled requests."""
+        self.poll_id = None
+        while True:
+            try:
+                result_generation, result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if result_generation != generation:
+                continue
+            remaining_ms = int((ready_at - time.perf_counter()) * 1000)
+            if remaining_ms > 0:
+                # Thinking finished before the pacing delay; hold the move until it is due
+                self.poll_id = self.root.after(remaining_ms, lambda: self.deliver(generation, result, on_move))
+            else:
+                self.deliver(generation, result, on_move)
+            return
+        if generation == self.generation:
+            self.poll_id = self.root.after(POLL_INTERVAL_MS, lambda: self.poll(generation, ready_at, on_move))
+
+    def deliver(self, generation, result, on_move):
+        """Passes the move to the callback if its request is still current."""
+        self.poll_id = None
+        if generation != self.generation:
+            return
+        self.thinking = None
+        if isinstance(result, Exception):
+            raise result
+        on_move(result)
+
+    def cancel(self):
+        """Discards any pending move so it can never land on a later board.
+
+        Waits for the search to stop, so a new request never shares the engine with it.
+        """
+        self.stop_pondering()
+        self.generation += 1
+        if self.poll_id is not None:
+            self.root.after_cancel(self.poll_id)
+            self.poll_id = None
+        if self.thinking is not None:
+            player, thread = self.thinking
+            self.thinking = None
+            stop_search(player, thread)
@@ -0,0 +1,82 @@
+from board import Board, S, O
+
+
+class BitBoard(Board):
+    """Board that also keeps S and O bitboards and detects SOS with shift-and-AND."""
+
+    def __init__(self, size):
+        super().__init__(size)
+        # Each row gets one always-empty guard column so lines never wrap across rows
+        self.stride = size + 1
+        self.steps = (
+            1,                # Horizontal
+            self.stride,      # Vertical
+            self.stride + 1,  # Diagonal top-left to bottom-right
+            self.stride - 1   # Diagonal top-right to bottom-left
+        )
+        self.s_mask = 0
+        self.o_mask = 0
+
+    def bit_position(self, index):
+        """Returns the bitboard position for the given flat cell index."""
+        row, col = divmod(index, self.size)
+        return row * self.stride + col
+
+    def set_code(self, index, code):
+        """Stores a letter code in the cell and mirrors it in the bitboards."""
+        bit = 1 << self.bit_position(index)
+        self.s_mask &= ~bit
+        self.o_mask &= ~bit
+        if code == S:
+            self.s_mask |= bit
+        elif code == O:
+            self.o_mask |= bit
+        # Trackers run in the base class, after both representations agree
+        super().set_code(index, code)
+
+    def line_starts(self, step):
+        """Returns a mask of the first S of every SOS line along the given step."""
+        return self.s_mask & (self.o_mask >> step) & (self.s_mask >> (2 * step))
+
+    def count_all_sos(self):
+        """Counts every SOS line on the board."""
+        return sum(self.line_starts(step).bit_count() for step in self.steps)
+
+    def count_sos_at(self, row, col):
+        """Counts the SOS lines passing through the given position."""
+        position = row * self.stride + col
+        count = 0
+        for step in self.steps:
+            # A line through the cell starts at the cell or one or two steps before it
+            window = 0
+            for offset in range(3):
+                if position >= offset * step:
+                    window |= 1 << (position - offset * step)
+            count += (self.line_starts(step) & window).bit_count()
+        return count
+
+    def sos_lines_at(self, row, col):
+        """Returns the index triples through the given position that spell SOS."""
+        position = row * self.stride + col
+        size, stride = self.size, self.stride
+        lines = []
+        for step in self.steps:
+            starts = self.line_starts(step)
+            # Same order as the triple table: the cell is the last, middle, then first letter
+            for offset in (2, 1, 0):
+                start = position - offset * step
+                if start >= 0 and (starts >> start) & 1:
+                    lines.append(tuple(
+                        (p // stride) * size + p % stride
+                        for p in (start, start + step, start + 2 * step)
+                    ))
+        return lines
+
+    def copy(self):
+        """Returns an independent copy of the board."""
+        board = super().copy()
+        board.stride = self.stride
+        board.steps = self.steps
+        board.s_mask = self.s_mask
+        board.o_mask = self.o_mask
+        return board
@@ -0,0 +1,245 @@
+import functools
+import random
+
+EMPTY = 0
+S = 1
+O = 2
+
+# Maps the byte stored for a cell to the text shown on the board and back
+LETTERS = (" ", "S", "O")
+CODES = {" ": EMPTY, "S": S, "O": O}
+
+DIRECTIONS = (
+    (0, 1),  # Horizontal
+    (1, 0),  # Vertical
+    (1, 1),  # Diagonal top-left to bottom-right
+    (1, -1)  # Diagonal top-right to bottom-left
+)
+
+
+def cell_triples(size, row, col):
+    """Returns the in-bounds (a, b, c) index triples the cell at row, col belongs to."""
+    triples = []
+    for dx, dy in DIRECTIONS:
+        # The cell is the last, middle or first letter of the triple
+        for offset in (2, 1, 0):
+            start_row, start_col = row - offset * dx, col - offset * dy
+            end_row, end_col = start_row + 2 * dx, start_col + 2 * dy
+            if (0 <= start_row < size and 0 <= start_col < size and
+                    0 <= end_row < size and 0 <= end_col < size):
+                triples.append((
+                    start_row * size + start_col,
+                    (start_row + dx) * size + start_col + dy,
+                    end_row * size + end_col
+                ))
+    return tuple(triples)
+
+
+def cell_roles(index, triples):
+    """Splits a cell's triples into ((middle, other end) for lines it ends, (end, end) for lines it centres)."""
+    ends, middles = [], []
+    for a, b, c in triples:
+        if index == b:
+            middles.append((a, c))
+        else:
+            ends.append((b, c if index == a else a))
+    return tuple(ends), tuple(middles)
+
+
+def cell_neighbours(index, triples):
+    """Returns the cells sharing one of the triples with the cell (the cell included)."""
+    cells = {index}
+    for triple in triples:
+        cells.update(triple)
+    return tuple(sorted(cells))
+
+
+@functools.lru_cache(maxsize=32)
+def sos_triples(size):
+    """Returns, for every cell index, the in-bounds (a, b, c) index triples the cell belongs to."""
+    return tuple(cell_triples(size, row, col) for row in range(size) for col in range(size))
+
+
+@functools.lru_cache(maxsize=32)
+def sos_roles(size):
+    """Returns, for every cell index, ((middle, other end) for lines it ends, (end, end) for lines it centres)."""
+    return tuple(cell_roles(index, triples) for index, triples in enumerate(sos_triples(size)))
+
+
+@functools.lru_cache(maxsize=32)
+def sos_neighbours(size):
+    """Returns, for every cell index, the cells sharing a line with it (the cell included)."""
+    return tuple(cell_neighbours(index, triples) for index, triples in enumerate(sos_triples(size)))
+
+
+class IndexedSet:
+    """Set of integers supporting O(1) add, remove and random selection."""
+
+    def __init__(self, items=()):
+        self.items = list(items)
+        self.positions = {item: i for i, item in enumerate(self.items)}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, item):
+        """Adds an item if it is not already present."""
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        """Removes an item by swapping the last item into its slot."""
+        position = self.positions.pop(item, None)
+        if position is None:
+            return
+        last = self.items.pop()
+        if position < len(self.items):
+            self.items[position] = last
+            self.positions[last] = position
+
+    def choice(self, rng=random):
+        """Returns a random item in O(1)."""
+        return self.items[rng.randrange(len(self.items))]
+
+    def copy(self):
+        """Returns an independent copy of the set."""
+        copy = IndexedSet.__new__(IndexedSet)
+        copy.items = list(self.items)
+        copy.positions = dict(self.positions)
+        return copy
+
+
+class Board:
+    """Compact SOS board storing one byte per cell, independent of the GUI."""
+
+    dense = True  # Cells are a flat bytearray the search engines can copy and index
+
+    def __init__(self, size):
+        self.size = size
+        self.cells = bytearray(size * size)
+        self.filled = 0  # Number of cells holding a letter
+        self.free = IndexedSet(range(size * size))  # Flat indices of the empty cells
+        self.triples = sos_triples(size)
+        self.roles = sos_roles(size)
+        self.neighbours = sos_neighbours(size)
+        self.trackers = []  # Objects notified with the cell index after every change
+
+    def attach(self, tracker):
+        """Registers a tracker whose on_cell_changed(index) runs after every place or clear."""
+        self.trackers.append(tracker)
+
+    def occupied_indices(self):
+        """Returns the flat indices of the cells holding a letter."""
+        return [index for index, code in enumerate(self.cells) if code != EMPTY]
+
+    def index(self, row, col):
+        """Returns the flat cell index for the given row, col position."""
+        return row * self.size + col
+
+    def position(self, index):
+        """Returns the (row, col) position for the given flat cell index."""
+        return divmod(index, self.size)
+
+    def is_valid_position(self, row, col):
+        """Checks if the given position is within the board boundaries."""
+        return 0 <= row < self.size and 0 <= col < self.size
+
+    def get(self, row, col):
+        """Returns the letter at the given position (' ', 'S' or 'O')."""
+        return LETTERS[self.cells[row * self.size + col]]
+
+    def is_empty(self, row, col):
+        """Checks if the cell at the given position holds no letter."""
+        return self.cells[row * self.size + col] == EMPTY
+
+    def place(self, row, col, letter):
+        """Writes a letter into the cell at the given position."""
+        self.set_code(row * self.size + col, CODES[letter])
+
+    def clear(self, row, col):
+        """Removes the letter from the cell at the given position."""
+        self.set_code(row * self.size + col, EMPTY)
+
+    def set_code(self, index, code):
+        """Stores a letter code in the cell at the flat index and updates the free-cell index."""
+        if self.cells[index] == EMPTY:
+            if code != EMPTY:
+                self.filled += 1
+                self.free.discard(index)
+        elif code == EMPTY:
+            self.filled -= 1
+            self.free.add(index)
+        self.cells[index] = code
+        for tracker in self.trackers:
+            tracker.on_cell_changed(index)
+
+    def is_full(self):
+        """Checks if every cell on the board holds a letter."""
+        return self.filled == len(self.cells)
+
+    def empty_cells(self):
+        """Returns a list of (row, col) positions that hold no letter."""
+        return [divmod(i, self.size) for i in self.free]
+
+    def random_empty_cell(self, rng=random):
+        """Returns a random empty (row, col) position, or None if the board is full."""
+        if not self.free:
+            return None
+        return divmod(self.free.choice(rng), self.size)
+
+    def triples_at(self, index):
+        """Returns the (a, b, c) index triples that pass through the given cell."""
+        return self.triples[index]
+
+    def roles_at(self, index):
+        """Returns the cell's lines split by role, as built by sos_roles."""
+        return self.roles[index]
+
+    def neighbours_at(self, index):
+        """Returns the cells sharing a line with the given cell, the cell included."""
+        return self.neighbours[index]
+
+    def sos_lines_at(self, row, col):
+        """Returns the index triples through the given position that spell SOS."""
+        cells = self.cells
+        return [
+            triple for triple in self.triples[row * self.size + col]
+            if cells[triple[0]] == S and cells[triple[1]] == O and cells[triple[2]] == S
+        ]
+
+    def count_sos_at(self, row, col):
+        """Counts the SOS lines passing through the given position."""
+        return len(self.sos_lines_at(row, col))
+
+    def count_all_sos(self):
+        """Counts every SOS line on the board."""
+        cells = self.cells
+        count = 0
+        for index, triples in enumerate(self.triples):
+            if cells[index] != O:
+                continue
+            # Count each line once, from its middle letter
+            for a, b, c in triples:
+                if b == index and cells[a] == S and cells[c] == S:
+                    count += 1
+        return count
+
+    def copy(self):
+        """Returns an independent copy of the board."""
+        board = type(self).__new__(type(self))
+        board.size = self.size
+        board.cells = bytearray(self.cells)
+        board.filled = self.filled
+        board.free = self.free.copy()
+        board.triples = self.triples
+        board.roles = self.roles
+        board.neighbours = self.neighbours
+        board.trackers = []  # Copies are untracked scratch boards
+        return board
@@ -0,0 +1,130 @@
+import tkinter as tk
+
+# Largest and smallest cell size in pixels; cells shrink so bigger boards still fit on screen
+MAX_CELL_SIZE = 50
+MIN_CELL_SIZE = 14
+
+# Visible board area in pixels; larger boards scroll
+MAX_VIEW_PIXELS = 600
+
+EMPTY_CELL = (" ", "black")
+
+
+class BoardCanvas:
+    """Draws the SOS board on a single tk.Canvas and maps clicks back to cells."""
+
+    def __init__(self, parent, on_click):
+        self.on_click = on_click
+        self.frame = tk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, background="white", highlightthickness=0)
+        self.x_scroll = tk.Scrollbar(self.frame, orient="horizontal", command=self.canvas.xview)
+        self.y_scroll = tk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.config(xscrollcommand=self.x_scroll.set, yscrollcommand=self.y_scroll.set)
+        self.canvas.grid(row=0, column=0)
+        self.canvas.bind("<Button-1>", self.handle_click)
+        self.size = 0
+        self.cell_size = MAX_CELL_SIZE
+        self.cells = {}  # (row, col) -> (text, color) as currently drawn
+        self.items = {}  # (row, col) -> canvas text item
+        self.lines = {}  # (start, end) -> (canvas line item, color, cells) of every struck SOS, oldest first
+        self.enabled = False
+
+    def grid(self, **options):
+        """Places the board (with its scrollbars) in the parent's grid."""
+        self.frame.grid(**options)
+
+    def reset(self, size):
+        """Clears the canvas and draws the grid lines of an empty size x size board."""
+        canvas = self.canvas
+        canvas.delete("all")
+        self.size = size
+        self.cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, MAX_VIEW_PIXELS // size))
+        self.font = ("Helvetica", max(8, self.cell_size * 2 // 5), "bold")
+        self.cells = {}
+        self.items = {}
+        self.lines = {}
+
+        pixels = size * self.cell_size
+        view = min(pixels, MAX_VIEW_PIXELS)
+        canvas.config(width=view + 1, height=view + 1, scrollregion=(0, 0, pixels + 1, pixels + 1))
+        for i in range(size + 1):
+            offset = i * self.cell_size
+            canvas.create_line(offset, 0, offset, pixels, fill="grey")
+            canvas.create_line(0, offset, pixels, offset, fill="grey")
+
+        # Scrollbars only appear when the board is bigger than the view
+        if pixels > view:
+            self.x_scroll.grid(row=1, column=0, sticky="ew")
+            self.y_scroll.grid(row=0, column=1, sticky="ns")
+        else:
+            self.x_scroll.grid_remove()
+            self.y_scroll.grid_remove()
+
+    def set_enabled(self, enabled):
+        """Turns click handling on or off."""
+        self.enabled = enabled
+        self.canvas.config(cursor="hand2" if enabled else "")
+
+    def cell_at(self, x, y):
+        """Returns the (row, col) under canvas coordinates, or None outside the board."""
+        row, col = int(y // self.cell_size), int(x // self.cell_size)
+        if 0 <= row < self.size and 0 <= col < self.size:
+            return row, col
+        return None
+
+    def center(self, row, col):
+        """Returns the canvas coordinates of a cell's centre."""
+        return (col + 0.5) * self.cell_size, (row + 0.5) * self.cell_size
+
+    def handle_click(self, event):
+        """Passes a click on an enabled board to on_click(row, col)."""
+        if not self.enabled:
+            return
+        cell = self.cell_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if cell is not None:
+            self.on_click(*cell)
+
+    def draw_cell(self, row, col, text, color="black"):
+        """Draws a cell's letter, touching the canvas only if the cell looks different."""
+        if self.cells.get((row, col), EMPTY_CELL) == (text, color):
+            return
+        self.cells[(row, col)] = (text, color)
+        item = self.items.get((row, col))
+        if item is None:
+            self.items[(row, col)] = self.canvas.create_text(
+                *self.center(row, col), text=text, fill=color, font=self.font, tags="letter"
+            )
+        else:
+            self.canvas.itemconfigure(item, text=text, fill=color)
+
+    def draw_sos_line(self, start, end, color):
+        """Strokes a line from the centre of an SOS's first cell to its last, under the letters."""
+        item = self.canvas.create_line(
+            *self.center(*start), *self.center(*end),
+            fill=color, width=max(2, self.cell_size // 10), capstyle="round"
+        )
+        if self.items:
+            self.canvas.tag_lower(item, "letter")
+        middle = ((start[0] + end[0]) // 2, (start[1] + end[1]) // 2)
+        self.lines[(start, end)] = (item, color, (start, middle, end))
+
+    def erase_sos_line(self, start, end):
+        """Removes the stroke of an SOS that was taken back."""
+        line = self.lines.pop((start, end), None)
+        if line is not None:
+            self.canvas.delete(line[0])
+
+    def line_color_at(self, row, col):
+        """Returns the color of the newest SOS stroke through a cell, or None if none crosses it."""
+        for _, color, cells in reversed(self.lines.values()):
+            if (row, col) in cells:
+                return color
+        return None
+
+    def cell_text(self, row, col):
+        """Returns the letter drawn in a cell (" " when empty)."""
+        return self.cells.get((row, col), EMPTY_CELL)[0]
+
+    def cell_color(self, row, col):
+        """Returns the colour a cell's letter is drawn in."""
+        return self.cells.get((row, col), EMPTY_CELL)[1]
@@ -0,0 +1,202 @@
+import threading
+import time
+
+from board import EMPTY, LETTERS, S, O
+
+# Empty cells at or below which General-mode endgames are solved exactly
+ENDGAME_EMPTY_CELLS = 10
+
+# Nodes searched between clock checks
+NODES_PER_CLOCK_CHECK = 1024
+
+
+class SolveTimeout(Exception):
+    """Raised inside the solver when its time budget runs out or it is stopped."""
+
+
+class EndgameSolver:
+    """Exact General-mode solver for the last few empty cells.
+
+    Only the empty cells are searched. Each letter they can take is reduced to the lines it
+    would complete, given the letters already fixed around it. Positions are memoized by a
+    base-3 number over those cells, so the memo still applies after later moves, as long as
+    they only fill the same cells. Values are the SOS difference still to come for the side
+    to move, so a position's value is independent of the score and of whose turn it is.
+    """
+
+    def __init__(self, max_empty=ENDGAME_EMPTY_CELLS, time_limit=1.0):
+        self.max_empty = max_empty
+        self.time_limit = time_limit  # Seconds allowed per solve
+        self.empties = None  # Flat indices of the cells the memo is keyed over
+        self.memo = {}  # State -> (lower bound, upper bound, best move)
+        self.stats = {"nodes": 0, "elapsed": 0.0, "value": None, "exact": False, "memo_entries": 0}
+        self.totals = {"solves": 0, "nodes": 0, "elapsed": 0.0}  # Summed over every solve, for tuning
+        self.lock = threading.Lock()  # A cancelled solve may still be unwinding when the next starts
+        self.stop_requested = False
+
+    def stop(self):
+        """Asks a running solve (on another thread) to give up as soon as possible."""
+        self.stop_requested = True
+
+    def applies(self, board):
+        """Checks if the board is dense and has between 1 and max_empty empty cells."""
+        empty = len(board.cells) - board.filled
+        return board.dense and 0 < empty <= self.max_empty
+
+    def choose_move(self, board):
+        """Returns the optimal (row, col, letter), or None if the solve ran out of time or was stopped."""
+        with self.lock:
+            move = self.solve(board)
+            if move is None:
+                return None
+            row, col = board.position(self.empties[move >> 2])
+            return row, col, LETTERS[move & 3]
+
+    def solve(self, board):
+        """Solves the position and returns the best move as (slot << 2 | letter code), or None on timeout.
+
+        Callers other than choose_move must hold the lock.
+        """
+        self.prepare(board)
+        root = self.memo.get(self.state)
+        if root is not None and root[0] != root[1]:
+            # Bounds would narrow the root's window and leave its move unproven, so keep only the move
+            self.memo[self.state] = (None, None, root[2])
+        self.deadline = time.perf_counter() + self.time_limit
+        self.stop_requested = False
+        self.nodes = 0
+        start = time.perf_counter()
+        try:
+            value = self.negamax(-len(self.empties) * 8, len(self.empties) * 8)
+        except SolveTimeout:
+            value = None
+        self.stats = {
+            "nodes": self.nodes,
+            "elapsed": time.perf_counter() - start,
+            "value": value,
+            "exact": value is not None,
+            "memo_entries": len(self.memo),
+        }
+        self.totals["solves"] += 1
+        self.totals["nodes"] += self.nodes
+        self.totals["elapsed"] += self.stats["elapsed"]
+        if value is None:
+            return None
+        return self.memo[self.state][2]
+
+    def prepare(self, board):
+        """Keys the search over the board's empty cells, keeping the memo if those cells are unchanged."""
+        cells = board.cells
+        if self.empties is not None and all(
+                cells[index] == code for index, code in enumerate(self.fixed) if index not in self.slot_of):
+            # Only cells the memo already covers have been filled since the last solve
+            self.codes = [cells[index] for index in self.empties]
+            self.state = sum(code * power for code, power in zip(self.codes, self.powers))
+            self.remaining = self.codes.count(EMPTY)
+            return
+
+        self.empties = [index for index, code in enumerate(cells) if code == EMPTY]
+        self.slot_of = {index: slot for slot, index in enumerate(self.empties)}
+        self.fixed = bytes(cells)
+        self.powers = [3 ** slot for slot in range(len(self.empties))]
+        self.codes = [EMPTY] * len(self.empties)
+        self.state = 0
+        self.remaining = len(self.empties)
+        self.memo = {}
+
+        # For each slot and letter: (SOS completed by fixed letters alone, lines still needing other slots)
+        self.lines = []
+        for index in self.empties:
+            ends, middles = board.roles_at(index)
+            self.lines.append((
+                self.reduce(cells, [((middle, O), (end, S)) for middle, end in ends]),
+                self.reduce(cells, [((first, S), (last, S)) for first, last in middles]),
+            ))
+
+    def reduce(self, cells, lines):
+        """Splits lines into a count complete from fixed letters and (slot, code) conditions on the rest."""
+        complete, open_lines = 0, []
+        for line in lines:
+            needs = []
+            for index, code in line:
+                if cells[index] == EMPTY:
+                    needs.append((self.slot_of[index], code))
+                elif cells[index] != code:
+                    break
+            else:
+                if needs:
+                    open_lines.append(tuple(needs))
+                else:
+                    complete += 1
+        return complete, tuple(open_lines)
+
+    def gained(self, slot, letter):
+        """Returns the SOS a letter code at a slot completes in the current state."""
+        complete, open_lines = self.lines[slot][letter - 1]
+        codes = self.codes
+        for needs in open_lines:
+            if all(codes[other] == code for other, code in needs):
+                complete += 1
+        return complete
+
+    def ordered_moves(self, memo_move):
+        """Returns (gained, move) pairs: the memo's best move, then most SOS completed first."""
+        moves = []
+        for slot, code in enumerate(self.codes):
+            if code == EMPTY:
+                moves.append((self.gained(slot, S), slot << 2 | S))
+                moves.append((self.gained(slot, O), slot << 2 | O))
+        moves.sort(key=lambda pair: (pair[1] == memo_move, pair[0]), reverse=True)
+        return moves
+
+    def negamax(self, alpha, beta):
+        """Returns the exact value of the current state for the side to move, within alpha and beta."""
+        if self.remaining == 0:
+            return 0
+        self.nodes += 1
+        if self.nodes % NODES_PER_CLOCK_CHECK == 0 and (
+                self.stop_requested or time.perf_counter() > self.deadline):
+            raise SolveTimeout()
+
+        state = self.state
+        lower, upper, memo_move = self.memo.get(state, (None, None, None))
+        if lower is not None:
+            if lower >= beta or lower == upper:
+                return lower
+            alpha = max(alpha, lower)
+        if upper is not None:
+            if upper <= alpha:
+                return upper
+            beta = min(beta, upper)
+        window_alpha, window_beta = alpha, beta
+
+        best_value, best_move = None, None
+        for gained, move in self.ordered_moves(memo_move):
+            slot, code = move >> 2, move & 3
+            self.codes[slot] = code
+            self.state = state + code * self.powers[slot]
+            self.remaining -= 1
+            try:
+                if gained:
+                    # Forming an SOS earns an extra turn, so the same side keeps moving
+                    value = gained + self.negamax(alpha - gained, beta - gained)
+                else:
+                    value = -self.negamax(-beta, -alpha)
+            finally:
+                self.codes[slot] = EMPTY
+                self.state = state
+                self.remaining += 1
+            if best_value is None or value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= window_alpha:
+            entry = (lower, best_value, best_move)
+        elif best_value >= window_beta:
+            entry = (best_value, upper, best_move)
+        else:
+            entry = (best_value, best_value, best_move)
+        self.memo[state] = entry
+        return best_value
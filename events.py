@@ -0,0 +1,29 @@
+# Events the game rules emit; each is delivered with a dict of the fields listed
+CELL_PLACED = "cell_placed"  # row, col, letter
+CELL_CLEARED = "cell_cleared"  # row, col (a move was undone)
+SOS_FORMED = "sos_formed"  # player, cells (three (row, col) per line), count
+SOS_UNDONE = "sos_undone"  # player, cells, count (the lines of an undone move)
+SCORE_CHANGED = "score_changed"  # scores ({"Blue": n, "Red": n})
+TURN_CHANGED = "turn_changed"  # player
+INVALID_MOVE = "invalid_move"  # row, col, player
+GAME_ENDED = "game_ended"  # winner (None for a draw), mode
+
+
+class EventBus:
+    """Passes game events from the rules to whoever listens, such as the GUI."""
+
+    def __init__(self):
+        self.listeners = []
+
+    def subscribe(self, listener):
+        """Registers listener(kind, data) to receive every event."""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Stops delivering events to the listener."""
+        self.listeners.remove(listener)
+
+    def emit(self, kind, **data):
+        """Delivers an event to each listener in subscription order."""
+        for listener in self.listeners:
+            listener(kind, data)
@@ -1,40 +1,86 @@
+import time
+
+from ai_worker import ComputerMoveWorker
+from board import LETTERS
+from events import EventBus, TURN_CHANGED
 from game_modes import SimpleGameMode, GeneralGameMode
-from player import HumanPlayer, ComputerPlayer
+from game_record import GameRecordWriter
+from player import HumanPlayer, ComputerPlayer, STRATEGIES
+
+# Milliseconds a computer waits before its move, and before the extra turn it earns by forming an SOS
+PACING = {
+    "Normal": (1000, 4000),
+    "Fast": (250, 500),
+    "Turbo": (0, 0),
+}
+
+# Seconds of back-to-back computer moves played in Turbo pacing before Tk gets to redraw
+TURBO_FRAME_BUDGET = 0.012
 
 
 class GameManager:
     """Manages the game state, player turns, and game logic for SOS."""
 
-    def __init__(self, board_size=3, game_mode="Simple", gui=None):
+    def __init__(self, board_size=3, game_mode="Simple", gui=None, board_type="array",
+                 computer_strategy="heuristic", computer_workers=1, pacing="Normal", record_path=None):
         self.board_size = board_size
         self.gui = gui
+        self.board_type = board_type  # Board backend used by the rules (a key of BOARD_TYPES)
+        self.computer_strategy = computer_strategy  # Strategy given to ComputerPlayer instances
+        self.computer_workers = computer_workers  # Processes a ComputerPlayer may search with
+        self.set_pacing(pacing)
+        self.events = EventBus()  # The rules report moves, scores and results here; the GUI listens
+        self.history = []  # MoveDelta of every move this game, newest last
+        self.undone = []  # Deltas taken back by undo_move, newest last, replayed by redo_move
+        self.turbo_frame_id = None  # Pending after() id of the next Turbo frame
+        self.turbo_move_due = False  # A computer move was requested while a Turbo frame was running
+        # Finished games are appended to this binary game record file, if one is given
+        self.record_writer = GameRecordWriter(record_path) if record_path else None
         self.is_game_active = True
         self.players = {"Blue": None, "Red": None}  # Stores player instances
+        # Computer moves are computed off the Tk thread and posted back through root.after
+        self.move_worker = ComputerMoveWorker(gui.root) if gui else None
         self.set_game_mode(game_mode)
         
         # Ensure players and current_player are initialized
         self.initialize_players()  
 
+    @property
+    def current_player(self):
+        """The player whose turn the game mode says it is."""
+        return self.players[self.mode.turn]
+
+    @current_player.setter
+    def current_player(self, player):
+        self.mode.turn = player.color
+
     def initialize_players(self, blue_type="Human", red_type="Human"):
         """Initialize players as human or computer based on GUI selection."""        
         # Create HumanPlayer or ComputerPlayer based on type
         self.players["Blue"] = HumanPlayer("Blue", "Blue", self.gui) if blue_type == "Human" else ComputerPlayer(
-            "Blue", "Blue", self.gui)
+            "Blue", "Blue", self.gui, self.computer_strategy, workers=self.computer_workers)
         self.players["Red"] = HumanPlayer("Red", "Red", self.gui) if red_type == "Human" else ComputerPlayer(
-            "Red","Red",self.gui)
+            "Red","Red",self.gui, self.computer_strategy, workers=self.computer_workers)
 
         self.current_player = self.players["Blue"]  # Start with Blue player
 
+    def set_pacing(self, pacing):
+        """Sets how long computer players wait before moving (a key of PACING)."""
+        if pacing not in PACING:
+            raise ValueError(f"Unknown pacing: {pacing}")
+        self.pacing = pacing
+        self.move_delay_ms, self.extra_turn_delay_ms = PACING[pacing]
+
     def set_game_mode(self, game_mode):
         """Sets the game mode and initializes the appropriate game mode class."""
         self.game_mode = game_mode
         if game_mode == "Simple":
-            self.mode = SimpleGameMode(self.board_size, self)
+            self.mode = SimpleGameMode(self.board_size, self, self.board_type)
             if self.gui:
                 self.gui.blue_score_label.grid_remove()
                 self.gui.red_score_label.grid_remove()
         elif game_mode == "General":
-            self.mode = GeneralGameMode(self.board_size, self)
+            self.mode = GeneralGameMode(self.board_size, self, self.board_type)
             if self.gui:
                 self.gui.blue_score_label.grid()
                 self.gui.red_score_label.grid()
@@ -42,26 +88,139 @@ class GameManager:
     def on_board_click(self, row, col):
         """Handles a click on the board for a human player's move."""
         if isinstance(self.current_player, HumanPlayer):
+            if self.move_worker:
+                self.move_worker.stop_pondering()
             self.current_player.make_move(self.mode, row, col)  # Delegates move to game mode
+            # An invalid move or an extra turn leaves the human to move again
+            self.ponder_if_waiting()
 
-    def switch_turn(self):
-        """Switches the turn between players and updates the GUI."""
-        self.current_player = self.players["Red"] if self.current_player == self.players["Blue"] else self.players[
-            "Blue"]
-        self.gui.turn_label.config(text=f"Current turn: {self.current_player.color}")
+    def ponder_if_waiting(self):
+        """Lets a computer opponent think on the human's time while the human is to move."""
+        if not (self.move_worker and self.is_game_active and isinstance(self.current_player, HumanPlayer)):
+            return
+        opponent = self.players["Red"] if self.current_player == self.players["Blue"] else self.players["Blue"]
+        if isinstance(opponent, ComputerPlayer):
+            self.move_worker.start_pondering(opponent, self.mode)
 
-         # Enable or disable controls based on the player type
-        if isinstance(self.current_player, HumanPlayer):
-            self.gui.set_player_controls_state(self.current_player.color, "normal")
-        else:  # Disable controls for ComputerPlayer
-            self.gui.set_player_controls_state(self.current_player.color, "disabled")
+    def start_turn(self):
+        """Announces the player the game mode handed the turn to and lets a computer player move."""
+        self.events.emit(TURN_CHANGED, player=self.current_player.color)
 
         # If the current player is a ComputerPlayer, trigger their move
         if isinstance(self.current_player, ComputerPlayer):
-            self.gui.root.after(1000, lambda: self.current_player.make_move(self.mode))
+            self.schedule_computer_move(self.move_delay_ms)
+        else:
+            self.ponder_if_waiting()
+
+    def schedule_computer_move(self, delay_ms=0):
+        """Lets the current ComputerPlayer think in the background and plays its move once ready."""
+        player, mode = self.current_player, self.mode
+        if self.pacing == "Turbo" and player.engine is None and player.endgame is None:
+            # Heuristic moves are cheap enough to play inline, many per frame; an endgame solve is not
+            self.turbo_move_due = True
+            if self.turbo_frame_id is None:
+                self.turbo_frame_id = self.gui.root.after(0, self.play_turbo_frame)
+            return
+
+        def play(move):
+            # Drop moves that arrive after the game ended or the turn changed hands
+            if move and self.is_game_active and self.current_player is player and self.mode is mode:
+                row, col, player.choice = move
+                mode.make_move(row, col, player.choice)
+
+        self.move_worker.request_move(player, mode, play, delay_ms)
+
+    def record_move(self, delta):
+        """Keeps a played move for undo; a new move discards the moves that could be redone."""
+        self.history.append(delta)
+        self.undone.clear()
 
-    def reset_game(self, board_size, game_mode, blue_type="Human", red_type="Human"):
-        """Resets the game with a new board size, game mode, and player types."""
+    def has_human_player(self):
+        """Checks if either player is human."""
+        return any(isinstance(player, HumanPlayer) for player in self.players.values())
+
+    def undo_move(self):
+        """Takes back moves until a human is to move again (one move if both players are computers)."""
+        if not self.history:
+            return
+        self.stop_computer_players()
+        while self.history:
+            delta = self.history.pop()
+            self.mode.undo(delta)
+            self.mode.announce_undo(delta)
+            self.undone.append(delta)
+            if isinstance(self.current_player, HumanPlayer) or not self.has_human_player():
+                break
+        self.resume_after_history_change()
+
+    def redo_move(self):
+        """Replays undone moves up to the next human turn or the end of the game."""
+        if not self.undone:
+            return
+        self.stop_computer_players()
+        while self.undone:
+            delta = self.undone.pop()
+            row, col = self.mode.board.position(delta.index)
+            replayed = self.mode.play(row, col, LETTERS[delta.code])
+            self.mode.announce(replayed)
+            self.history.append(replayed)
+            if replayed.ended:
+                self.mode.finish_game(replayed)
+                return
+            if isinstance(self.current_player, HumanPlayer) or not self.has_human_player():
+                break
+        self.resume_after_history_change()
+
+    def stop_computer_players(self):
+        """Drops any computer move being computed or waiting to be played."""
+        if self.move_worker:
+            self.move_worker.cancel()
+            self.cancel_turbo()
+
+    def resume_after_history_change(self):
+        """Reopens a game that undo un-finished and hands the turn to whoever is to move."""
+        self.is_game_active = self.mode.is_game_active
+        self.start_turn()
+
+    def play_turbo_frame(self):
+        """Plays computer moves back to back for one frame's budget, then lets Tk redraw once."""
+        deadline = time.perf_counter() + TURBO_FRAME_BUDGET
+        while self.turbo_move_due and time.perf_counter() < deadline:
+            self.turbo_move_due = False
+            player = self.current_player
+            if not (self.is_game_active and isinstance(player, ComputerPlayer)):
+                break
+            # Moving schedules the next computer move, which only sets turbo_move_due again
+            player.make_move(self.mode)
+        self.turbo_frame_id = None
+        if self.turbo_move_due and self.is_game_active:
+            # Widget changes from this whole batch are drawn in the idle pass before the next frame
+            self.turbo_frame_id = self.gui.root.after(1, self.play_turbo_frame)
+
+    def cancel_turbo(self):
+        """Drops any Turbo frame still waiting to run."""
+        self.turbo_move_due = False
+        if self.turbo_frame_id is not None:
+            self.gui.root.after_cancel(self.turbo_frame_id)
+            self.turbo_frame_id = None
+
+    def reset_game(self, board_size, game_mode, blue_type="Human", red_type="Human",
+                   computer_strategy=None, computer_workers=None):
+        """Resets the game with a new board size, game mode, and player types.
+
+        computer_strategy (a key of STRATEGIES) and computer_workers, when given, replace the
+        settings used for this game's computer players.
+        """
+        if computer_strategy is not None and computer_strategy not in STRATEGIES:
+            raise ValueError(f"Unknown computer strategy: {computer_strategy}")
+        self.stop_computer_players()  # A move computed for the old board must never land on the new one
+        if computer_strategy is not None:
+            self.computer_strategy = computer_strategy
+        if computer_workers is not None:
+            self.computer_workers = computer_workers
+        self.history = []
+        self.undone = []
+        self.is_game_active = True
         self.board_size = board_size
         self.set_game_mode(game_mode)
         self.initialize_players(blue_type, red_type)  # Initialize players based on GUI selection
@@ -69,16 +228,25 @@ class GameManager:
         self.current_player = self.players["Blue"]  # Start with Blue player
 
     def end_game(self):
-        """Ends the game by disabling interactions and setting the game state."""
+        """Ends the game and stops any computer move in progress; listeners learn of it from GAME_ENDED."""
+        finished = bool(self.history) and self.history[-1].ended  # The rules ended it, not the End Game button
+        if self.is_game_active and finished and self.record_writer:
+            # A game finished again after an undo is recorded again, as it was played the second time
+            self.record_game()
         self.is_game_active = False
+        self.stop_computer_players()
         self.mode.is_game_active = False
-        self.gui.disable_buttons()
+
+    def record_game(self):
+        """Appends the moves played this game to the game record file."""
+        board = self.mode.board
+        self.record_writer.write_game(board.size, self.game_mode, (
+            (*board.position(delta.index), LETTERS[delta.code], delta.player, delta.gained)
+            for delta in self.history
+        ))
+        self.record_writer.flush()  # Games end rarely, so keep the file complete after each
 
     def is_board_full(self):
         """Checks if the entire board is filled."""
-        return all(
-            button.cget("text") != ' ' 
-            for row in self.gui.board_buttons 
-            for button in row
-        )
+        return self.mode.board.is_full()
 
@@ -1,51 +1,71 @@
+from bitboard import BitBoard
+from board import Board, CODES, EMPTY, LETTERS
+from events import CELL_CLEARED, CELL_PLACED, GAME_ENDED, INVALID_MOVE, SCORE_CHANGED, SOS_FORMED, SOS_UNDONE
 from player import ComputerPlayer
+from sparse_board import SparseBoard
+from threats import ThreatMap
+
+# Board backends that game modes can run their rules on
+BOARD_TYPES = {"array": Board, "bitboard": BitBoard, "sparse": SparseBoard}
+
+# The player who moves after each player when no SOS is formed
+NEXT_PLAYER = {"Blue": "Red", "Red": "Blue"}
+
+
+class MoveDelta:
+    """What one play() changed, so undo() can take it back without copying the board."""
+
+    __slots__ = ("index", "code", "player", "lines", "gained", "turn_passed", "ended")
+
+    def __init__(self, index, code, player, lines, gained, turn_passed, ended):
+        self.index = index  # Flat index of the cell played
+        self.code = code  # Letter code placed there
+        self.player = player  # Color of the player who moved
+        self.lines = lines  # Index triples of the SOS lines the move formed
+        self.gained = gained  # Points the move scored
+        self.turn_passed = turn_passed  # Whether the other player moves next
+        self.ended = ended  # Whether the move finished the game
+
 
 class BaseGameMode:
     """Base class for common game mode functionality."""
 
-    def __init__(self, board_size, game_manager):
+    def __init__(self, board_size, game_manager, board_type="array"):
         self.board_size = board_size
         self.game_manager = game_manager
         self.is_game_active = False
+        self.board_type = board_type
+        self.turn = "Blue"  # Color of the player to move
+        self.new_board(board_size)
+
+    def new_board(self, board_size):
+        """Creates an empty board of the configured type and its threat map."""
+        self.board = BOARD_TYPES[self.board_type](board_size)
+        self.threats = ThreatMap(self.board)
 
     def reset_game(self, board_size):
         """Resets the board and game state."""
         self.board_size = board_size
+        self.new_board(board_size)
+        self.turn = "Blue"
         self.is_game_active = True
 
     def check_sos(self, row, col):
         """Counts the number of SOS patterns created around the given row, col position."""
-        directions = [
-            (0, 1),  # Horizontal
-            (1, 0),  # Vertical
-            (1, 1),  # Diagonal top-left to bottom-right
-            (1, -1)  # Diagonal top-right to bottom-left
-        ]
+        # The board iterates the precomputed in-bounds triples through this cell
+        sos_lines = self.board.sos_lines_at(row, col)
+        return self.line_cells(sos_lines), len(sos_lines)
 
+    def line_cells(self, lines):
+        """Lists the (row, col) cells of index triples, three per line."""
         sos_cells = []
-        sos_count = 0
-        
-        for dx, dy in directions:
-            # Each call to get_sos_sequence will either add 3 cells for an SOS or an empty list
-            sequence1 = self.get_sos_sequence(row - 2 * dx, col - 2 * dy, row - dx, col - dy, row, col)
-            sequence2 = self.get_sos_sequence(row - dx, col - dy, row, col, row + dx, col + dy)
-            sequence3 = self.get_sos_sequence(row, col, row + dx, col + dy, row + 2 * dx, col + 2 * dy)
-
-            for sequence in [sequence1, sequence2, sequence3]:
-                if sequence:
-                    sos_cells.extend(sequence) 
-                    sos_count += 1               
-        return sos_cells, sos_count 
-                    
-    def get_sos_sequence(self, x1, y1, x2, y2, x3, y3):
-        """Helper method to check for 'S-O-S' sequence and return coordinates if found."""
-        board_buttons = self.game_manager.gui.board_buttons
-        if self.is_valid_position(x1, y1) and self.is_valid_position(x2, y2) and self.is_valid_position(x3, y3):
-            if (board_buttons[x1][y1].cget("text") == 'S' and
-                board_buttons[x2][y2].cget("text") == 'O' and
-                board_buttons[x3][y3].cget("text") == 'S'):
-                return [(x1, y1), (x2, y2), (x3, y3)]             
-        return []
+        for line in lines:
+            sos_cells.extend(self.board.position(index) for index in line)
+        return sos_cells
+
+    def is_sos_sequence(self, row, col):
+        """Check if the character at (row, col) completes an SOS sequence."""
+        return self.board.count_sos_at(row, col) > 0
 
     def is_valid_position(self, row, col):
         """Checks if the given position is within the board boundaries."""
@@ -53,190 +73,153 @@ class BaseGameMode:
     
     def is_valid_move(self, row, col):
         """Check if the specified move is within bounds and on an empty cell."""
-        # Check both position bounds and cell content via the GUI's board
-        return self.is_valid_position(row, col) and \
-               self.game_manager.gui.board_buttons[row][col].cget("text") == " "
+        # Check both position bounds and cell content via the board model
+        return self.is_valid_position(row, col) and self.board.is_empty(row, col)
+
+    def play(self, row, col, letter):
+        """Applies a move for the player to move and returns the MoveDelta that undo() reverses.
+
+        Only the rules' state changes: nothing is emitted and no player is asked to move.
+        """
+        if not self.is_valid_move(row, col):
+            raise ValueError(f"Invalid move: {letter} at ({row}, {col})")
+        index = self.board.index(row, col)
+        code = CODES[letter]
+        self.board.set_code(index, code)
+        lines = tuple(self.board.sos_lines_at(row, col))
+        player = self.turn
+        gained = len(lines)
+        self.add_score(player, gained)
+        ended = self.is_game_over(gained)
+        turn_passed = not gained and not ended
+        if turn_passed:
+            self.turn = NEXT_PLAYER[player]
+        if ended:
+            self.is_game_active = False
+        return MoveDelta(index, code, player, lines, gained, turn_passed, ended)
+
+    def undo(self, delta):
+        """Reverses the most recent play() from its delta."""
+        self.board.set_code(delta.index, EMPTY)
+        self.add_score(delta.player, -delta.gained)
+        self.turn = delta.player
+        if delta.ended:
+            self.is_game_active = True
+
+    def add_score(self, player, points):
+        """Credits points to a player; only General games keep a score."""
+
+    def is_game_over(self, gained):
+        """Checks if the game ends after a move that formed gained SOS lines."""
+        return self.board.is_full()
+
+    def announce(self, delta):
+        """Emits the events describing a move play() applied."""
+        row, col = self.board.position(delta.index)
+        self.emit(CELL_PLACED, row=row, col=col, letter=LETTERS[delta.code])
+        if delta.gained:
+            self.emit(SOS_FORMED, player=delta.player, cells=self.line_cells(delta.lines), count=delta.gained)
+
+    def announce_undo(self, delta):
+        """Emits the events describing a move undo() took back."""
+        row, col = self.board.position(delta.index)
+        self.emit(CELL_CLEARED, row=row, col=col)
+        if delta.gained:
+            self.emit(SOS_UNDONE, player=delta.player, cells=self.line_cells(delta.lines), count=delta.gained)
+
+    def make_move(self, row, col, character):
+        """Plays a move from a player, announces it and hands over to whoever moves next."""
+        if not self.is_valid_move(row, col):
+            self.emit(INVALID_MOVE, row=row, col=col, player=self.turn)
+            return
+
+        delta = self.play(row, col, character)
+        self.game_manager.record_move(delta)
+        self.announce(delta)
+        if delta.ended:
+            self.finish_game(delta)
+        elif delta.turn_passed:
+            self.game_manager.start_turn()
+        elif isinstance(self.game_manager.current_player, ComputerPlayer):
+            # Forming an SOS earns an extra turn; a ComputerPlayer takes it automatically
+            self.game_manager.schedule_computer_move(self.game_manager.extra_turn_delay_ms)
+
+    def emit(self, kind, **data):
+        """Publishes an event about this game on the game manager's event bus."""
+        self.game_manager.events.emit(kind, **data)
 
     def end_game_with_draw(self):
         """Handle game draw scenario."""
-        self.game_manager.gui.turn_label.config(text="The game is a draw!")
+        self.emit(GAME_ENDED, winner=None, mode=self.name)
         self.game_manager.end_game()
-        
+
 
 class SimpleGameMode(BaseGameMode):
     """Implements the simple game mode."""
-    def __init__(self, board_size, game_manager):
-        self.board_size = board_size
-        self.game_manager = game_manager
-        self.board = [[" " for _ in range(board_size)] for _ in range(board_size)]
+    name = "Simple"
 
-    def make_move(self, row, col, character):
-        if not self.is_valid_move(row, col):
-            self.game_manager.gui.turn_label.config(text=f"Invalid move. Try again. Current Turn: {self.game_manager.current_player.color}")
-            return
+    def __init__(self, board_size, game_manager, board_type="array"):
+        super().__init__(board_size, game_manager, board_type)
 
-        self.game_manager.gui.update_button(row, col, character, "black")
+    def is_game_over(self, gained):
+        """The first SOS wins a Simple game; otherwise it ends when the board is full."""
+        return bool(gained) or self.board.is_full()
 
-        # Check for SOS sequences
-        sos_cells, sos_count = self.check_sos(row, col)
-        if sos_cells:
-            # Change color of SOS cells to player's color
-            player_color = "blue" if self.game_manager.current_player.color == "Blue" else "red"
-            for (sos_row, sos_col) in sos_cells:
-                self.game_manager.gui.update_button(sos_row, sos_col, self.game_manager.gui.board_buttons[sos_row][sos_col].cget("text"), player_color)
+    def finish_game(self, delta):
+        """Ends the game after the move in delta finished it."""
+        if delta.gained:
             self.end_game_with_winner()
-        elif self.game_manager.is_board_full():
-            self.end_game_with_draw()
         else:
-            self.game_manager.switch_turn()
+            self.end_game_with_draw()
             
     def check_sos(self, row, col):
         return super().check_sos(row, col)
 
     def end_game_with_winner(self):
         """Declare the current player as winner and end the game."""
-        self.game_manager.gui.turn_label.config(text=f"{self.game_manager.current_player.color} wins!")
-        self.game_manager.end_game()
-
-    def end_game_with_draw(self):
-        """Handle game draw scenario."""
-        self.game_manager.gui.turn_label.config(text="The game is a draw! No SOS was created.")
+        self.emit(GAME_ENDED, winner=self.turn, mode=self.name)
         self.game_manager.end_game()
-        
-    def is_sos_sequence(self, row, col):
-        """Check if placing a character at (row, col) completes an SOS sequence."""
-        # Check all possible directions for an SOS pattern
-        return (
-            self.check_direction(row, col, 0, 1) or   # Horizontal
-            self.check_direction(row, col, 1, 0) or   # Vertical
-            self.check_direction(row, col, 1, 1) or   # Diagonal /
-            self.check_direction(row, col, 1, -1)     # Diagonal \
-        )
-    
-    def check_direction(self, row, col, delta_row, delta_col):
-        """Check for an SOS pattern in a specific direction."""
-        # Ensure within bounds and check if we have an "S", "O", "S" in the given direction
-        try:
-            if (
-                self.board[row][col] == "S" and
-                self.board[row + delta_row][col + delta_col] == "O" and
-                self.board[row + 2 * delta_row][col + 2 * delta_col] == "S"
-            ):
-                return True
-        except IndexError:
-            # Out of bounds, so no SOS possible in this direction
-            return False
-        return False
 
 
 class GeneralGameMode(BaseGameMode):
     """Implements the general game mode."""
+    name = "General"
 
-    def __init__(self, board_size, game_manager):
-        super().__init__(board_size, game_manager)
+    def __init__(self, board_size, game_manager, board_type="array"):
+        super().__init__(board_size, game_manager, board_type)
         self.sos_count = {"Blue": 0, "Red": 0}
-        self.board_size = board_size
-        self.game_manager = game_manager
-        self.board = [[" " for _ in range(board_size)] for _ in range(board_size)]
 
     def reset_game(self, board_size):
         """Resets the board, game state, and scores."""
         super().reset_game(board_size)
         self.sos_count = {"Blue": 0, "Red": 0}
-        self.update_score_display()
+        self.emit(SCORE_CHANGED, scores=dict(self.sos_count))
 
-    def update_score_display(self):
-        """Updates the SOS count labels."""
-        self.game_manager.gui.blue_score_label.config(text=f"Blue SOS: {self.sos_count['Blue']}")
-        self.game_manager.gui.red_score_label.config(text=f"Red SOS: {self.sos_count['Red']}")
+    def add_score(self, player, points):
+        """Credits points to a player's SOS count."""
+        self.sos_count[player] += points
 
-    def make_move(self, row, col, character):
-        if not self.is_valid_move(row, col):
-            self.game_manager.gui.turn_label.config(text=f"Invalid move. Try again. Current Turn: {self.game_manager.current_player.color}")
-            return
+    def announce(self, delta):
+        """Emits the events describing a move, including any score change."""
+        super().announce(delta)
+        if delta.gained:
+            self.emit(SCORE_CHANGED, scores=dict(self.sos_count))
 
-        self.game_manager.gui.update_button(row, col, character, "black")
+    def announce_undo(self, delta):
+        """Emits the events describing a move taken back, including any score change."""
+        super().announce_undo(delta)
+        if delta.gained:
+            self.emit(SCORE_CHANGED, scores=dict(self.sos_count))
 
-        # Check for SOS formations
-        sos_cells, sos_count = self.check_sos(row, col)
-        if sos_cells:
-            player_color = "blue" if self.game_manager.current_player.color == "Blue" else "red"    
-            for (sos_row, sos_col) in sos_cells:
-                current_text = self.game_manager.gui.board_buttons[sos_row][sos_col].cget("text")
-                self.game_manager.gui.update_button(sos_row, sos_col, current_text, player_color)
-            
-            sos_count_increment = sos_count  
-            self.sos_count[self.game_manager.current_player.color] += sos_count_increment
-            self.update_score_display()
-
-            self.game_manager.gui.turn_label.config(
-                text=f"{self.game_manager.current_player.color} formed {sos_count_increment} SOS! They get an extra turn!"
-            )
-            
-            # Check if the board is full after an SOS
-            if self.game_manager.is_board_full():
-                self.end_game_based_on_score() 
-                return
-
-            # If the current player is a ComputerPlayer, make an extra move automatically
-            if isinstance(self.game_manager.current_player, ComputerPlayer):
-                self.game_manager.gui.root.after(4000, lambda: self.game_manager.current_player.make_move(self))
-                return 
-            else:
-                return
-
-        if self.game_manager.is_board_full():
-            self.end_game_based_on_score()
-        else:
-            self.game_manager.switch_turn()
-
-    def update_score_display(self):
-        """Updates the SOS count labels."""
-        self.game_manager.gui.blue_score_label.config(text=f"Blue SOS: {self.sos_count['Blue']}")
-        self.game_manager.gui.red_score_label.config(text=f"Red SOS: {self.sos_count['Red']}")
-
-    def handle_extra_turn(self, sos_formed):
-        """Notify player of an extra turn for forming SOS."""
-        self.game_manager.gui.turn_label.config(
-            text=f"{self.game_manager.current_player.color} formed {sos_formed} SOS! They get an extra turn!"
-        )
-
-        # If the current player is a ComputerPlayer, make the move automatically
-        self.extra_turn = True
-        
-    def is_sos_sequence(self, row, col):
-        """Check if placing a character at (row, col) completes an SOS sequence."""
-        # Check all possible directions for an SOS pattern
-        return (
-            self.check_direction(row, col, 0, 1) or   # Horizontal
-            self.check_direction(row, col, 1, 0) or   # Vertical
-            self.check_direction(row, col, 1, 1) or   # Diagonal /
-            self.check_direction(row, col, 1, -1)     # Diagonal \
-        )
-    
-    def check_direction(self, row, col, delta_row, delta_col):
-        """Check for an SOS pattern in a specific direction."""
-        # Ensure within bounds and check if we have an "S", "O", "S" in the given direction
-        try:
-            if (
-                self.board[row][col] == "S" and
-                self.board[row + delta_row][col + delta_col] == "O" and
-                self.board[row + 2 * delta_row][col + 2 * delta_col] == "S"
-            ):
-                return True
-        except IndexError:
-            # Out of bounds, so no SOS possible in this direction
-            return False
-        return False
+    def finish_game(self, delta):
+        """Ends the game after the move in delta filled the board."""
+        self.end_game_based_on_score()
 
     def end_game_based_on_score(self):
         """Determine winner based on SOS count or declare a draw."""
         blue_score, red_score = self.sos_count["Blue"], self.sos_count["Red"]
-        if blue_score > red_score:
-            self.game_manager.gui.turn_label.config(text="Blue wins!")
-        elif red_score > blue_score:
-            self.game_manager.gui.turn_label.config(text="Red wins!")
-        else:
+        if blue_score == red_score:
             self.end_game_with_draw()
+            return
+        self.emit(GAME_ENDED, winner="Blue" if blue_score > red_score else "Red", mode=self.name)
         self.game_manager.end_game()
-
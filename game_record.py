@@ -0,0 +1,167 @@
+import os
+import struct
+
+# File header: magic and format version, written once at the start of a record file
+FILE_HEADER = struct.Struct("<5sB")
+MAGIC = b"SOSGR"
+VERSION = 1
+
+# Game header: board size, mode (0 Simple, 1 General), number of moves
+GAME_HEADER = struct.Struct("<HBI")
+MODES = ("Simple", "General")
+PLAYERS = ("Blue", "Red")
+
+# Bits of a packed move below the cell index: SOS formed (4), player (1), letter (1)
+MOVE_FLAG_BITS = 6
+
+# Bytes collected before the writer hands them to the file
+WRITE_BUFFER_BYTES = 1 << 16
+
+
+def move_width(size):
+    """Returns the bytes one move takes on a size x size board: 2 up to 32x32, 3 up to 512x512, else 4."""
+    index_bits = max(1, (size * size - 1).bit_length())
+    return (index_bits + MOVE_FLAG_BITS + 7) // 8
+
+
+def encode_move(size, row, col, letter, player, sos):
+    """Packs a move as index << 6 | SOS formed << 2 | player << 1 | letter, little-endian."""
+    value = (row * size + col) << MOVE_FLAG_BITS | sos << 2 | PLAYERS.index(player) << 1 | (letter == "O")
+    return value.to_bytes(move_width(size), "little")
+
+
+def decode_moves(size, data):
+    """Yields (row, col, letter, player, SOS formed) for each packed move in data."""
+    width = move_width(size)
+    for offset in range(0, len(data), width):
+        value = int.from_bytes(data[offset:offset + width], "little")
+        row, col = divmod(value >> MOVE_FLAG_BITS, size)
+        yield row, col, "SO"[value & 1], PLAYERS[value >> 1 & 1], value >> 2 & 0xF
+
+
+class GameRecordWriter:
+    """Appends finished games to a record file through a buffer, so writing many games uses constant memory."""
+
+    def __init__(self, path, buffer_size=WRITE_BUFFER_BYTES):
+        self.file = open(path, "ab")
+        self.buffer = bytearray()
+        self.buffer_size = buffer_size
+        self.games = 0
+        if self.file.tell() == 0:
+            self.buffer += FILE_HEADER.pack(MAGIC, VERSION)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_game(self, size, mode_name, moves):
+        """Adds one game given its (row, col, letter, player, SOS formed) moves."""
+        packed = b"".join(encode_move(size, *move) for move in moves)
+        self.buffer += GAME_HEADER.pack(size, MODES.index(mode_name), len(packed) // move_width(size))
+        self.buffer += packed
+        self.games += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Writes out everything buffered so far."""
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.buffer.clear()
+
+    def close(self):
+        """Flushes the buffer and closes the file."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class GameRecord:
+    """One recorded game, its moves decoded only when iterated."""
+
+    __slots__ = ("size", "mode_name", "data")
+
+    def __init__(self, size, mode_name, data):
+        self.size = size
+        self.mode_name = mode_name
+        self.data = data  # Packed moves
+
+    def __len__(self):
+        return len(self.data) // move_width(self.size)
+
+    def __iter__(self):
+        return decode_moves(self.size, self.data)
+
+    def scores(self):
+        """Returns the SOS each player formed, as {"Blue": n, "Red": n}."""
+        scores = dict.fromkeys(PLAYERS, 0)
+        for _, _, _, player, sos in self:
+            scores[player] += sos
+        return scores
+
+    def winner(self):
+        """Returns "Blue", "Red" or "Draw", as the game mode would have decided."""
+        if self.mode_name == "Simple":
+            # The game stops at the first SOS, so only the last move can have formed one
+            last = list(self)[-1:]
+            return last[0][3] if last and last[0][4] else "Draw"
+        scores = self.scores()
+        if scores["Blue"] == scores["Red"]:
+            return "Draw"
+        return max(scores, key=scores.get)
+
+
+def game_headers(file, path):
+    """Yields (size, mode name, bytes of moves) per game of an open record file.
+
+    The caller reads or skips each game's moves before asking for the next header.
+    """
+    header = file.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size or FILE_HEADER.unpack(header) != (MAGIC, VERSION):
+        raise ValueError(f"{path} is not an SOS game record")
+    while True:
+        header = file.read(GAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < GAME_HEADER.size:
+            raise ValueError(f"{path} ends inside a game header")
+        size, mode, count = GAME_HEADER.unpack(header)
+        yield size, MODES[mode], count * move_width(size)
+
+
+def read_games(path):
+    """Yields the GameRecord of every game in a record file, reading one game at a time."""
+    with open(path, "rb") as file:
+        for size, mode_name, length in game_headers(file, path):
+            data = file.read(length)
+            if len(data) < length:
+                raise ValueError(f"{path} ends inside a game")
+            yield GameRecord(size, mode_name, data)
+
+
+def count_games(path):
+    """Returns the number of games in a record file, seeking past their moves instead of reading them."""
+    with open(path, "rb") as file:
+        end = os.fstat(file.fileno()).st_size
+        games = 0
+        for _, _, length in game_headers(file, path):
+            if file.seek(length, os.SEEK_CUR) > end:
+                raise ValueError(f"{path} ends inside a game")
+            games += 1
+        return games
+
+
+def read_game(path, number):
+    """Returns the GameRecord of the game at a 0-based position in a record file, or None."""
+    with open(path, "rb") as file:
+        for position, (size, mode_name, length) in enumerate(game_headers(file, path)):
+            if position < number:
+                file.seek(length, os.SEEK_CUR)
+                continue
+            data = file.read(length)
+            if len(data) < length:
+                raise ValueError(f"{path} ends inside a game")
+            return GameRecord(size, mode_name, data)
+    return None
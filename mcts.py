@@ -0,0 +1,219 @@
+import math
+import random
+import time
+
+from board import EMPTY, LETTERS, S, O
+
+# Exploration constant of the UCT formula
+EXPLORATION = 1.4
+
+# Move keys a ponder search may add to the tree's untried lists; each node holds up to two per
+# empty cell, so this bounds pondering memory (about 70 MB) however long the opponent thinks
+PONDER_TREE_MOVES = 1 << 21
+
+
+class Node:
+    """Search tree node for the position reached by a move."""
+
+    __slots__ = ("move", "parent", "mover", "to_move", "terminal", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, parent, mover, to_move, terminal, untried):
+        self.move = move  # Move key (index << 2 | letter code) that led here, None at the root
+        self.parent = parent
+        self.mover = mover  # Side (0 or 1) that played the move
+        self.to_move = to_move  # Side to move next; the mover again after forming an SOS
+        self.terminal = terminal
+        self.children = {}
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0  # Sum of results from the mover's point of view
+
+    def best_child(self, exploration):
+        """Returns the child with the highest UCT score."""
+        log_visits = math.log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+        )
+
+
+class MCTSSearch:
+    """Monte Carlo Tree Search (UCT) with random playouts and subtree reuse between moves."""
+
+    def __init__(self, time_limit_ms=1000, exploration=EXPLORATION, rng=None):
+        self.time_limit_ms = time_limit_ms
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.root = None
+        self.root_cells = None  # Board cells the root node was built for
+        self.stats = {"playouts": 0, "elapsed": 0.0, "playouts_per_second": 0.0, "reused_visits": 0}
+        self.totals = {"searches": 0, "playouts": 0, "elapsed": 0.0}  # Summed over every search, for tuning
+        self.root_visits = {}  # Move key -> visits of each root child in the last search
+        self.stop_requested = False
+
+    def stop(self):
+        """Asks a running search (on another thread) to finish after the current playout."""
+        self.stop_requested = True
+
+    def choose_move(self, board, mode_name, lead=0):
+        """Returns the most visited (row, col, letter) after searching for the time budget.
+
+        lead is the side to move's current SOS advantage, so General playouts are judged on the
+        final score rather than only the SOS formed from here on.
+        """
+        if board.is_full():
+            return None
+        self.search(board, mode_name, lead, self.time_limit_ms / 1000)
+        self.root_visits = {move: child.visits for move, child in self.root.children.items()}
+        best = max(self.root.children.values(), key=lambda child: child.visits)
+        # Keep the chosen subtree so the next call can continue from it
+        self.advance(best.move)
+        row, col = divmod(best.move >> 2, board.size)
+        return row, col, LETTERS[best.move & 3]
+
+    def ponder(self, board, mode_name, lead=0):
+        """Grows the tree for a position the opponent is to move in, until stop() or the node budget.
+
+        lead is the opponent's SOS advantage. The next choose_move follows the opponent's
+        actual reply down this tree and keeps everything searched under it.
+        """
+        if not board.is_full():
+            empty_count = len(board.cells) - board.filled
+            self.search(board, mode_name, lead, None, max(1, PONDER_TREE_MOVES // (2 * empty_count)))
+
+    def search(self, board, mode_name, lead, time_limit, max_playouts=None):
+        """Runs iterations from the board's position until the time limit (seconds), a stop
+        or max_playouts iterations, each of which adds at most one node to the tree.
+        """
+        self.sudden_death = mode_name == "Simple"
+        self.triples = board.triples
+        self.reuse_subtree(board)
+        self.lead = lead
+        cells = bytearray(board.cells)
+        empty_count = len(cells) - board.filled
+
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit is not None else math.inf
+        reused_visits = self.root.visits
+        playouts = 0
+        self.stop_requested = False
+        while True:
+            self.run_iteration(cells, empty_count)
+            playouts += 1
+            if self.stop_requested or playouts == max_playouts or time.perf_counter() >= deadline:
+                break
+        elapsed = time.perf_counter() - start
+        self.stats = {
+            "playouts": playouts,
+            "elapsed": elapsed,
+            "playouts_per_second": playouts / elapsed if elapsed else 0.0,
+            "reused_visits": reused_visits,
+        }
+        self.totals["searches"] += 1
+        self.totals["playouts"] += playouts
+        self.totals["elapsed"] += elapsed
+
+    def legal_moves(self, cells):
+        """Returns every move key for the empty cells."""
+        return [index << 2 | code for index, value in enumerate(cells) if value == EMPTY for code in (S, O)]
+
+    def reuse_subtree(self, board):
+        """Moves the root down to the node matching the board, or starts a fresh tree."""
+        node = self.root
+        if node is not None and len(self.root_cells) == len(board.cells):
+            played = {
+                index << 2 | board.cells[index]
+                for index, value in enumerate(self.root_cells)
+                if value != board.cells[index]
+            }
+            if all(self.root_cells[key >> 2] == EMPTY for key in played):
+                # Follow the moves played since, in whichever order the tree contains them
+                while node is not None and played:
+                    node = next((node.children[key] for key in played if key in node.children), None)
+                    if node is not None:
+                        played.discard(node.move)
+                if node is not None and not node.terminal:
+                    node.parent = None
+                    self.root = node
+                    self.root_cells = bytearray(board.cells)
+                    return
+        self.root = Node(None, None, 1, 0, False, self.legal_moves(board.cells))
+        self.root_cells = bytearray(board.cells)
+
+    def advance(self, move):
+        """Makes the child reached by the move the new root."""
+        child = self.root.children[move]
+        child.parent = None
+        self.root = child
+        self.root_cells[move >> 2] = move & 3
+
+    def run_iteration(self, cells, empty_count):
+        """Runs one selection, expansion, playout and backpropagation pass."""
+        node = self.root
+        played = []
+        scores = [0, 0]
+        scores[node.to_move] += self.lead
+
+        # Selection
+        while not node.untried and node.children:
+            node = node.best_child(self.exploration)
+            scores[node.mover] += self.play(cells, node.move, played)
+
+        # Expansion
+        if node.untried and not node.terminal:
+            move = node.untried.pop(self.rng.randrange(len(node.untried)))
+            mover = node.to_move
+            gained = self.play(cells, move, played)
+            scores[mover] += gained
+            terminal = (gained and self.sudden_death) or len(played) == empty_count
+            child = Node(
+                move, node, mover, mover if gained else 1 - mover, terminal,
+                [] if terminal else self.legal_moves(cells)
+            )
+            node.children[move] = child
+            node = child
+
+        # Playout
+        if not node.terminal:
+            self.playout(cells, node.to_move, scores, played)
+
+        for index in played:
+            cells[index] = EMPTY
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            mine, theirs = scores[node.mover], scores[1 - node.mover]
+            node.wins += 1.0 if mine > theirs else 0.5 if mine == theirs else 0.0
+            node = node.parent
+
+    def play(self, cells, move, played):
+        """Writes a move into the scratch cells and returns the SOS lines it formed."""
+        index = move >> 2
+        cells[index] = move & 3
+        played.append(index)
+        count = 0
+        for a, b, c in self.triples[index]:
+            if cells[a] == S and cells[b] == O and cells[c] == S:
+                count += 1
+        return count
+
+    def playout(self, cells, to_move, scores, played):
+        """Fills the remaining cells with random letters until the game ends."""
+        rng = self.rng
+        triples = self.triples
+        empty = [index for index, value in enumerate(cells) if value == EMPTY]
+        rng.shuffle(empty)
+        for index in empty:
+            cells[index] = S if rng.random() < 0.5 else O
+            played.append(index)
+            gained = 0
+            for a, b, c in triples[index]:
+                if cells[a] == S and cells[b] == O and cells[c] == S:
+                    gained += 1
+            if gained:
+                scores[to_move] += gained
+                if self.sudden_death:
+                    return
+            else:
+                to_move = 1 - to_move
@@ -0,0 +1,169 @@
+import argparse
+import collections
+import functools
+import itertools
+import mmap
+import os
+import struct
+import time
+
+from board import Board, CODES, LETTERS
+from symmetry import SymmetricHash
+
+# File header: magic, format version, board size, mode (0 Simple, 1 General), plies, entry count
+HEADER = struct.Struct("<5sBBBBI")
+MAGIC = b"SOSBK"
+VERSION = 1
+MODES = ("Simple", "General")
+
+# Entry: canonical position hash, canonical move key, games the move was played in, score per mille
+ENTRY = struct.Struct("<QHHH")
+
+# Plies of every self-play game the book covers by default
+BOOK_PLIES = 6
+
+# Games a move needs before the book trusts its score
+MIN_BOOK_GAMES = 4
+
+# Books live beside the code, outside version control
+BOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+
+
+def book_path(mode_name, size, directory=BOOK_DIR):
+    """Returns the file name of the opening book for a mode and board size."""
+    return os.path.join(directory, f"sos_{mode_name.lower()}_{size}x{size}.book")
+
+
+def tally_game(stats, size, plies, record, winner):
+    """Adds one recorded game's first plies to stats: canonical hash -> move -> [games, score].
+
+    A move scores 1 when its player went on to win, 0.5 for a draw and 0 for a loss.
+    """
+    board = Board(size)
+    hashes = SymmetricHash(size)
+    for row, col, letter, player, _ in itertools.islice(record, plies):
+        index, code = board.index(row, col), CODES[letter]
+        tally = stats[hashes.canonical()[0]][hashes.canonical_move(index << 2 | code)]
+        tally[0] += 1
+        tally[1] += 1.0 if winner == player else 0.5 if winner == "Draw" else 0.0
+        board.set_code(index, code)
+        hashes.toggle(index, code)
+
+
+def best_entries(stats, min_games=MIN_BOOK_GAMES):
+    """Returns (hash, move, games, score per mille) of each position's best-scoring move, sorted by hash."""
+    entries = []
+    for key, moves in stats.items():
+        trusted = [(score / games, games, move) for move, (games, score) in moves.items() if games >= min_games]
+        if trusted:
+            mean, games, move = max(trusted)
+            entries.append((key, move, min(games, 0xFFFF), round(mean * 1000)))
+    entries.sort()
+    return entries
+
+
+def build_book(games, size, mode_name, plies=BOOK_PLIES, strategy="heuristic", time_limit=0.1,
+               workers=None, seed=0, min_games=MIN_BOOK_GAMES):
+    """Plays self-play games and returns the sorted book entries for their first plies."""
+    from simulator import simulate  # The simulator's players read books, so import it only to build one
+    stats = collections.defaultdict(lambda: collections.defaultdict(lambda: [0, 0.0]))
+    for result in simulate(games, size, mode_name, strategy, strategy, time_limit, workers, seed, record=True):
+        tally_game(stats, size, plies, result["record"], result["winner"])
+    return best_entries(stats, min_games)
+
+
+def write_book(path, size, mode_name, plies, entries):
+    """Writes sorted book entries with their header to a book file."""
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, size, MODES.index(mode_name), plies, len(entries)))
+        for entry in entries:
+            file.write(ENTRY.pack(*entry))
+
+
+class OpeningBook:
+    """A book file mapped into memory and searched by binary search over its sorted hashes."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, mode, self.plies, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION or mode >= len(MODES):
+            self.data.close()
+            raise ValueError(f"{path} is not an SOS opening book")
+        if len(self.data) != HEADER.size + self.count * ENTRY.size:
+            self.data.close()
+            raise ValueError(f"{path} is truncated")
+        self.mode_name = MODES[mode]
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        """Unmaps the file."""
+        self.data.close()
+
+    def find(self, key):
+        """Returns (move, games, score per mille) stored for a canonical hash, or None."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            entry = ENTRY.unpack_from(self.data, HEADER.size + middle * ENTRY.size)
+            if entry[0] < key:
+                low = middle + 1
+            elif entry[0] > key:
+                high = middle
+            else:
+                return entry[1:]
+        return None
+
+    def probe(self, board):
+        """Returns the book's (row, col, letter) for the position, or None if it is out of book."""
+        if board.filled >= self.plies:
+            return None
+        hashes = SymmetricHash.of_board(board)
+        key, transform = hashes.canonical()
+        entry = self.find(key)
+        if entry is None:
+            return None
+        move = hashes.from_canonical(entry[0], transform)
+        if not board.is_empty(*board.position(move >> 2)):
+            return None  # A hash collision; leave the position to the search
+        row, col = board.position(move >> 2)
+        return row, col, LETTERS[move & 3]
+
+
+@functools.lru_cache(maxsize=None)
+def load_book(mode_name, size, directory=BOOK_DIR):
+    """Returns the OpeningBook for a mode and board size, or None if none has been built."""
+    try:
+        return OpeningBook(book_path(mode_name, size, directory))
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    """Builds an opening book from the command line."""
+    parser = argparse.ArgumentParser(description="Build an SOS opening book from self-play games.")
+    parser.add_argument("--games", type=int, default=10000, help="self-play games to play")
+    parser.add_argument("--size", type=int, default=8, help="board size")
+    parser.add_argument("--mode", choices=MODES, default="General", help="game mode")
+    parser.add_argument("--plies", type=int, default=BOOK_PLIES, help="opening plies to keep")
+    parser.add_argument("--strategy", default="heuristic", help="self-play strategy (heuristic, vectorized, alphabeta, mcts)")
+    parser.add_argument("--time-limit", type=float, default=0.1, help="seconds per move for search strategies")
+    parser.add_argument("--min-games", type=int, default=MIN_BOOK_GAMES, help="games a move needs to enter the book")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--out", default=BOOK_DIR, help="directory to write the book to")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    entries = build_book(args.games, args.size, args.mode, args.plies, args.strategy, args.time_limit,
+                         args.workers, args.seed, args.min_games)
+    os.makedirs(args.out, exist_ok=True)
+    path = book_path(args.mode, args.size, args.out)
+    write_book(path, args.size, args.mode, args.plies, entries)
+    print(f"{path}: {len(entries)} positions ({time.perf_counter() - started:.1f} s)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import atexit
+import concurrent.futures
+import multiprocessing
+import os
+import random
+import time
+
+from board import Board, LETTERS, S, O
+from mcts import MCTSSearch
+from search import AlphaBetaSearch
+
+# Boards with fewer cells than this are searched serially; process hand-off costs more than it saves
+PARALLEL_MIN_CELLS = 49
+
+# Shared warm pool, created on first use and kept for the life of the program
+_pool = None
+_pool_workers = 0
+
+# Engines kept alive inside each worker process so their tables survive between moves
+_worker_engines = {}
+
+
+def get_pool(workers=None):
+    """Returns the shared process pool, starting and warming it on first use."""
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    if _pool is None or _pool_workers < workers:
+        shutdown_pool()
+        # Spawned workers do not inherit the parent's Tk interpreter
+        _pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _pool_workers = workers
+        # Start every worker now so the first real move does not pay for process start-up
+        for future in [_pool.submit(os.getpid) for _ in range(workers)]:
+            future.result()
+    return _pool
+
+
+def shutdown_pool():
+    """Stops the shared process pool if it is running."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+def rebuild_board(size, cells):
+    """Builds a board from its size and cell bytes inside a worker."""
+    board = Board(size)
+    for index, code in enumerate(cells):
+        if code:
+            board.set_code(index, code)
+    return board
+
+
+def search_chunk(strategy, time_limit, size, cells, mode_name, lead, moves, seed):
+    """Searches part of the root in a worker and returns the results to merge.
+
+    Alpha-beta returns {completed depth: (move key, value)}; MCTS returns ([(move key, visits)], playouts).
+    """
+    board = rebuild_board(size, cells)
+    if strategy == "alphabeta":
+        engine = _worker_engines.get((strategy, time_limit))
+        if engine is None:
+            engine = _worker_engines[(strategy, time_limit)] = AlphaBetaSearch(time_limit)
+        engine.choose_move(board, mode_name, lead, root_moves=moves)
+        return engine.depth_results
+    if strategy == "mcts":
+        # Root parallelisation: independent trees over the whole root, visit counts summed on merge
+        engine = MCTSSearch(time_limit * 1000, rng=random.Random(seed))
+        engine.choose_move(board, mode_name, lead)
+        return list(engine.root_visits.items()), engine.stats["playouts"]
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def merge_depths(results):
+    """Returns the best move key over alpha-beta workers' {depth: (move key, value)} results.
+
+    Values from different depths do not compare (odd and even depths favour different sides),
+    so only each worker's result at the deepest depth every worker completed is used.
+    """
+    depth = min(max(depths) for depths in results)
+    candidates = [depths[depth] for depths in results if depth in depths]
+    return max(candidates, key=lambda candidate: candidate[1])[0]
+
+
+class RootParallelSearch:
+    """Splits the root moves of an alpha-beta or MCTS search across the shared process pool
+    and merges the results.
+    """
+
+    def __init__(self, strategy="alphabeta", time_limit=1.0, workers=None, min_cells=PARALLEL_MIN_CELLS):
+        self.strategy = strategy
+        self.time_limit = time_limit
+        self.workers = workers or os.cpu_count() or 1
+        self.min_cells = min_cells
+        self.rng = random.Random()
+        self.serial_engine = None
+        self.last_parallel = False
+        # MCTS playouts over every search, serial or summed across workers, and the time they took
+        self.totals = {"searches": 0, "playouts": 0, "elapsed": 0.0}
+
+    def stop(self):
+        """Asks a running serial search to finish; worker processes stop at their own deadline."""
+        if self.serial_engine is not None:
+            self.serial_engine.stop()
+
+    def choose_move(self, board, mode_name, lead=0):
+        """Returns the best (row, col, letter) found across all workers."""
+        if board.is_full():
+            return None
+        if self.workers < 2 or len(board.cells) < self.min_cells:
+            self.last_parallel = False
+            return self.choose_serial(board, mode_name, lead)
+        self.last_parallel = True
+
+        moves = [index << 2 | code for index in board.free for code in (S, O)]
+        if self.strategy == "mcts":
+            chunks = [moves] * self.workers
+        else:
+            # Deal the moves round-robin so every worker gets a mix of good and bad candidates
+            chunks = [moves[worker::self.workers] for worker in range(self.workers)]
+        pool = get_pool(self.workers)
+        start = time.perf_counter()
+        cells = bytes(board.cells)
+        futures = [
+            pool.submit(search_chunk, self.strategy, self.time_limit, board.size, cells, mode_name,
+                        lead, chunk, self.rng.getrandbits(32))
+            for chunk in chunks if chunk
+        ]
+
+        results = [future.result() for future in futures]
+        if self.strategy == "mcts":
+            merged = {}
+            for visits, playouts in results:
+                for move, count in visits:
+                    merged[move] = merged.get(move, 0) + count
+                self.totals["playouts"] += playouts
+            self.totals["searches"] += 1
+            self.totals["elapsed"] += time.perf_counter() - start
+            best = max(merged, key=merged.get)
+        else:
+            best = merge_depths(results)
+        row, col = board.position(best >> 2)
+        return row, col, LETTERS[best & 3]
+
+    def choose_serial(self, board, mode_name, lead):
+        """Searches in this process, as used for small boards or a single worker."""
+        if self.serial_engine is None:
+            if self.strategy == "mcts":
+                self.serial_engine = MCTSSearch(self.time_limit * 1000)
+            else:
+                self.serial_engine = AlphaBetaSearch(self.time_limit)
+        move = self.serial_engine.choose_move(board, mode_name, lead)
+        if self.strategy == "mcts":
+            self.totals["searches"] += 1
+            self.totals["playouts"] += self.serial_engine.stats["playouts"]
+            self.totals["elapsed"] += self.serial_engine.stats["elapsed"]
+        return move
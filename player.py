@@ -1,5 +1,18 @@
 import random
 
+from board import EMPTY, LETTERS
+from endgame import ENDGAME_EMPTY_CELLS, EndgameSolver
+from mcts import MCTSSearch
+from opening_book import load_book
+from parallel import RootParallelSearch
+from search import AlphaBetaSearch
+from sos_numpy import board_array, move_maps, np, require_numpy
+from symmetry import SYMMETRY_MAX_CELLS, SymmetricHash, position_cache
+from tablebase import load_tablebase
+
+# Strategies a ComputerPlayer can play with, weakest and cheapest first
+STRATEGIES = ("heuristic", "vectorized", "alphabeta", "mcts")
+
 class BasePlayer:
     """Base class for a player in the SOS game."""
 
@@ -35,72 +48,160 @@ class HumanPlayer(BasePlayer):
 class ComputerPlayer(BasePlayer): 
     """Represents a computer player."""
 
-    def __init__(self, name, color, gui):
+    def __init__(self, name, color, gui, strategy="heuristic", time_limit=1.0, workers=1,
+                 endgame_cells=None):
         super().__init__(name, color)
         self.gui = gui
+        self.strategy = strategy  # "heuristic", "vectorized", "alphabeta" or "mcts"
+        if strategy == "vectorized":
+            require_numpy()
+        # Search engines keep their tables and trees between moves, so each player owns one
+        if workers > 1 and strategy in ("alphabeta", "mcts"):
+            # Root moves are split across a shared process pool (serial on small boards);
+            # heuristic moves are too cheap to be worth shipping to another process
+            self.engine = RootParallelSearch(strategy, time_limit, workers)
+        elif strategy == "alphabeta":
+            self.engine = AlphaBetaSearch(time_limit)
+        elif strategy == "mcts":
+            self.engine = MCTSSearch(time_limit * 1000)
+        else:
+            self.engine = None
+        # General games with endgame_cells or fewer empty cells are solved exactly (0 turns it off).
+        # Only search strategies solve by default; heuristic moves stay cheap enough to play inline.
+        if endgame_cells is None:
+            endgame_cells = ENDGAME_EMPTY_CELLS if self.engine else 0
+        self.endgame = EndgameSolver(endgame_cells) if endgame_cells else None
 
     def make_move(self, game_mode):
-        """Automatically make a move using a basic strategy."""
-        
+        """Automatically make a move using the configured strategy."""
+        move = self.choose_move(game_mode)
+        if move:
+            row, col, self.choice = move
+            game_mode.make_move(row, col, self.choice)
+
+    def stop(self):
+        """Asks a search running on another thread to return early."""
+        if self.engine:
+            self.engine.stop()
+        if self.endgame:
+            self.endgame.stop()
+
+    def ponder(self, game_mode):
+        """Searches the opponent's position until stop(), if the engine supports pondering."""
+        ponder = getattr(self.engine, "ponder", None)
+        if ponder:
+            ponder(game_mode.board, game_mode.name, -self.score_lead(game_mode))
+
+    def choose_move(self, game_mode):
+        """Returns the (row, col, letter) the computer wants to play, or None if the board is full.
+
+        game_mode only needs name, board, threats and sos_count, so a PositionSnapshot works too.
+        """
+        if self.endgame and game_mode.name == "General" and self.endgame.applies(game_mode.board):
+            move = self.endgame.choose_move(game_mode.board)
+            if move is not None:
+                return move
+        # Search engines index every cell, so boards stored sparsely are left to the heuristic
+        if self.engine and game_mode.board.dense:
+            cached = self.tablebase_move(game_mode) or self.book_move(game_mode) or self.cached_move(game_mode)
+            if cached is not None:
+                return cached
+            return self.engine.choose_move(game_mode.board, game_mode.name, self.score_lead(game_mode))
+        if self.strategy == "vectorized" and game_mode.board.dense:
+            return self.choose_vectorized_move(game_mode)
+        return self.choose_heuristic_move(game_mode)
+
+    def tablebase_move(self, game_mode):
+        """Returns the perfect move from a prebuilt tablebase, or None if there is no table for the board."""
+        tablebase = load_tablebase(game_mode.name, game_mode.board.size)
+        entry = tablebase.probe(game_mode.board) if tablebase else None
+        if entry is None:
+            return None
+        row, col = game_mode.board.position(entry[0] >> 2)
+        return row, col, LETTERS[entry[0] & 3]
+
+    def book_move(self, game_mode):
+        """Returns the opening book's move for the position, or None if it is out of book."""
+        book = load_book(game_mode.name, game_mode.board.size)
+        return book.probe(game_mode.board) if book else None
+
+    def cached_move(self, game_mode):
+        """Returns a move a search already proved for this position or a symmetric one, or None."""
+        board = game_mode.board
+        if len(board.cells) > SYMMETRY_MAX_CELLS or board.is_full():
+            return None
+        hashes = SymmetricHash.of_board(board)
+        key, transform = hashes.canonical()
+        entry = position_cache.get((game_mode.name, board.size, key))
+        if entry is None:
+            return None
+        move = hashes.from_canonical(entry[1], transform)
+        if board.cells[move >> 2] != EMPTY:
+            return None  # A hash collision; search the position instead
+        row, col = board.position(move >> 2)
+        return row, col, LETTERS[move & 3]
+
+    def score_lead(self, game_mode):
+        """Returns this player's SOS lead over the opponent (always 0 in Simple mode)."""
+        sos_count = getattr(game_mode, "sos_count", None)
+        if not sos_count:
+            return 0
+        return sos_count[self.color] - sum(count for color, count in sos_count.items() if color != self.color)
+
+    def choose_heuristic_move(self, game_mode):
+        """Pick a move using a basic strategy."""
         # 1. Check for immediate SOS opportunities
         move = self.find_sos_opportunity(game_mode)
         if move:
-            row, col, self.choice = move  # Unpack move details
-            game_mode.make_move(row, col, self.choice)
-            return
+            return move
 
-        # 2. Block the human player's SOS opportunities
+        # 2. Play a safe move that leaves the opponent no SOS to complete
         move = self.find_block_opportunity(game_mode)
         if move:
-            row, col, self.choice = move
-            game_mode.make_move(row, col, self.choice)
-            return
+            return move
 
         # 3. Default to a random move
-        empty_cells = self.gui.get_empty_cells()
-        if empty_cells:
-            row, col = random.choice(empty_cells)
-            self.choice = "S" if random.choice([True, False]) else "O"  # Randomly choose S or O
-            game_mode.make_move(row, col, self.choice)
+        cell = game_mode.board.random_empty_cell()
+        if cell:
+            row, col = cell
+            return (row, col, "S" if random.choice([True, False]) else "O")  # Randomly choose S or O
+        return None
+
+    def choose_vectorized_move(self, game_mode):
+        """Scores every empty cell and letter in one NumPy pass and plays a best one.
+
+        A move is worth ten per SOS it completes, less one per set-up it hands the opponent.
+        """
+        board = game_mode.board
+        if board.is_full():
+            return None
+        positions = board_array([board])
+        completions, setups = move_maps(positions)
+        scores = completions[0].astype(np.int32) * 10 - setups[0]
+        # Occupied cells can never be chosen
+        scores[:, positions[0] != EMPTY] = np.iinfo(np.int32).min
+        best = np.flatnonzero(scores == scores.max())
+        letter_code, row, col = np.unravel_index(random.choice(best), scores.shape)
+        return int(row), int(col), "SO"[letter_code]
 
     def find_sos_opportunity(self, game_mode):
-        """Find a cell that would complete an SOS sequence for the computer."""
-        for row in range(self.gui.board_size):
-            for col in range(self.gui.board_size):
-                # Check if placing "S" or "O" at (row, col) completes an SOS
-                if self.gui.board_buttons[row][col].cget("text") == " ":
-                    # Try placing "S"
-                    if self.check_sos(row, col, "S", game_mode):
-                        return (row, col, "S")
-                    # Try placing "O"
-                    if self.check_sos(row, col, "O", game_mode):
-                        return (row, col, "O")
+        """Find a cell that would complete the most SOS sequences for the computer."""
+        # The game mode's threat map keeps every scoring move bucketed by its SOS count
+        move = game_mode.threats.best_completion()
+        if move:
+            row, col, character, _ = move
+            return (row, col, character)
         return None
 
     def find_block_opportunity(self, game_mode):
-        """Find a cell that would block the human player from creating an SOS."""
-        for row in range(self.gui.board_size):
-            for col in range(self.gui.board_size):
-                # Check if placing "S" at (row, col) blocks a potential SOS by the human player
-                if self.gui.board_buttons[row][col].cget("text") == " ":
-                    if self.check_opponent_sos(row, col, "S", game_mode):
-                        return (row, col, "S")
-        return None
+        """Find a move that does not hand the opponent an SOS on their next turn."""
+        # The threat map indexes every poisoned move (S_S, SO_ or _OS set-ups), so sample outside it
+        return game_mode.threats.random_safe_move(random)
 
     def check_sos(self, row, col, character, game_mode):
         """Check if placing a character at (row, col) would create an SOS."""
-        # Temporarily place the character in the empty cell
-        self.gui.board_buttons[row][col].config(text=character)
-        # Check for SOS patterns (horizontal, vertical, diagonal)
-        is_sos = game_mode.is_sos_sequence(row, col)
-        # Reset the cell to empty after checking
-        self.gui.board_buttons[row][col].config(text=" ")
-        return is_sos
+        return game_mode.threats.completions_at(row, col, character) > 0
 
     def check_opponent_sos(self, row, col, character, game_mode):
-        """Check if placing 'S' in (row, col) could block an opponent's potential SOS."""
-        # Temporarily place the character in the empty cell
-        self.gui.board_buttons[row][col].config(text=character)
-        is_sos = game_mode.is_sos_sequence(row, col)
-        self.gui.board_buttons[row][col].config(text=" ")
-        return is_sos
+        """Check if placing a character at (row, col) would set up an SOS for the opponent."""
+        return game_mode.threats.is_poisoned(row, col, character)
@@ -0,0 +1,96 @@
+from board import Board, CODES, EMPTY
+
+# Moves between full-board keyframes; seeking replays fewer moves than this
+KEYFRAME_INTERVAL = 32
+
+
+class Replay:
+    """A recorded game that can be shown at any move without replaying it from the start.
+
+    The board is stored in full every keyframe_interval moves. Every move is also kept as
+    a delta (cell, letter and the SOS lines it formed). Seeking steps through deltas from
+    the current position or from the nearest keyframe, whichever is closer.
+    """
+
+    def __init__(self, record, keyframe_interval=KEYFRAME_INTERVAL):
+        self.size = record.size
+        self.mode_name = record.mode_name
+        self.keyframe_interval = keyframe_interval
+        self.moves = []  # (index, code, player) of every move
+        self.lines = []  # Per move: ((row, col) x 3, player) of each SOS it formed
+        self.scores = [{"Blue": 0, "Red": 0}]  # Scores after each number of moves
+        self.keyframes = []  # Board cells after 0, interval, 2 * interval, ... moves
+
+        board = Board(self.size)
+        for number, (row, col, letter, player, sos) in enumerate(record):
+            if number % keyframe_interval == 0:
+                self.keyframes.append(bytes(board.cells))
+            board.place(row, col, letter)
+            self.moves.append((board.index(row, col), CODES[letter], player))
+            self.lines.append([
+                (tuple(board.position(index) for index in triple), player)
+                for triple in board.sos_lines_at(row, col)
+            ])
+            scores = dict(self.scores[-1])
+            scores[player] += sos
+            self.scores.append(scores)
+        if len(self.moves) % keyframe_interval == 0:
+            self.keyframes.append(bytes(board.cells))
+
+        self.board = Board(self.size)
+        self.position = 0  # Moves played on self.board
+        self.steps = 0  # Moves applied or taken back by the last seek
+
+    def __len__(self):
+        return len(self.moves)
+
+    def seek(self, target):
+        """Shows the position after target moves and returns what changed for the display.
+
+        Returns (cells, added, removed): the (row, col) of every cell whose letter changed,
+        the SOS lines that appeared as (cells, player), and the cells of lines that went away.
+        """
+        target = max(0, min(target, len(self.moves)))
+        start = self.position
+        cells = self.board.cells
+        previous = {}  # Index -> code before this seek, for every cell touched
+        self.steps = 0
+
+        keyframe = target // self.keyframe_interval
+        if abs(target - start) > target - keyframe * self.keyframe_interval:
+            # The keyframe is closer than the current position, so restore it first
+            for index, code in enumerate(self.keyframes[keyframe]):
+                if cells[index] != code:
+                    previous.setdefault(index, cells[index])
+                    self.board.set_code(index, code)
+            self.position = keyframe * self.keyframe_interval
+
+        while self.position < target:
+            index, code, _ = self.moves[self.position]
+            previous.setdefault(index, cells[index])
+            self.board.set_code(index, code)
+            self.position += 1
+            self.steps += 1
+        while self.position > target:
+            self.position -= 1
+            index = self.moves[self.position][0]
+            previous.setdefault(index, cells[index])
+            self.board.set_code(index, EMPTY)
+            self.steps += 1
+
+        changed = [self.board.position(index) for index, code in previous.items() if cells[index] != code]
+        if target >= start:
+            added = [line for lines in self.lines[start:target] for line in lines]
+            removed = []
+        else:
+            added = []
+            removed = [line[0] for lines in self.lines[target:start] for line in lines]
+        return changed, added, removed
+
+    def scores_at(self, position=None):
+        """Returns the scores after the given number of moves (default the current position)."""
+        return self.scores[self.position if position is None else position]
+
+    def last_player(self):
+        """Returns the player of the move that led to the current position, or None at the start."""
+        return self.moves[self.position - 1][2] if self.position else None
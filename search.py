@@ -0,0 +1,252 @@
+import math
+import time
+
+from board import EMPTY, LETTERS, S, O
+from symmetry import SYMMETRY_MAX_CELLS, SymmetricHash, position_cache
+from threats import ThreatMap
+
+# Value of winning a Simple game; remaining depth is added so quicker wins score higher
+WIN_SCORE = 1000
+
+# Bound on any search value
+INFINITY = 10 ** 9
+
+# How often (in nodes) the search checks its deadline
+NODES_PER_CLOCK_CHECK = 512
+
+# Nodes a ponder search may visit before it gives up on deepening further
+PONDER_NODES = 1 << 20
+
+# Transposition table entry flags
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget for a move runs out."""
+
+
+class TranspositionTable:
+    """Fixed-size table of search results indexed by the low bits of a Zobrist hash."""
+
+    def __init__(self, size_bits=18):
+        self.mask = (1 << size_bits) - 1
+        self.entries = [None] * (1 << size_bits)
+        self.generation = 0
+
+    def new_search(self):
+        """Marks existing entries as coming from an earlier search."""
+        self.generation += 1
+
+    def probe(self, key):
+        """Returns (depth, value, flag, move) stored for the hash, or None."""
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry[1:5]
+        return None
+
+    def store(self, key, depth, value, flag, move):
+        """Stores a result, preferring deeper entries from the current search."""
+        slot = key & self.mask
+        old = self.entries[slot]
+        # Depth-preferred replacement, but entries left over from earlier searches always yield
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.entries[slot] = (key, depth, value, flag, move, self.generation)
+
+
+class AlphaBetaSearch:
+    """Negamax search with alpha-beta pruning, iterative deepening and a transposition table.
+
+    On small boards the table is keyed by the canonical hash over the board's 8 symmetries,
+    so a position reached in a rotated or reflected form is searched only once.
+    """
+
+    def __init__(self, time_limit=1.0, max_depth=64, table_bits=18, symmetry=True):
+        self.time_limit = time_limit  # Seconds allowed per move
+        self.max_depth = max_depth
+        self.symmetry = symmetry
+        self.table = TranspositionTable(table_bits)
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_results = {}
+        self.best_value = 0
+        self.root_moves = None
+        self.stop_requested = False
+
+    def stop(self):
+        """Asks a running search (on another thread) to finish as soon as possible."""
+        self.stop_requested = True
+
+    def choose_move(self, board, mode_name, lead=0, root_moves=None):
+        """Returns the best (row, col, letter) found for the side to move within the time budget.
+
+        lead is accepted for parity with the other engines; maximizing the SOS difference from
+        here on picks the same move whatever the current score. root_moves optionally restricts
+        the root to a subset of move keys (index << 2 | letter code), as used by root-parallel search.
+        """
+        if board.is_full():
+            return None
+        best_move = self.search(board, mode_name, root_moves, self.time_limit)
+        row, col = self.board.position(best_move >> 2)
+        return row, col, LETTERS[best_move & 3]
+
+    def ponder(self, board, mode_name, lead=0):
+        """Searches a position the opponent is to move in, without a time limit, until stop()
+        or PONDER_NODES nodes.
+
+        Everything found stays in the transposition table, where the search after the
+        opponent's reply picks it up.
+        """
+        if not board.is_full():
+            self.search(board, mode_name, None, None, PONDER_NODES)
+
+    def search(self, board, mode_name, root_moves, time_limit, max_nodes=None):
+        """Deepens iteratively until the time limit (seconds, None for none), max_nodes or a stop;
+        returns the best move key.
+        """
+        self.root_moves = set(root_moves) if root_moves is not None else None
+        self.board = board.copy()  # Search never touches the live board or its widgets
+        self.threats = ThreatMap(self.board)
+        symmetric = self.symmetry and len(self.board.cells) <= SYMMETRY_MAX_CELLS
+        self.hashes = SymmetricHash.of_board(self.board, symmetric)
+        self.sudden_death = mode_name == "Simple"
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else math.inf
+        self.max_nodes = max_nodes if max_nodes is not None else math.inf
+        self.stop_requested = False
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_results = {}  # Completed depth -> (move key, value), for merging root-parallel workers
+        self.table.new_search()
+
+        empty_count = len(self.board.cells) - self.board.filled
+        best_move = None
+        for depth in range(1, min(self.max_depth, empty_count) + 1):
+            try:
+                value, move = self.search_root(depth)
+            except SearchTimeout:
+                break
+            best_move, self.best_value = move, value
+            self.completed_depth = depth
+            self.depth_results[depth] = (move, value)
+        if best_move is None:
+            # Not even one ply finished in time, so fall back to the first ordered move
+            best_move, self.best_value = self.root_ordered_moves(None)[0], 0
+            self.depth_results[0] = (best_move, 0)
+        elif self.completed_depth == empty_count and self.root_moves is None:
+            # Searched to the end of the game: the move is proven, so every player may reuse it
+            key, transform = self.hashes.canonical()
+            position_cache.put((mode_name, self.board.size, key),
+                               (self.best_value, self.hashes.to_canonical(best_move, transform)))
+        return best_move
+
+    def search_root(self, depth):
+        """Searches every root move to the given depth and returns (value, move key)."""
+        key, transform = self.hashes.canonical()
+        entry = self.table.probe(key)
+        table_move = self.hashes.from_canonical(entry[3], transform) if entry else None
+        best_value, best_move = -INFINITY, None
+        alpha, beta = -INFINITY, INFINITY
+        for move in self.root_ordered_moves(table_move):
+            value = self.search_move(move, depth, alpha, beta)
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+        if self.root_moves is None:
+            # A restricted root is not the real position's value, so keep it out of the table
+            self.table.store(key, depth, best_value, EXACT, self.hashes.to_canonical(best_move, transform))
+        return best_value, best_move
+
+    def root_ordered_moves(self, table_move):
+        """Returns the ordered root moves, limited to root_moves when set."""
+        moves = self.ordered_moves(table_move)
+        if self.root_moves is None:
+            return moves
+        return [move for move in moves if move in self.root_moves]
+
+    def search_move(self, move, depth, alpha, beta):
+        """Plays a move, scores the rest of the game from the mover's view and takes it back."""
+        index, code = move >> 2, move & 3
+        gained = self.threats.completions.get(move, 0)
+        self.board.set_code(index, code)
+        self.hashes.toggle(index, code)
+        try:
+            if gained and self.sudden_death:
+                value = WIN_SCORE + depth
+            elif gained:
+                # Forming an SOS earns an extra turn, so the same side keeps moving
+                value = gained + self.negamax(depth - 1, alpha - gained, beta - gained)
+            else:
+                value = -self.negamax(depth - 1, -beta, -alpha)
+        finally:
+            self.hashes.toggle(index, code)
+            self.board.set_code(index, EMPTY)
+        return value
+
+    def negamax(self, depth, alpha, beta):
+        """Returns the value of the position for the side to move."""
+        self.nodes += 1
+        if self.nodes % NODES_PER_CLOCK_CHECK == 0 and (
+                self.stop_requested or self.nodes >= self.max_nodes or time.perf_counter() > self.deadline):
+            raise SearchTimeout()
+        if self.board.is_full():
+            return 0
+        if depth == 0:
+            return self.evaluate()
+
+        original_alpha = alpha
+        key, transform = self.hashes.canonical()
+        entry = self.table.probe(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, value, flag, table_move = entry
+            table_move = self.hashes.from_canonical(table_move, transform)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best_value, best_move = -INFINITY, None
+        for move in self.ordered_moves(table_move):
+            value = self.search_move(move, depth, alpha, beta)
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table.store(key, depth, best_value, flag, self.hashes.to_canonical(best_move, transform))
+        return best_value
+
+    def evaluate(self):
+        """Estimates a quiet position: the side to move can take the best completion on offer."""
+        best = self.threats.best_completion()
+        if best is None:
+            return 0
+        return WIN_SCORE if self.sudden_death else best[3]
+
+    def ordered_moves(self, table_move):
+        """Returns move keys: table move, scoring moves by size, safe moves, then poisoned moves."""
+        threats = self.threats
+        scoring = sorted(threats.completions, key=threats.completions.get, reverse=True)
+        safe, poisoned = [], []
+        for index in self.board.free:
+            for code in (S, O):
+                key = index << 2 | code
+                if key in threats.completions:
+                    continue
+                (poisoned if key in threats.poisoned else safe).append(key)
+        moves = scoring + safe + poisoned
+        if table_move is not None and table_move in moves:
+            moves.remove(table_move)
+            moves.insert(0, table_move)
+        return moves
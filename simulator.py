@@ -0,0 +1,166 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import random
+import time
+
+from game_modes import BOARD_TYPES
+from game_record import GameRecordWriter
+from player import ComputerPlayer
+from threats import ThreatMap
+
+# Games handed to a worker process at a time; results stream back one chunk at a time
+CHUNK_SIZE = 64
+
+# Boards above this size default to the sparse backend; the dense per-cell line tables
+# take seconds and hundreds of MB to build beyond a few hundred cells per side
+SPARSE_MIN_SIZE = 101
+
+
+def default_board_type(board_size):
+    """Returns the board backend (a key of BOARD_TYPES) a game of this size uses unless told otherwise."""
+    return "sparse" if board_size >= SPARSE_MIN_SIZE else "array"
+
+
+class SimulatedGame:
+    """Headless game state with the attributes ComputerPlayer.choose_move reads."""
+
+    def __init__(self, board_size, mode_name, board_type=None):
+        self.name = mode_name
+        self.board = BOARD_TYPES[board_type or default_board_type(board_size)](board_size)
+        self.threats = ThreatMap(self.board)
+        self.sos_count = {"Blue": 0, "Red": 0}
+
+
+def play_game(board_size, mode_name, blue_strategy="heuristic", red_strategy="heuristic",
+              time_limit=0.1, seed=None, endgame_cells=0, record=False, board_type=None):
+    """Plays one Computer-vs-Computer game without a GUI and returns its result as a dict.
+
+    Endgames are only solved exactly when endgame_cells is given, so throughput stays comparable.
+    board_type picks the board backend (a key of BOARD_TYPES); by default large boards are sparse.
+
+    With record set, the result also lists every move as [row, col, letter, player, SOS formed].
+    """
+    # The heuristic player draws from the module-level random generator
+    random.seed(seed)
+    game = SimulatedGame(board_size, mode_name, board_type)
+    players = {
+        "Blue": ComputerPlayer("Blue", "Blue", None, blue_strategy, time_limit, endgame_cells=endgame_cells),
+        "Red": ComputerPlayer("Red", "Red", None, red_strategy, time_limit, endgame_cells=endgame_cells),
+    }
+    current = "Blue"
+    winner = None
+    moves = 0
+    played = []
+    start = time.perf_counter()
+    while not game.board.is_full():
+        row, col, letter = players[current].choose_move(game)
+        gained = game.threats.completions_at(row, col, letter)
+        game.board.place(row, col, letter)
+        moves += 1
+        if record:
+            played.append([row, col, letter, current, gained])
+        if gained:
+            game.sos_count[current] += gained
+            if mode_name == "Simple":
+                winner = current
+                break
+            continue  # Forming an SOS earns an extra turn
+        current = "Red" if current == "Blue" else "Blue"
+
+    if mode_name == "General":
+        blue, red = game.sos_count["Blue"], game.sos_count["Red"]
+        winner = "Blue" if blue > red else "Red" if red > blue else None
+    result = {
+        "seed": seed,
+        "board_size": board_size,
+        "mode": mode_name,
+        "winner": winner or "Draw",
+        "scores": dict(game.sos_count),
+        "moves": moves,
+        "duration": time.perf_counter() - start,
+        # Exact endgame solving summed over both players, for tuning endgame_cells
+        "endgame": {
+            key: sum(player.endgame.totals[key] for player in players.values() if player.endgame)
+            for key in ("solves", "nodes", "elapsed")
+        },
+        # MCTS playouts summed over both players, for tuning time limits and exploration
+        "mcts": mcts_totals(players.values()),
+    }
+    if record:
+        result["record"] = played
+    return result
+
+
+def mcts_totals(players):
+    """Returns the searches, playouts, seconds and playouts per second of the players' MCTS engines."""
+    engines = [player.engine for player in players if player.strategy == "mcts" and player.engine]
+    totals = {key: sum(engine.totals[key] for engine in engines) for key in ("searches", "playouts", "elapsed")}
+    totals["playouts_per_second"] = totals["playouts"] / totals["elapsed"] if totals["elapsed"] else 0.0
+    return totals
+
+
+def play_games(board_size, mode_name, blue_strategy, red_strategy, time_limit, seeds, endgame_cells, record,
+               board_type):
+    """Plays a chunk of games in a worker process."""
+    return [
+        play_game(board_size, mode_name, blue_strategy, red_strategy, time_limit, seed, endgame_cells, record,
+                  board_type)
+        for seed in seeds
+    ]
+
+
+def simulate(games, board_size=8, mode_name="General", blue_strategy="heuristic", red_strategy="heuristic",
+             time_limit=0.1, workers=None, seed=0, endgame_cells=0, record=False, board_type=None):
+    """Yields game results as worker processes finish them, in completion order."""
+    seeds = range(seed, seed + games)
+    chunks = [seeds[start:start + CHUNK_SIZE] for start in range(0, games, CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+    if workers < 2:
+        for chunk in chunks:
+            yield from play_games(board_size, mode_name, blue_strategy, red_strategy, time_limit, chunk,
+                                  endgame_cells, record, board_type)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(play_games, board_size, mode_name, blue_strategy, red_strategy, time_limit, chunk,
+                        endgame_cells, record, board_type)
+            for chunk in chunks
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            yield from future.result()
+
+
+def main(argv=None):
+    """Command-line entry point that streams one JSON line per game to stdout."""
+    parser = argparse.ArgumentParser(description="Play Computer-vs-Computer SOS games without a GUI.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--size", type=int, default=8, help="board size")
+    parser.add_argument("--mode", choices=["Simple", "General"], default="General", help="game mode")
+    parser.add_argument("--blue", default="heuristic", help="Blue strategy (heuristic, vectorized, alphabeta, mcts)")
+    parser.add_argument("--red", default="heuristic", help="Red strategy (heuristic, vectorized, alphabeta, mcts)")
+    parser.add_argument("--time-limit", type=float, default=0.1, help="seconds per move for search strategies")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--endgame-cells", type=int, default=0,
+                        help="empty cells at which General endgames are solved exactly (default 0, never)")
+    parser.add_argument("--record", help="append every game's moves to this binary game record file")
+    parser.add_argument("--board-type", choices=sorted(BOARD_TYPES), default=None,
+                        help=f"board backend (default: sparse from size {SPARSE_MIN_SIZE}, else array)")
+    args = parser.parse_args(argv)
+
+    writer = GameRecordWriter(args.record) if args.record else None
+    try:
+        for result in simulate(args.games, args.size, args.mode, args.blue, args.red, args.time_limit,
+                               args.workers, args.seed, args.endgame_cells, writer is not None, args.board_type):
+            if writer:
+                writer.write_game(args.size, args.mode, result.pop("record"))
+            print(json.dumps(result), flush=True)
+    finally:
+        if writer:
+            writer.close()
+
+
+if __name__ == "__main__":
+    main()
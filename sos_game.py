@@ -1,14 +1,19 @@
+import argparse
+import sys
 import tkinter as tk
+import simulator
 from game_manager import GameManager 
+from player import STRATEGIES
 from sos_gui import SOSGameGUI         
 
-def main():
+def main(record_path=None, computer_strategy="heuristic", computer_workers=1):
     # Initialize the main Tkinter root window
     root = tk.Tk()
     root.title("SOS Game")
 
-    # Set up the GUI
-    gui = SOSGameGUI(root)
+    # Set up the GUI; finished games are appended to record_path for replaying later, and the
+    # computer strategy controls start at the given strategy and worker count
+    gui = SOSGameGUI(root, record_path, computer_strategy, computer_workers)
 
     # Initialize the GameManager with the GUI reference and other settings
     game_manager = GameManager(board_size=3, game_mode="Simple", gui=gui)
@@ -16,6 +21,20 @@ def main():
     # Run the main loop
     root.mainloop()
 
+def simulate(argv=None):
+    # Play Computer-vs-Computer games headlessly and stream JSON lines (see simulator.py)
+    simulator.main(argv)
+
 if __name__ == "__main__":
-    main()
+    # "python sos_game.py simulate --games 1000 --size 8" runs the headless simulator instead
+    if sys.argv[1:2] == ["simulate"]:
+        simulate(sys.argv[2:])
+    else:
+        parser = argparse.ArgumentParser(description="Play SOS.")
+        parser.add_argument("--record", help="append every finished game to this game record file")
+        parser.add_argument("--strategy", choices=STRATEGIES, default="heuristic",
+                            help="initial computer strategy (also selectable in the window)")
+        parser.add_argument("--workers", type=int, default=1, help="initial processes a computer may search with")
+        args = parser.parse_args()
+        main(args.record, args.strategy, args.workers)
 
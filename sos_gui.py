@@ -1,19 +1,41 @@
+import os
 import tkinter as tk
+from tkinter import filedialog, messagebox, simpledialog
+from board_canvas import BoardCanvas
+from events import (CELL_CLEARED, CELL_PLACED, GAME_ENDED, INVALID_MOVE, SCORE_CHANGED, SOS_FORMED, SOS_UNDONE,
+                    TURN_CHANGED)
 from game_manager import GameManager
+from game_record import count_games, read_game
 from player import HumanPlayer, ComputerPlayer
+from replay import Replay
+from sos_numpy import np
+
+
+# Largest board the size selector allows; the canvas scrolls once the board outgrows the window
+MAX_BOARD_SIZE = 100
+
+# Computer strategies offered in the GUI, as (label, ComputerPlayer strategy); vectorized needs NumPy
+STRATEGY_CHOICES = (("Heuristic", "heuristic"), ("Alpha-beta", "alphabeta"), ("MCTS", "mcts")) + (
+    (("Vectorized", "vectorized"),) if np is not None else ())
 
 
 class SOSGameGUI:
-    def __init__(self, root):
+    def __init__(self, root, record_path=None, computer_strategy="heuristic", computer_workers=1):
         self.root = root
+        self.computer_strategy = computer_strategy  # Initial choices of the computer strategy controls
+        self.computer_workers = computer_workers
         self.root.title("SOS Application")
         self.board_size = 3
         self.game_mode = "Simple"
         self.is_game_active = False
-        self.board_buttons = [] 
         self.blue_score_label = tk.Label(self.root, text="Blue SOS: 0")
         self.red_score_label = tk.Label(self.root, text="Red SOS: 0")
-        self.game_manager = GameManager(self.board_size, self.game_mode, self)  # Pass self as the GUI reference
+        # Pass self as the GUI reference; finished games go to record_path when one is given
+        self.game_manager = GameManager(self.board_size, self.game_mode, self, record_path=record_path)
+        # Game events queue up here and are drawn together once Tk is idle
+        self.pending_events = []
+        self.flush_id = None
+        self.game_manager.events.subscribe(self.on_game_event)
         self.create_ui()
 
     def create_ui(self):
@@ -57,47 +79,100 @@ class SOSGameGUI:
         self.red_score_label = tk.Label(self.main_frame, text="Red SOS: 0")
         self.red_score_label.grid(row=3, column=2, padx=10, pady=5)
 
-    def create_board_frame(self):
-        """Sets up the frame that will hold the game board and initializes it."""
-        self.board_frame = tk.Frame(self.main_frame)
-        self.board_frame.grid(row=1, column=1, padx=20, pady=10)
-        self.create_board()
-
     def create_board(self):
-        """Creates the game board dynamically with black text as the initial color."""
-        for widget in self.board_frame.winfo_children():
-            widget.destroy()
-
-        self.board_buttons = []
-        for i in range(self.board_size):
-            row_buttons = []
-            for j in range(self.board_size):
-                button = tk.Button(
-                    self.board_frame,
-                    text=' ',
-                    width=5,
-                    height=2,
-                    fg="black",  # Set initial text color to black
-                    command=lambda r=i, c=j: self.on_board_click(r, c)
-                )
-                button.grid(row=i, column=j, padx=10, pady=10, sticky="nsew")
-                row_buttons.append(button)
-            self.board_buttons.append(row_buttons)
-
-        # Configure rows and columns to expand proportionally
-        for i in range(self.board_size):
-            self.board_frame.grid_rowconfigure(i, weight=1)
-            self.board_frame.grid_columnconfigure(i, weight=1)
+        """Redraws the board canvas empty at the current board size."""
+        self.board_view.reset(self.board_size)
 
     def update_button(self, row, col, text, color="black"):
-        """Updates the button text and color at the specified board position."""
-        self.board_buttons[row][col].config(text=text, fg=color)
+        """Draws the letter and color of the cell at the specified board position."""
+        self.board_view.draw_cell(row, col, text, color)
+
+    def on_game_event(self, kind, data):
+        """Queues a game event and makes sure the queue is drawn at the next idle cycle."""
+        self.pending_events.append((kind, data))
+        if self.flush_id is None:
+            self.flush_id = self.root.after_idle(self.flush_events)
+
+    def discard_pending_events(self):
+        """Drops queued events so nothing from a finished game reaches a new board."""
+        self.pending_events = []
+        if self.flush_id is not None:
+            self.root.after_cancel(self.flush_id)
+            self.flush_id = None
+
+    def flush_events(self):
+        """Draws every queued event in one pass, touching each cell and label at most once."""
+        self.flush_id = None
+        events, self.pending_events = self.pending_events, []
+        cells = {}  # (row, col) -> (letter, color) after all the events
+        strokes = []  # (draw, start, end, color) in event order
+        uncovered = set()  # Cells of erased strokes, recolored once the strokes are settled
+        scores = turn = status = None
+        ended = False
+        for kind, data in events:
+            if kind == CELL_PLACED:
+                cells[(data["row"], data["col"])] = (data["letter"], "black")
+            elif kind == SOS_FORMED:
+                color = data["player"].lower()
+                sos_cells = data["cells"]
+                for start in range(0, len(sos_cells), 3):
+                    line = sos_cells[start:start + 3]
+                    for cell, letter in zip(line, "SOS"):
+                        cells[cell] = (letter, color)
+                    strokes.append((True, line[0], line[2], color))
+                if self.game_manager.game_mode == "General":
+                    status = f"{data['player']} formed {data['count']} SOS! They get an extra turn!"
+            elif kind == CELL_CLEARED:
+                cells[(data["row"], data["col"])] = (" ", "black")
+            elif kind == SOS_UNDONE:
+                sos_cells = data["cells"]
+                for start in range(0, len(sos_cells), 3):
+                    line = sos_cells[start:start + 3]
+                    uncovered.update(line)
+                    strokes.append((False, line[0], line[2], None))
+            elif kind == SCORE_CHANGED:
+                scores = data["scores"]
+            elif kind == TURN_CHANGED:
+                turn = data["player"]
+                status = f"Current turn: {turn}"
+            elif kind == INVALID_MOVE:
+                status = f"Invalid move. Try again. Current Turn: {data['player']}"
+            elif kind == GAME_ENDED:
+                ended = True
+                if data["winner"]:
+                    status = f"{data['winner']} wins!"
+                elif data["mode"] == "Simple":
+                    status = "The game is a draw! No SOS was created."
+                else:
+                    status = "The game is a draw!"
+
+        for draw, start, end, color in strokes:
+            if draw:
+                self.board_view.draw_sos_line(start, end, color)
+            else:
+                self.board_view.erase_sos_line(start, end)
+        for cell in uncovered:
+            letter = cells.get(cell, (self.board_view.cell_text(*cell),))[0]
+            if letter != " ":
+                # A letter keeps the color of any SOS still running through it
+                cells[cell] = (letter, self.board_view.line_color_at(*cell) or "black")
+        for (row, col), (letter, color) in cells.items():
+            self.update_button(row, col, letter, color)
+        if scores is not None:
+            self.blue_score_label.config(text=f"Blue SOS: {scores['Blue']}")
+            self.red_score_label.config(text=f"Red SOS: {scores['Red']}")
+        if turn is not None:
+            # Only a human player may pick letters on their turn
+            human = isinstance(self.game_manager.players[turn], HumanPlayer)
+            self.set_player_controls_state(turn, "normal" if human else "disabled")
+        if status is not None:
+            self.turn_label.config(text=status)
+        if ended:
+            self.disable_buttons()
 
     def disable_buttons(self):
-        """Disables all buttons on the board, typically when the game ends."""
-        for row in self.board_buttons:
-            for button in row:
-                button.config(state="disabled")
+        """Stops the board from taking clicks, typically when the game ends."""
+        self.board_view.set_enabled(False)
 
     def create_player_controls(self, parent, player_name):
         """Creates control buttons for player choice between 'S' and 'O'."""
@@ -129,7 +204,7 @@ class SOSGameGUI:
         board_size_label.grid(row=0, column=2, padx=5, pady=1, sticky="w")
         self.board_size_var = tk.IntVar(value=3)
         vcmd = (self.root.register(self.validate_board_size), '%P')
-        self.board_size_spinbox = tk.Spinbox(parent, from_=3, to=20, textvariable=self.board_size_var,
+        self.board_size_spinbox = tk.Spinbox(parent, from_=3, to=MAX_BOARD_SIZE, textvariable=self.board_size_var,
                                              validate="key", validatecommand=vcmd, width=3)
         self.board_size_spinbox.grid(row=0, column=3, padx=5, pady=1, sticky="w")
 
@@ -145,19 +220,56 @@ class SOSGameGUI:
         tk.Radiobutton(parent, text="Human", variable=self.red_player_type, value="Human").grid(row=2, column=1)
         tk.Radiobutton(parent, text="Computer", variable=self.red_player_type, value="Computer").grid(row=2, column=2)
 
+        # How quickly computer players move; Turbo plays them as fast as the board can be drawn
+        tk.Label(parent, text="Pacing").grid(row=3, column=0, padx=5, pady=1, sticky="w")
+        self.pacing_var = tk.StringVar(value="Normal")
+        for column, pacing in enumerate(("Normal", "Fast", "Turbo"), start=1):
+            tk.Radiobutton(parent, text=pacing, variable=self.pacing_var, value=pacing).grid(row=3, column=column)
+
+        # How strongly computer players search, and how many processes they may search with
+        tk.Label(parent, text="Computer").grid(row=4, column=0, padx=5, pady=1, sticky="w")
+        self.strategy_var = tk.StringVar(value=self.computer_strategy)
+        for column, (label, strategy) in enumerate(STRATEGY_CHOICES, start=1):
+            tk.Radiobutton(parent, text=label, variable=self.strategy_var, value=strategy).grid(row=4, column=column)
+        tk.Label(parent, text="Workers").grid(row=5, column=0, padx=5, pady=1, sticky="w")
+        self.workers_var = tk.IntVar(value=self.computer_workers)
+        self.workers_spinbox = tk.Spinbox(parent, from_=1, to=os.cpu_count() or 1, textvariable=self.workers_var,
+                                          width=3)
+        self.workers_spinbox.grid(row=5, column=1, padx=5, pady=1, sticky="w")
+
     def setup_bottom_controls(self, parent):
         """Sets up the bottom controls like Start/End game button and Current Turn label."""
         self.start_button = tk.Button(parent, text="Start Game", command=self.toggle_game)
         self.start_button.grid(row=0, column=0, padx=10, pady=5)
 
+        history_frame = tk.Frame(parent)
+        history_frame.grid(row=2, column=0, padx=10, pady=5)
+        self.undo_button = tk.Button(history_frame, text="Undo", command=self.undo_move, state="disabled")
+        self.undo_button.grid(row=0, column=0, padx=5)
+        self.redo_button = tk.Button(history_frame, text="Redo", command=self.redo_move, state="disabled")
+        self.redo_button.grid(row=0, column=1, padx=5)
+
         self.turn_label = tk.Label(parent, text="Current turn: Blue")
         self.turn_label.grid(row=1, column=0, padx=10, pady=5)
         self.turn_label.grid_remove()  # Hide initially until game starts
 
+        # Recorded games are replayed here, scrubbing with the slider to any move
+        self.replay = None
+        self.replay_button = tk.Button(parent, text="Replay...", command=self.open_replay)
+        self.replay_button.grid(row=3, column=0, padx=10, pady=5)
+        self.replay_frame = tk.Frame(parent)
+        self.replay_frame.grid(row=4, column=0, padx=10, pady=5)
+        self.replay_slider = tk.Scale(self.replay_frame, orient="horizontal", length=300, command=self.seek_replay)
+        self.replay_slider.grid(row=0, column=0, columnspan=2)
+        self.replay_label = tk.Label(self.replay_frame, text="")
+        self.replay_label.grid(row=1, column=0, padx=5)
+        tk.Button(self.replay_frame, text="Close Replay", command=self.close_replay).grid(row=1, column=1, padx=5)
+        self.replay_frame.grid_remove()
+
     def create_scrollable_board_frame(self):
-        """Sets up the frame that will hold the game board."""
-        self.board_frame = tk.Frame(self.main_frame)
-        self.board_frame.grid(row=1, column=1, padx=20, pady=10)
+        """Sets up the canvas that draws the game board and scrolls when it is large."""
+        self.board_view = BoardCanvas(self.main_frame, self.on_board_click)
+        self.board_view.grid(row=1, column=1, padx=20, pady=10)
 
     def toggle_game(self):
         if self.start_button["text"] == "Start Game":
@@ -176,8 +288,11 @@ class SOSGameGUI:
         blue_type = self.blue_player_type.get() 
         red_type = self.red_player_type.get()  
 
-        # Set up the game manager with player types and game mode
-        self.game_manager.reset_game(self.board_size, selected_mode, blue_type, red_type)
+        # Set up the game manager with player types, game mode and pacing
+        self.discard_pending_events()
+        self.game_manager.set_pacing(self.pacing_var.get())
+        self.game_manager.reset_game(self.board_size, selected_mode, blue_type, red_type,
+                                     self.strategy_var.get(), self.workers_var.get())
 
         # Display the chosen game mode and board size
         self.turn_label.config(text=f"Game Mode: {selected_mode}, Board Size: {self.board_size}x{self.board_size}")
@@ -200,7 +315,9 @@ class SOSGameGUI:
 
         # Trigger the first move if the current player is a ComputerPlayer
         if isinstance(self.game_manager.current_player, ComputerPlayer):
-            self.game_manager.current_player.make_move(self.game_manager.mode)
+            self.game_manager.schedule_computer_move()
+        else:
+            self.game_manager.ponder_if_waiting()
 
     def end_game(self):
         self.is_game_active = False
@@ -222,7 +339,10 @@ class SOSGameGUI:
                 widget.config(state="disabled")
 
         self.disable_buttons()
+        self.undo_button.config(state="disabled")
+        self.redo_button.config(state="disabled")
         self.start_button.config(state="normal")
+        self.replay_button.config(state="normal")
 
     def enable_gameplay_controls(self):
         """Enables gameplay controls and disables game mode and board size options."""
@@ -236,12 +356,103 @@ class SOSGameGUI:
             if isinstance(widget, tk.Radiobutton):
                 widget.config(state="normal")
 
-        for row in self.board_buttons:
-            for button in row:
-                button.config(state="normal")
+        self.board_view.set_enabled(True)
+        self.undo_button.config(state="normal")
+        self.redo_button.config(state="normal")
+        self.replay_button.config(state="disabled")
                 
         self.start_button.config(state="normal")
 
+    def undo_move(self):
+        """Takes back the last move, and the computer's replies to it, even after the game ended."""
+        self.game_manager.undo_move()
+        self.board_view.set_enabled(self.game_manager.is_game_active)
+
+    def redo_move(self):
+        """Replays the moves undo took back, up to the next human turn."""
+        self.game_manager.redo_move()
+        self.board_view.set_enabled(self.game_manager.is_game_active)
+
+    def open_replay(self):
+        """Asks for a game record file (and a game in it) and shows that game at its first move."""
+        path = filedialog.askopenfilename(title="Replay game record")
+        if not path:
+            return
+        try:
+            # Record files can hold millions of games, so only the chosen one is read in full
+            games = count_games(path)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Replay", str(error))
+            return
+        if not games:
+            messagebox.showinfo("Replay", "The file holds no games.")
+            return
+        number = 1
+        if games > 1:
+            number = simpledialog.askinteger("Replay", f"Game to replay (1-{games})",
+                                             minvalue=1, maxvalue=games, initialvalue=games)
+            if number is None:
+                return
+        try:
+            record = read_game(path, number - 1)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Replay", str(error))
+            return
+        if record is None:
+            return  # The file shrank since it was counted
+        if record.size > MAX_BOARD_SIZE:
+            messagebox.showerror("Replay", f"Only boards up to {MAX_BOARD_SIZE}x{MAX_BOARD_SIZE} can be replayed.")
+            return
+
+        self.replay = Replay(record)
+        self.discard_pending_events()
+        self.board_size = self.replay.size
+        self.create_board()
+        self.start_button.config(state="disabled")
+        self.replay_button.config(state="disabled")
+        if self.replay.mode_name == "General":
+            self.blue_score_label.grid()
+            self.red_score_label.grid()
+        else:
+            self.blue_score_label.grid_remove()
+            self.red_score_label.grid_remove()
+        self.replay_slider.config(from_=0, to=len(self.replay))
+        self.replay_slider.set(0)
+        self.replay_frame.grid()
+        self.seek_replay(0)
+
+    def seek_replay(self, value):
+        """Shows the replayed game after the slider's number of moves, redrawing only what changed."""
+        if self.replay is None:
+            return
+        changed, added, removed = self.replay.seek(int(float(value)))
+        touched = set(changed)
+        for cells in removed:
+            self.board_view.erase_sos_line(cells[0], cells[2])
+            touched.update(cells)
+        for cells, player in added:
+            self.board_view.draw_sos_line(cells[0], cells[2], player.lower())
+            touched.update(cells)
+        board = self.replay.board
+        for row, col in touched:
+            letter = board.get(row, col)
+            color = self.board_view.line_color_at(row, col) if letter != " " else None
+            self.update_button(row, col, letter, color or "black")
+
+        scores = self.replay.scores_at()
+        self.blue_score_label.config(text=f"Blue SOS: {scores['Blue']}")
+        self.red_score_label.config(text=f"Red SOS: {scores['Red']}")
+        last = self.replay.last_player()
+        self.replay_label.config(text=f"Move {self.replay.position}/{len(self.replay)}"
+                                      + (f" ({last})" if last else ""))
+
+    def close_replay(self):
+        """Leaves replay mode and clears the board for a new game."""
+        self.replay = None
+        self.replay_frame.grid_remove()
+        self.create_board()
+        self.enable_start_options()
+
     def on_board_click(self, row, col):
         """Delegates board click handling to the GameManager."""
         if not self.is_game_active:
@@ -252,7 +463,7 @@ class SOSGameGUI:
 
     def validate_board_size(self, new_value):
         if new_value.isdigit():
-            return 3 <= int(new_value) <= 20
+            return 3 <= int(new_value) <= MAX_BOARD_SIZE
         return False
 
     def adjust_window_size(self, board_size):
@@ -264,12 +475,8 @@ class SOSGameGUI:
             f"{min(board_pixel_size + 100, max_window_size)}x{min(board_pixel_size + 100, max_window_size)}")
 
     def get_empty_cells(self):
-        empty_cells = []
-        for i, row in enumerate(self.board_buttons):
-            for j, button in enumerate(row):
-                if button and button.cget("text") == " ":
-                    empty_cells.append((i, j))
-        return empty_cells
+        """Returns the empty cells of the game mode's board model."""
+        return self.game_manager.mode.board.empty_cells()
 
     def set_player_controls_state(self, player_color, state="normal"):
         """Enable or disable the S and O buttons for the specified player."""
@@ -0,0 +1,91 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; everything else in the game runs without it
+    np = None
+
+from board import EMPTY, S, O
+
+# Row and column steps of each direction, in the order count_sos reports them
+DIRECTION_STEPS = (
+    (0, 1),  # Horizontal
+    (1, 0),  # Vertical
+    (1, 1),  # Diagonal top-left to bottom-right
+    (1, -1)  # Diagonal top-right to bottom-left
+)
+
+
+def require_numpy():
+    """Raises ImportError if NumPy is not installed."""
+    if np is None:
+        raise ImportError("NumPy is required for vectorized SOS counting")
+
+
+def board_array(boards):
+    """Returns an (N, n, n) int8 array of letter codes for a list of same-sized boards."""
+    require_numpy()
+    size = boards[0].size
+    positions = np.zeros((len(boards), size, size), dtype=np.int8)
+    flat = positions.reshape(len(boards), -1)
+    for number, board in enumerate(boards):
+        if board.dense:
+            flat[number] = np.frombuffer(board.cells, dtype=np.int8)
+        else:
+            for index, code in board.cells.items():
+                flat[number, index] = code
+    return positions
+
+
+def count_sos(positions):
+    """Returns an (N, 4) array of the SOS lines on each board, per direction of DIRECTION_STEPS."""
+    require_numpy()
+    s = positions == S
+    o = positions == O
+    return np.stack([
+        (s[:, :, :-2] & o[:, :, 1:-1] & s[:, :, 2:]).sum(axis=(1, 2)),
+        (s[:, :-2, :] & o[:, 1:-1, :] & s[:, 2:, :]).sum(axis=(1, 2)),
+        (s[:, :-2, :-2] & o[:, 1:-1, 1:-1] & s[:, 2:, 2:]).sum(axis=(1, 2)),
+        (s[:, :-2, 2:] & o[:, 1:-1, 1:-1] & s[:, 2:, :-2]).sum(axis=(1, 2)),
+    ], axis=1)
+
+
+def move_maps(positions):
+    """Returns (completions, setups), each (N, 2, n, n), for placing S (index 0) or O (index 1).
+
+    completions counts the SOS lines the letter would finish at each empty cell; setups counts
+    the lines it would leave one letter short (S_S, SO_, _OS) for the next player. Occupied
+    cells are 0 in both. These match ThreatMap.count_cell for every cell at once.
+    """
+    require_numpy()
+    count, size = positions.shape[0], positions.shape[1]
+    # Two cells of padding let every shift stay in bounds; -1 matches no letter and is not EMPTY
+    padded = np.pad(positions, ((0, 0), (2, 2), (2, 2)), constant_values=-1)
+
+    def shifted(code, row_step, col_step):
+        """Returns where the cell row_step, col_step away from each cell holds the code."""
+        return padded[:, 2 + row_step:2 + row_step + size, 2 + col_step:2 + col_step + size] == code
+
+    completions = np.zeros((count, 2, size, size), dtype=np.int8)
+    setups = np.zeros((count, 2, size, size), dtype=np.int8)
+    for row_step, col_step in DIRECTION_STEPS:
+        for sign in (1, -1):
+            # The cell ends a line whose middle is one step away and other end two steps away
+            dr, dc = sign * row_step, sign * col_step
+            middle_o, middle_empty = shifted(O, dr, dc), shifted(EMPTY, dr, dc)
+            other_s, other_empty = shifted(S, 2 * dr, 2 * dc), shifted(EMPTY, 2 * dr, 2 * dc)
+            completions[:, 0] += middle_o & other_s
+            setups[:, 0] += (middle_o & other_empty) | (middle_empty & other_s)
+        # The cell centres a line between the cells one step either side
+        before_s, before_empty = shifted(S, -row_step, -col_step), shifted(EMPTY, -row_step, -col_step)
+        after_s, after_empty = shifted(S, row_step, col_step), shifted(EMPTY, row_step, col_step)
+        completions[:, 1] += before_s & after_s
+        setups[:, 1] += (before_s & after_empty) | (before_empty & after_s)
+
+    empty = (positions == EMPTY)[:, None]
+    return completions * empty, setups * empty
+
+
+def total_sos(board):
+    """Counts every SOS line on one board, vectorized when NumPy is available."""
+    if np is None:
+        return board.count_all_sos()
+    return int(count_sos(board_array([board])).sum())
@@ -0,0 +1,142 @@
+import functools
+import random
+
+from board import Board, EMPTY, S, O, cell_neighbours, cell_roles, cell_triples
+
+# Side length, in cells, of the square chunks the spatial index groups occupied cells by
+CHUNK_SIZE = 16
+
+# Random probes tried before random_empty_cell falls back to scanning the board
+EMPTY_CELL_ATTEMPTS = 64
+
+
+class SparseCells(dict):
+    """Letter codes of the occupied cells keyed by flat index; any other cell reads as EMPTY."""
+
+    def __missing__(self, index):
+        return EMPTY
+
+
+@functools.lru_cache(maxsize=4096)
+def sparse_cell_lines(size, index):
+    """Returns (triples, roles, neighbours) for one cell, as the dense tables hold for every cell."""
+    triples = cell_triples(size, *divmod(index, size))
+    return triples, cell_roles(index, triples), cell_neighbours(index, triples)
+
+
+class SparseBoard(Board):
+    """SOS board for very large sizes, using memory in proportion to the letters placed.
+
+    Only occupied cells are stored, lines through a cell are worked out when asked for,
+    and a chunked spatial index finds the letters inside any region. Search engines need
+    a dense board, so a ComputerPlayer on a SparseBoard plays its heuristic strategy.
+    """
+
+    dense = False
+
+    def __init__(self, size):
+        self.size = size
+        self.cells = SparseCells()
+        self.filled = 0
+        self.chunks = {}  # (chunk row, chunk col) -> flat indices of the occupied cells in it
+        self.trackers = []
+
+    def occupied_indices(self):
+        """Returns the flat indices of the cells holding a letter."""
+        return list(self.cells)
+
+    def chunk_of(self, index):
+        """Returns the spatial index chunk holding the flat index."""
+        row, col = divmod(index, self.size)
+        return row // CHUNK_SIZE, col // CHUNK_SIZE
+
+    def set_code(self, index, code):
+        """Stores a letter code in the cell at the flat index and updates the spatial index."""
+        chunk = self.chunk_of(index)
+        if code == EMPTY:
+            if self.cells.pop(index, EMPTY) != EMPTY:
+                self.filled -= 1
+                members = self.chunks[chunk]
+                members.discard(index)
+                if not members:
+                    del self.chunks[chunk]
+        else:
+            if index not in self.cells:
+                self.filled += 1
+                self.chunks.setdefault(chunk, set()).add(index)
+            self.cells[index] = code
+        for tracker in self.trackers:
+            tracker.on_cell_changed(index)
+
+    def is_full(self):
+        """Checks if every cell on the board holds a letter."""
+        return self.filled == self.size * self.size
+
+    def empty_cells(self):
+        """Returns a list of (row, col) positions that hold no letter; this walks the whole board."""
+        cells = self.cells
+        return [divmod(index, self.size) for index in range(self.size * self.size) if index not in cells]
+
+    def random_empty_cell(self, rng=random):
+        """Returns a random empty (row, col) position by rejection sampling, or None if the board is full."""
+        area = self.size * self.size
+        if self.filled == area:
+            return None
+        for _ in range(EMPTY_CELL_ATTEMPTS):
+            index = rng.randrange(area)
+            if index not in self.cells:
+                return divmod(index, self.size)
+        # Only a nearly full board gets here
+        return rng.choice(self.empty_cells())
+
+    def occupied_in(self, top, left, bottom, right):
+        """Returns the (row, col) positions holding a letter within the inclusive rectangle."""
+        found = []
+        for chunk_row in range(max(top, 0) // CHUNK_SIZE, min(bottom, self.size - 1) // CHUNK_SIZE + 1):
+            for chunk_col in range(max(left, 0) // CHUNK_SIZE, min(right, self.size - 1) // CHUNK_SIZE + 1):
+                for index in self.chunks.get((chunk_row, chunk_col), ()):
+                    row, col = divmod(index, self.size)
+                    if top <= row <= bottom and left <= col <= right:
+                        found.append((row, col))
+        return sorted(found)
+
+    def triples_at(self, index):
+        """Returns the (a, b, c) index triples that pass through the given cell."""
+        return sparse_cell_lines(self.size, index)[0]
+
+    def roles_at(self, index):
+        """Returns the cell's lines split by role, as built by sos_roles."""
+        return sparse_cell_lines(self.size, index)[1]
+
+    def neighbours_at(self, index):
+        """Returns the cells sharing a line with the given cell, the cell included."""
+        return sparse_cell_lines(self.size, index)[2]
+
+    def sos_lines_at(self, row, col):
+        """Returns the index triples through the given position that spell SOS."""
+        cells = self.cells
+        return [
+            triple for triple in self.triples_at(row * self.size + col)
+            if cells[triple[0]] == S and cells[triple[1]] == O and cells[triple[2]] == S
+        ]
+
+    def count_all_sos(self):
+        """Counts every SOS line on the board from the placed O's."""
+        cells = self.cells
+        count = 0
+        for index, code in cells.items():
+            if code == O:
+                for first, last in self.roles_at(index)[1]:
+                    if cells[first] == S and cells[last] == S:
+                        count += 1
+        return count
+
+    def copy(self):
+        """Returns an independent copy of the board."""
+        board = SparseBoard.__new__(SparseBoard)
+        board.size = self.size
+        board.cells = SparseCells(self.cells)
+        board.filled = self.filled
+        board.chunks = {chunk: set(members) for chunk, members in self.chunks.items()}
+        board.trackers = []  # Copies are untracked scratch boards
+        return board
@@ -0,0 +1,166 @@
+import collections
+import functools
+import random
+import threading
+
+# Positions kept in the shared cache before the least recently used are dropped
+CACHE_ENTRIES = 100000
+
+# Boards up to this many cells are canonicalized; on bigger boards symmetric positions are rare
+SYMMETRY_MAX_CELLS = 36
+
+
+@functools.lru_cache(maxsize=32)
+def zobrist_keys(cell_count, seed=2024):
+    """Returns random 64-bit keys indexed by index * 3 + letter code (the empty code maps to 0)."""
+    rng = random.Random(seed)
+    keys = []
+    for _ in range(cell_count):
+        keys.extend((0, rng.getrandbits(64), rng.getrandbits(64)))
+    return tuple(keys)
+
+
+@functools.lru_cache(maxsize=32)
+def symmetry_maps(size):
+    """Returns 8 tuples mapping each cell index to its index under a rotation or reflection.
+
+    The first map is the identity, so symmetry_maps(size)[:1] hashes without symmetry.
+    """
+    last = size - 1
+    transforms = (
+        lambda row, col: (row, col),
+        lambda row, col: (col, last - row),  # Quarter turn clockwise
+        lambda row, col: (last - row, last - col),  # Half turn
+        lambda row, col: (last - col, row),  # Quarter turn anticlockwise
+        lambda row, col: (row, last - col),  # Mirror left to right
+        lambda row, col: (last - row, col),  # Mirror top to bottom
+        lambda row, col: (col, row),  # Mirror in the main diagonal
+        lambda row, col: (last - col, last - row),  # Mirror in the anti-diagonal
+    )
+    maps = []
+    for transform in transforms:
+        mapping = []
+        for index in range(size * size):
+            row, col = transform(*divmod(index, size))
+            mapping.append(row * size + col)
+        maps.append(tuple(mapping))
+    return tuple(maps)
+
+
+@functools.lru_cache(maxsize=32)
+def inverse_maps(size):
+    """Returns the inverse of each map from symmetry_maps, in the same order."""
+    inverses = []
+    for mapping in symmetry_maps(size):
+        inverse = [0] * len(mapping)
+        for index, image in enumerate(mapping):
+            inverse[image] = index
+        inverses.append(tuple(inverse))
+    return tuple(inverses)
+
+
+@functools.lru_cache(maxsize=32)
+def symmetric_keys(size, transforms):
+    """Returns, for every index * 3 + letter code, the Zobrist key of that cell under each transform."""
+    keys = zobrist_keys(size * size)
+    maps = symmetry_maps(size)[:transforms]
+    table = []
+    for index in range(size * size):
+        for code in range(3):
+            table.append(tuple(keys[mapping[index] * 3 + code] for mapping in maps))
+    return tuple(table)
+
+
+class SymmetricHash:
+    """Zobrist hashes of a position under each board symmetry, kept up to date one cell at a time.
+
+    The smallest of the hashes identifies the position and all its rotations and reflections.
+    With symmetric=False only the identity is hashed.
+    """
+
+    def __init__(self, size, symmetric=True):
+        transforms = 8 if symmetric else 1
+        self.maps = symmetry_maps(size)[:transforms]
+        self.inverses = inverse_maps(size)[:transforms]
+        self.keys = symmetric_keys(size, transforms)
+        self.hashes = [0] * transforms
+
+    def toggle(self, index, code):
+        """Adds or removes (they are the same XOR) a letter code at a cell in every hash."""
+        hashes = self.hashes
+        for transform, key in enumerate(self.keys[index * 3 + code]):
+            hashes[transform] ^= key
+
+    def canonical(self):
+        """Returns (canonical hash, index of the transform that produces it)."""
+        key = min(self.hashes)
+        return key, self.hashes.index(key)
+
+    def to_canonical(self, move, transform):
+        """Maps a move key (index << 2 | code) into the canonical position's frame."""
+        return self.maps[transform][move >> 2] << 2 | move & 3
+
+    def canonical_move(self, move):
+        """Maps a move into the canonical frame so that equivalent moves always get the same key.
+
+        A symmetric position reaches its canonical hash under several transforms, which would
+        map one move to different keys, so the smallest of those keys is used.
+        """
+        key = min(self.hashes)
+        return min(self.to_canonical(move, transform) for transform, value in enumerate(self.hashes) if value == key)
+
+    def from_canonical(self, move, transform):
+        """Maps a move key stored for the canonical position back to this position's frame."""
+        return self.inverses[transform][move >> 2] << 2 | move & 3
+
+    @classmethod
+    def of_board(cls, board, symmetric=True):
+        """Returns the hashes of a dense board's current position."""
+        hashes = cls(board.size, symmetric)
+        for index in board.occupied_indices():
+            hashes.toggle(index, board.cells[index])
+        return hashes
+
+
+class PositionCache:
+    """Bounded least-recently-used map from canonical positions to results, safe across threads."""
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()  # Moves and pondering run on worker threads
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Returns the result stored for a key, or None."""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Stores a result, dropping the least recently used entry when full."""
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Forgets every stored result."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+# Solved positions shared by every ComputerPlayer in this process, keyed by
+# (mode name, board size, canonical hash) and holding (value, canonical best move)
+position_cache = PositionCache()
@@ -0,0 +1,148 @@
+import argparse
+import functools
+import mmap
+import os
+import struct
+import time
+
+from board import Board, EMPTY, S, O
+
+# File header: magic, format version, board size, mode (0 Simple, 1 General)
+HEADER = struct.Struct("<5sBBB")
+MAGIC = b"SOSTB"
+VERSION = 1
+MODES = ("Simple", "General")
+
+# Entry move byte of a position with nothing left to play (full board, or Simple game already won)
+NO_MOVE = 0xFF
+
+# Largest board a tablebase is built for; a 4x4 table is 3**16 positions, 2 bytes each
+TABLEBASE_MAX_SIZE = 4
+
+# Generated tables live beside the code, outside version control
+TABLEBASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebases")
+
+
+def tablebase_path(mode_name, size, directory=TABLEBASE_DIR):
+    """Returns the file name of the tablebase for a mode and board size."""
+    return os.path.join(directory, f"sos_{mode_name.lower()}_{size}x{size}.tb")
+
+
+def position_index(cells):
+    """Returns the base-3 number whose digit i is the letter code of cell i."""
+    index = 0
+    for code in reversed(cells):
+        index = index * 3 + code
+    return index
+
+
+def solve(size, mode_name):
+    """Solves every position of a size x size board and returns the 2-byte entries in index order.
+
+    Each entry is the best move key (index << 2 | letter code) and the value for the side to
+    move: the SOS difference still to come in General mode, win (1) / draw / loss in Simple.
+    Placing a letter only raises a digit, so walking indices downwards solves every child first.
+    """
+    cell_count = size * size
+    powers = [3 ** cell for cell in range(cell_count)]
+    position_count = 3 ** cell_count
+    entries = bytearray(2 * position_count)
+    values = [0] * position_count
+    sudden_death = mode_name == "Simple"
+    board = Board(size)
+    for index in range(position_count - 1, -1, -1):
+        digits = index
+        for cell in range(cell_count):
+            digits, code = divmod(digits, 3)
+            if board.cells[cell] != code:
+                board.set_code(cell, code)
+
+        best_value, best_move = None, NO_MOVE
+        if not (sudden_death and board.count_all_sos()):
+            for cell in range(cell_count):
+                if board.cells[cell] != EMPTY:
+                    continue
+                row, col = divmod(cell, size)
+                for code in (S, O):
+                    board.set_code(cell, code)
+                    gained = board.count_sos_at(row, col)
+                    board.set_code(cell, EMPTY)
+                    if gained and sudden_death:
+                        value = 1
+                    elif gained:
+                        value = gained + values[index + code * powers[cell]]  # Extra turn
+                    else:
+                        value = -values[index + code * powers[cell]]
+                    if best_value is None or value > best_value:
+                        best_value, best_move = value, cell << 2 | code
+        values[index] = best_value or 0
+        struct.pack_into("<Bb", entries, 2 * index, best_move, values[index])
+    return entries
+
+
+def write_tablebase(path, size, mode_name, entries):
+    """Writes solved entries with their header to a tablebase file."""
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, size, MODES.index(mode_name)))
+        file.write(entries)
+
+
+class Tablebase:
+    """A tablebase file mapped into memory, so opening it costs nothing and lookups read 2 bytes."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, mode = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION or mode >= len(MODES):
+            self.data.close()
+            raise ValueError(f"{path} is not an SOS tablebase")
+        if len(self.data) != HEADER.size + 2 * 3 ** (self.size * self.size):
+            self.data.close()
+            raise ValueError(f"{path} is truncated")
+        self.mode_name = MODES[mode]
+
+    def close(self):
+        """Unmaps the file."""
+        self.data.close()
+
+    def probe(self, board):
+        """Returns (move key, value) for the side to move, or None when nothing is left to play."""
+        move, value = struct.unpack_from("<Bb", self.data, HEADER.size + 2 * position_index(board.cells))
+        if move == NO_MOVE:
+            return None
+        return move, value
+
+
+@functools.lru_cache(maxsize=None)
+def load_tablebase(mode_name, size, directory=TABLEBASE_DIR):
+    """Returns the Tablebase for a mode and board size, or None if none has been built."""
+    if size > TABLEBASE_MAX_SIZE:
+        return None
+    try:
+        return Tablebase(tablebase_path(mode_name, size, directory))
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    """Builds tablebase files from the command line."""
+    parser = argparse.ArgumentParser(description="Solve small SOS boards and write perfect-play tablebases.")
+    parser.add_argument("--size", type=int, nargs="+", default=[3], help="board sizes (at most 4; 4x4 takes hours)")
+    parser.add_argument("--mode", choices=MODES, nargs="+", default=list(MODES), help="game modes")
+    parser.add_argument("--out", default=TABLEBASE_DIR, help="directory to write the tables to")
+    args = parser.parse_args(argv)
+    if max(args.size) > TABLEBASE_MAX_SIZE:
+        parser.error(f"board size must be at most {TABLEBASE_MAX_SIZE}")
+
+    os.makedirs(args.out, exist_ok=True)
+    for size in args.size:
+        for mode_name in args.mode:
+            started = time.perf_counter()
+            path = tablebase_path(mode_name, size, args.out)
+            write_tablebase(path, size, mode_name, solve(size, mode_name))
+            print(f"{path} ({time.perf_counter() - started:.1f} s)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,7 +26,7 @@ class TestSOSGame(unittest.TestCase):
 
     def test_invalid_board_size(self):
         """Test setting an invalid board size outside the allowed range."""
-        self.gui.board_size_var.set(25)
+        self.gui.board_size_var.set(101)
         is_valid = self.gui.validate_board_size(self.gui.board_size_var.get())
         self.assertFalse(is_valid)
 
@@ -50,37 +50,37 @@ class TestSOSGame(unittest.TestCase):
     def test_valid_simple_move(self):
         """Test making a valid move in Simple Game mode."""
         self.gui.on_board_click(0, 0)
-        self.assertEqual(self.gui.board_buttons[0][0].cget("text"), "S")  
+        self.assertEqual(self.gui.board_view.cell_text(0, 0), "S")  
     
     def test_invalid_simple_move(self):
         """Test making an invalid move in an already occupied cell in Simple Game mode."""
         self.gui.on_board_click(0, 0)
-        initial_text = self.gui.board_buttons[0][0].cget("text")
+        initial_text = self.gui.board_view.cell_text(0, 0)
         self.gui.on_board_click(0, 0)  
-        self.assertEqual(self.gui.board_buttons[0][0].cget("text"), initial_text)  
+        self.assertEqual(self.gui.board_view.cell_text(0, 0), initial_text)  
 
     # User Story 5: Simple Game is Over
     def test_simple_mode_win_with_first_sos(self):
         """Simulate moves to create the first SOS in Simple mode and check for winner."""
             
-        self.gui.board_buttons[0][0].config(text="S")
-        self.gui.board_buttons[0][1].config(text="O")
-        self.gui.board_buttons[0][2].config(text="S")
+        self.gui.update_button(0, 0, "S")
+        self.gui.update_button(0, 1, "O")
+        self.gui.update_button(0, 2, "S")
         
         self.assertTrue(self.simple_mode.check_for_winner())
         self.assertEqual(self.game_manager.get_winner(), self.game_manager.current_player)
 
     def test_no_sos_no_win(self):
         """Fill the board without forming an SOS and confirm the game continues with no winner."""
-        self.gui.board_buttons[0][0].config(text="S")
-        self.gui.board_buttons[0][1].config(text="O")
-        self.gui.board_buttons[0][2].config(text="O")
-        self.gui.board_buttons[1][0].config(text="O")
-        self.gui.board_buttons[1][1].config(text="S")
-        self.gui.board_buttons[1][2].config(text="O")
-        self.gui.board_buttons[2][0].config(text="S")
-        self.gui.board_buttons[2][1].config(text="S")
-        self.gui.board_buttons[2][2].config(text="O")
+        self.gui.update_button(0, 0, "S")
+        self.gui.update_button(0, 1, "O")
+        self.gui.update_button(0, 2, "O")
+        self.gui.update_button(1, 0, "O")
+        self.gui.update_button(1, 1, "S")
+        self.gui.update_button(1, 2, "O")
+        self.gui.update_button(2, 0, "S")
+        self.gui.update_button(2, 1, "S")
+        self.gui.update_button(2, 2, "O")
         
         self.assertFalse(self.simple_mode.check_for_winner())
         self.assertIsNone(self.game_manager.get_winner())
@@ -91,15 +91,16 @@ class TestSOSGame(unittest.TestCase):
         self.gui.radio_var.set("General Game")
         self.gui.start_game()
         self.gui.on_board_click(1, 1)
-        self.assertNotEqual(self.gui.board_buttons[1][1].cget("text"), " ")  
+        self.root.update()  # Moves are drawn once Tk is idle
+        self.assertNotEqual(self.gui.board_view.cell_text(1, 1), " ")  
         
 
     # Test for 7.1: Additional Turn in General Mode after SOS Formation
     def test_general_mode_sos_additional_turn(self):
         """Check if creating an SOS grants an extra turn in General mode."""
 
-        self.gui.board_buttons[0][0].config(text="S")
-        self.gui.board_buttons[0][1].config(text="O")
+        self.gui.update_button(0, 0, "S")
+        self.gui.update_button(0, 1, "O")
         
         self.general_mode.make_move(0, 2, "S")  
         
@@ -108,9 +109,9 @@ class TestSOSGame(unittest.TestCase):
     # Test for 7.2: No SOS formation, game continues with next turn
     def test_no_sos_game_continues(self):
         """Simulate moves without forming an SOS and confirm game continues with the next turn."""
-        self.gui.board_buttons[0][0].config(text="S")
-        self.gui.board_buttons[0][1].config(text="O")
-        self.gui.board_buttons[1][0].config(text="O")
+        self.gui.update_button(0, 0, "S")
+        self.gui.update_button(0, 1, "O")
+        self.gui.update_button(1, 0, "O")
         
         self.general_mode.make_move(1, 1, "S")
         
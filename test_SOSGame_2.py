@@ -36,8 +36,8 @@ class TestComputerOpponent(unittest.TestCase):
         """Test that the computer maximizes SOS formations in General Game mode."""
         self.game_manager.mode = "General"
         
-        self.gui.board_buttons[0][0].config(text="S")
-        self.gui.board_buttons[0][1].config(text="O")
+        self.gui.update_button(0, 0, "S")
+        self.gui.update_button(0, 1, "O")
         
         with patch.object(self.computer_player, 'make_move') as mock_make_move:
             self.computer_player.make_move(self.general_mode)
@@ -47,9 +47,9 @@ class TestComputerOpponent(unittest.TestCase):
     def test_winner_identification_simple_mode(self):
         """Test that the game correctly identifies the winner in Simple Mode."""
         # Set up a winning condition for the computer
-        self.gui.board_buttons[0][0].config(text="S")
-        self.gui.board_buttons[0][1].config(text="O")
-        self.gui.board_buttons[0][2].config(text="S") 
+        self.gui.update_button(0, 0, "S")
+        self.gui.update_button(0, 1, "O")
+        self.gui.update_button(0, 2, "S") 
         
         self.assertTrue(self.simple_mode.check_for_winner())
         self.assertEqual(self.game_manager.get_winner(), "Computer")
@@ -59,12 +59,12 @@ class TestComputerOpponent(unittest.TestCase):
         """Test that the game correctly counts SOS sequences and identifies the winner in General Mode."""
         self.game_manager.mode = "General"
         
-        self.gui.board_buttons[0][0].config(text="S")
-        self.gui.board_buttons[0][1].config(text="O")
-        self.gui.board_buttons[0][2].config(text="S")
-        self.gui.board_buttons[1][0].config(text="S")
-        self.gui.board_buttons[1][1].config(text="O")
-        self.gui.board_buttons[1][2].config(text="S")
+        self.gui.update_button(0, 0, "S")
+        self.gui.update_button(0, 1, "O")
+        self.gui.update_button(0, 2, "S")
+        self.gui.update_button(1, 0, "S")
+        self.gui.update_button(1, 1, "O")
+        self.gui.update_button(1, 2, "S")
         
         self.assertTrue(self.general_mode.check_for_winner())
         self.assertEqual(self.game_manager.get_winner(), "Computer")
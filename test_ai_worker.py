@@ -0,0 +1,105 @@
+import time
+import unittest
+from ai_worker import ComputerMoveWorker
+from game_modes import GeneralGameMode
+from player import ComputerPlayer
+
+class FakeRoot:
+    """Stands in for the Tk root, running after() callbacks when asked."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.next_id = 0
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, callback_id):
+        self.callbacks.pop(callback_id, None)
+
+    def run_until_idle(self, timeout=2.0):
+        """Run scheduled callbacks until none are left or the timeout passes."""
+        deadline = time.perf_counter() + timeout
+        while self.callbacks and time.perf_counter() < deadline:
+            callback_id = min(self.callbacks)
+            self.callbacks.pop(callback_id)()
+            time.sleep(0.001)
+
+class TestComputerMoveWorker(unittest.TestCase):
+
+    def setUp(self):
+        """Create a worker on a fake event loop and a headless game mode."""
+        self.root = FakeRoot()
+        self.worker = ComputerMoveWorker(self.root)
+        self.mode = GeneralGameMode(3, None)
+        self.player = ComputerPlayer("Computer", "Blue", None)
+        self.moves = []
+
+    def test_move_is_delivered_on_the_event_loop(self):
+        """Test that a computed move reaches the callback through after()."""
+        self.mode.board.place(0, 0, "S")
+        self.mode.board.place(0, 1, "O")
+        self.worker.request_move(self.player, self.mode, self.moves.append)
+        self.root.run_until_idle()
+        self.assertEqual(self.moves, [(0, 2, "S")])
+
+    def test_cancelled_move_never_lands(self):
+        """Test that cancelling drops the pending move even if thinking already finished."""
+        self.worker.request_move(self.player, self.mode, self.moves.append)
+        time.sleep(0.05)
+        self.worker.cancel()
+        self.root.run_until_idle()
+        self.assertEqual(self.moves, [])
+
+    def test_new_request_replaces_the_old_one(self):
+        """Test that only the latest request's move is delivered."""
+        self.worker.request_move(self.player, self.mode, lambda move: self.moves.append(("old", move)))
+        self.worker.request_move(self.player, self.mode, lambda move: self.moves.append(("new", move)))
+        self.root.run_until_idle()
+        self.assertEqual([tag for tag, _ in self.moves], ["new"])
+
+    def test_pondering_tree_is_reused_after_the_human_moves(self):
+        """Test that a pondering MCTS player starts its real search from the pondered subtree."""
+        player = ComputerPlayer("Computer", "Red", None, "mcts", 0.05, endgame_cells=0)
+        self.worker.start_pondering(player, self.mode)
+        time.sleep(0.2)
+        self.worker.stop_pondering()
+        self.assertIsNone(self.worker.pondering)
+        self.assertGreater(player.engine.root.visits, 0)
+        self.mode.board.place(1, 1, "O")  # The human's move
+        player.choose_move(self.mode)
+        self.assertGreater(player.engine.stats["reused_visits"], 0)
+
+    def test_cancel_stops_pondering(self):
+        """Test that cancelling ends a running ponder search."""
+        player = ComputerPlayer("Computer", "Red", None, "alphabeta", 0.05)
+        self.worker.start_pondering(player, self.mode)
+        _, thread = self.worker.pondering
+        self.worker.cancel()
+        self.assertFalse(thread.is_alive())
+
+    def test_cancel_waits_for_the_search(self):
+        """Test that a cancelled search has ended before the same player is asked again."""
+        player = ComputerPlayer("Computer", "Blue", None, "alphabeta", 5.0, endgame_cells=0)
+        self.mode = GeneralGameMode(6, None)
+        self.worker.request_move(player, self.mode, self.moves.append)
+        _, thread = self.worker.thinking
+        time.sleep(0.05)
+        self.worker.cancel()
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(self.worker.thinking)
+
+    def test_thinking_uses_a_snapshot(self):
+        """Test that the live board is not touched while the computer thinks."""
+        before = bytes(self.mode.board.cells)
+        self.worker.request_move(ComputerPlayer("Computer", "Blue", None, "alphabeta", 0.1),
+                                 self.mode, self.moves.append)
+        self.root.run_until_idle()
+        self.assertEqual(bytes(self.mode.board.cells), before)
+        self.assertEqual(len(self.moves), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
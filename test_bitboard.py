@@ -0,0 +1,71 @@
+import random
+import unittest
+from bitboard import BitBoard
+from board import Board
+from game_modes import GeneralGameMode
+
+class TestBitBoardEquivalence(unittest.TestCase):
+
+    def fill_randomly(self, size, seed, fill=0.7):
+        """Fill an array board and a bitboard with the same random letters."""
+        rng = random.Random(seed)
+        board, bitboard = Board(size), BitBoard(size)
+        for row in range(size):
+            for col in range(size):
+                if rng.random() < fill:
+                    letter = rng.choice("SO")
+                    board.place(row, col, letter)
+                    bitboard.place(row, col, letter)
+        return board, bitboard
+
+    def test_lines_match_triple_scan(self):
+        """Test that bitboard SOS lines match the triple scan for every cell."""
+        for size in (3, 4, 7, 12):
+            for seed in range(5):
+                board, bitboard = self.fill_randomly(size, seed)
+                for row in range(size):
+                    for col in range(size):
+                        self.assertEqual(bitboard.sos_lines_at(row, col), board.sos_lines_at(row, col))
+                        self.assertEqual(bitboard.count_sos_at(row, col), board.count_sos_at(row, col))
+
+    def test_total_count_matches_triple_scan(self):
+        """Test that the whole-board popcount matches the triple scan."""
+        for size in (3, 5, 20):
+            board, bitboard = self.fill_randomly(size, size, fill=1.0)
+            self.assertEqual(bitboard.count_all_sos(), board.count_all_sos())
+
+    def test_lines_do_not_wrap_across_rows(self):
+        """Test that letters at the end of one row and the start of the next never form an SOS."""
+        bitboard = BitBoard(3)
+        bitboard.place(0, 2, "S")
+        bitboard.place(1, 0, "O")
+        bitboard.place(1, 1, "S")
+        bitboard.place(0, 1, "S")
+        bitboard.place(2, 0, "S")  # Anti-diagonal (0, 1), (1, 0) then off the board
+        self.assertEqual(bitboard.count_all_sos(), 0)
+
+    def test_overwrite_and_clear_update_masks(self):
+        """Test that clearing or replacing a letter removes it from the bitboards."""
+        bitboard = BitBoard(3)
+        for col, letter in enumerate("SOS"):
+            bitboard.place(0, col, letter)
+        self.assertEqual(bitboard.count_sos_at(0, 1), 1)
+        bitboard.place(0, 1, "S")
+        self.assertEqual(bitboard.count_all_sos(), 0)
+        bitboard.clear(0, 1)
+        self.assertEqual(bitboard.o_mask, 0)
+        self.assertTrue(bitboard.is_empty(0, 1))
+
+    def test_game_mode_runs_on_bitboard(self):
+        """Test that check_sos plugs into the bitboard backend."""
+        mode = GeneralGameMode(4, None, board_type="bitboard")
+        self.assertIsInstance(mode.board, BitBoard)
+        mode.board.place(1, 1, "S")
+        mode.board.place(2, 2, "O")
+        mode.board.place(3, 3, "S")
+        self.assertEqual(mode.check_sos(3, 3), ([(1, 1), (2, 2), (3, 3)], 1))
+        self.assertIsInstance(mode.board.copy(), BitBoard)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import random
+from board import Board, IndexedSet, sos_triples
+from game_modes import SimpleGameMode, GeneralGameMode
+
+class TestBoard(unittest.TestCase):
+
+    def setUp(self):
+        """Create a headless board for testing."""
+        self.board = Board(3)
+
+    def test_new_board_is_empty(self):
+        """Test that every cell of a new board is empty."""
+        self.assertEqual(len(self.board.empty_cells()), 9)
+        self.assertEqual(self.board.get(1, 1), " ")
+        self.assertFalse(self.board.is_full())
+
+    def test_place_and_clear(self):
+        """Test that placing and clearing a letter updates the cell."""
+        self.board.place(0, 2, "O")
+        self.assertEqual(self.board.get(0, 2), "O")
+        self.assertFalse(self.board.is_empty(0, 2))
+        self.board.clear(0, 2)
+        self.assertTrue(self.board.is_empty(0, 2))
+
+    def test_full_board(self):
+        """Test that a board with every cell filled is reported as full."""
+        for row in range(3):
+            for col in range(3):
+                self.board.place(row, col, "S")
+        self.assertTrue(self.board.is_full())
+        self.assertEqual(self.board.empty_cells(), [])
+
+    def test_filled_counter_tracks_moves(self):
+        """Test that the filled counter and free-cell index follow place and clear."""
+        self.board.place(0, 0, "S")
+        self.board.place(0, 0, "O")  # Overwriting does not count twice
+        self.board.place(2, 1, "S")
+        self.assertEqual(self.board.filled, 2)
+        self.assertEqual(len(self.board.free), 7)
+        self.board.clear(0, 0)
+        self.assertEqual(self.board.filled, 1)
+        self.assertIn(0, self.board.free)
+
+    def test_random_empty_cell(self):
+        """Test that random empty-cell selection only returns empty cells."""
+        rng = random.Random(7)
+        for row, col in [(0, 0), (0, 1), (1, 0), (1, 1), (2, 2)]:
+            self.board.place(row, col, "O")
+        for _ in range(50):
+            row, col = self.board.random_empty_cell(rng)
+            self.assertTrue(self.board.is_empty(row, col))
+        for row, col in self.board.empty_cells():
+            self.board.place(row, col, "S")
+        self.assertIsNone(self.board.random_empty_cell(rng))
+
+    def test_copy_is_independent(self):
+        """Test that changes to a copy do not affect the original board."""
+        copy = self.board.copy()
+        copy.place(0, 0, "S")
+        self.assertTrue(self.board.is_empty(0, 0))
+
+
+class TestIndexedSet(unittest.TestCase):
+
+    def test_swap_remove_keeps_positions(self):
+        """Test that removing an item keeps the position map consistent."""
+        items = IndexedSet(range(5))
+        items.discard(1)
+        items.discard(4)
+        items.discard(9)  # Missing items are ignored
+        items.add(1)
+        self.assertEqual(sorted(items), [0, 1, 2, 3])
+        for item in items:
+            self.assertEqual(items.items[items.positions[item]], item)
+
+
+class TestSOSTriples(unittest.TestCase):
+
+    def test_triples_match_bounds_checked_scan(self):
+        """Test that the precomputed table matches a bounds-checked scan of every cell."""
+        size = 5
+        table = sos_triples(size)
+        for row in range(size):
+            for col in range(size):
+                expected = set()
+                for dx, dy in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                    for offset in range(3):
+                        cells = [(row + (k - offset) * dx, col + (k - offset) * dy) for k in range(3)]
+                        if all(0 <= r < size and 0 <= c < size for r, c in cells):
+                            expected.add(tuple(r * size + c for r, c in cells))
+                self.assertEqual(set(table[row * size + col]), expected)
+
+    def test_table_is_cached_per_size(self):
+        """Test that boards of the same size share one table."""
+        self.assertIs(Board(4).triples, Board(4).triples)
+        self.assertEqual(len(sos_triples(3)[4]), 4)  # The centre is only ever a middle letter
+
+
+class TestBoardRules(unittest.TestCase):
+
+    def test_check_sos_reads_board_model(self):
+        """Test that SOS detection reads the board model without a GUI."""
+        mode = SimpleGameMode(3, None)
+        mode.board.place(0, 0, "S")
+        mode.board.place(0, 1, "O")
+        mode.board.place(0, 2, "S")
+        sos_cells, sos_count = mode.check_sos(0, 2)
+        self.assertEqual(sos_count, 1)
+        self.assertEqual(sos_cells, [(0, 0), (0, 1), (0, 2)])
+
+    def test_is_valid_move_on_occupied_cell(self):
+        """Test that a move on an occupied cell is rejected."""
+        mode = GeneralGameMode(3, None)
+        mode.board.place(1, 1, "O")
+        self.assertFalse(mode.is_valid_move(1, 1))
+        self.assertTrue(mode.is_valid_move(0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
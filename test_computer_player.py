@@ -1,8 +1,6 @@
 import unittest
 from unittest.mock import patch
 from player import ComputerPlayer
-from game_modes import SimpleGameMode
-from game_manager import GameManager
 from sos_gui import SOSGameGUI
 import tkinter as tk
 
@@ -13,8 +11,10 @@ class TestComputerPlayer(unittest.TestCase):
         self.root = tk.Tk()
         self.gui = SOSGameGUI(self.root)
         self.gui.create_board() 
-        self.game_manager = GameManager(board_size=3, game_mode="Simple", gui=self.gui)
-        self.simple_game_mode = SimpleGameMode(board_size=3, game_manager=self.game_manager)
+        # Play on the GUI's own game manager, whose board model the GUI reads and draws
+        self.game_manager = self.gui.game_manager
+        self.game_manager.reset_game(3, "Simple")
+        self.simple_game_mode = self.game_manager.mode
         self.computer_player = ComputerPlayer("Computer", "Blue", self.gui)  # Pass GUI directly
 
     def tearDown(self):
@@ -41,8 +41,9 @@ class TestComputerPlayer(unittest.TestCase):
     def test_computer_triggers_extra_turn(self):
         """Test that the ComputerPlayer gets an extra turn when forming an SOS."""
         # Set up the board so that placing an 'S' at (0, 2) will form an SOS
-        self.gui.board_buttons[0][0].config(text="S")
-        self.gui.board_buttons[0][1].config(text="O")
+        for col, letter in enumerate("SO"):
+            self.simple_game_mode.board.place(0, col, letter)
+            self.gui.update_button(0, col, letter)
 
         # Prepare the side effect function
         def choice_side_effect(seq):
@@ -56,8 +57,10 @@ class TestComputerPlayer(unittest.TestCase):
             # Trigger computer's move
             self.computer_player.make_move(self.simple_game_mode)
 
-        # Check that (0, 2) now contains "S" as expected
-        self.assertEqual(self.gui.board_buttons[0][2].cget("text"), "S")
+        # Check that (0, 2) now contains "S" as expected, once the queued events are drawn
+        self.assertEqual(self.simple_game_mode.board.get(0, 2), "S")
+        self.root.update()
+        self.assertEqual(self.gui.board_view.cell_text(0, 2), "S")
 
 
 if __name__ == '__main__':
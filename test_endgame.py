@@ -0,0 +1,90 @@
+import random
+import unittest
+from board import Board, EMPTY, LETTERS
+from endgame import ENDGAME_EMPTY_CELLS, EndgameSolver
+from game_modes import GeneralGameMode
+from player import ComputerPlayer
+from search import AlphaBetaSearch
+
+def random_position(seed, size, empties):
+    """Fill a board randomly, leaving the given number of empty cells."""
+    rng = random.Random(seed)
+    board = Board(size)
+    cells = list(range(size * size))
+    rng.shuffle(cells)
+    for index in cells[empties:]:
+        board.set_code(index, rng.choice((1, 2)))
+    return board
+
+class TestEndgameSolver(unittest.TestCase):
+
+    def test_values_match_full_search(self):
+        """Test that solved values equal an alpha-beta search to the end of the game."""
+        for seed in range(6):
+            board = random_position(seed, 5, 7)
+            solver = EndgameSolver(max_empty=7, time_limit=30.0)
+            solver.choose_move(board)
+            search = AlphaBetaSearch(time_limit=30.0)
+            search.choose_move(board, "General")
+            self.assertTrue(solver.stats["exact"])
+            self.assertEqual(solver.stats["value"], search.best_value)
+
+    def test_move_achieves_the_value(self):
+        """Test that the chosen move's SOS plus the value of the reply position equals the solved value."""
+        board = random_position(11, 5, 8)
+        solver = EndgameSolver(max_empty=8, time_limit=30.0)
+        row, col, letter = solver.choose_move(board)
+        value = solver.stats["value"]
+        self.assertTrue(board.is_empty(row, col))
+        board.place(row, col, letter)
+        gained = board.count_sos_at(row, col)
+        reply = EndgameSolver(max_empty=8, time_limit=30.0)
+        reply.choose_move(board)
+        rest = reply.stats["value"] if not board.is_full() else 0
+        self.assertEqual(value, gained + rest if gained else -rest)
+
+    def test_memo_is_reused_after_moves(self):
+        """Test that solving again after playing the chosen move keeps the memo and searches less."""
+        board = random_position(5, 6, 10)
+        solver = EndgameSolver(max_empty=10, time_limit=30.0)
+        row, col, letter = solver.choose_move(board)
+        first_nodes, entries = solver.stats["nodes"], solver.stats["memo_entries"]
+        board.place(row, col, letter)
+        solver.choose_move(board)
+        self.assertLess(solver.stats["nodes"], first_nodes)
+        self.assertGreaterEqual(solver.stats["memo_entries"], entries)
+        self.assertEqual(solver.totals["solves"], 2)
+
+    def test_timeout_gives_no_move(self):
+        """Test that a solve out of time returns None and reports an inexact result."""
+        solver = EndgameSolver(max_empty=16, time_limit=0.0)
+        self.assertIsNone(solver.choose_move(random_position(2, 8, 16)))
+        self.assertFalse(solver.stats["exact"])
+
+    def test_applies_below_the_threshold(self):
+        """Test that the solver only takes boards with 1 to max_empty empty cells."""
+        solver = EndgameSolver(max_empty=4)
+        self.assertTrue(solver.applies(random_position(0, 4, 4)))
+        self.assertFalse(solver.applies(random_position(0, 4, 5)))
+        self.assertFalse(solver.applies(random_position(0, 4, 0)))
+
+    def test_computer_player_solves_general_endgames(self):
+        """Test that a heuristic ComputerPlayer hands General endgames to the solver."""
+        mode = GeneralGameMode(5, None)
+        for index, code in enumerate(random_position(4, 5, 6).cells):
+            if code != EMPTY:
+                mode.board.place(*divmod(index, 5), LETTERS[code])
+        player = ComputerPlayer("Blue", "Blue", None, endgame_cells=ENDGAME_EMPTY_CELLS)
+        row, col, _ = player.choose_move(mode)
+        self.assertTrue(mode.board.is_empty(row, col))
+        self.assertEqual(player.endgame.totals["solves"], 1)
+        self.assertTrue(player.endgame.stats["exact"])
+
+    def test_only_search_strategies_solve_by_default(self):
+        """Test that heuristic players leave the solver off unless asked, so they stay cheap."""
+        self.assertIsNone(ComputerPlayer("Blue", "Blue", None).endgame)
+        self.assertEqual(ComputerPlayer("Blue", "Blue", None, "alphabeta").endgame.max_empty, ENDGAME_EMPTY_CELLS)
+        self.assertIsNone(ComputerPlayer("Blue", "Blue", None, "alphabeta", endgame_cells=0).endgame)
+
+if __name__ == "__main__":
+    unittest.main()
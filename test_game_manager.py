@@ -0,0 +1,229 @@
+import os
+import tempfile
+import time
+import unittest
+from endgame import EndgameSolver
+from events import CELL_CLEARED, CELL_PLACED, GAME_ENDED, INVALID_MOVE, SCORE_CHANGED, SOS_FORMED, TURN_CHANGED
+from game_manager import GameManager, PACING
+from game_record import read_games
+
+class FakeWidget:
+    """Accepts the widget calls the game logic makes."""
+
+    def config(self, **options):
+        self.options = options
+
+    def grid(self):
+        pass
+
+    def grid_remove(self):
+        pass
+
+class FakeRoot:
+    """Stands in for the Tk root, counting the frames Turbo pacing schedules."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.next_id = 0
+        self.frames = 0
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, callback_id):
+        self.callbacks.pop(callback_id, None)
+
+    def run_until_idle(self):
+        """Run scheduled callbacks until none are left."""
+        while self.callbacks:
+            callback_id = min(self.callbacks)
+            self.frames += 1
+            self.callbacks.pop(callback_id)()
+
+class FakeGui:
+    """Headless GUI with the widgets GameManager touches directly."""
+
+    def __init__(self):
+        self.root = FakeRoot()
+        self.blue_score_label = FakeWidget()
+        self.red_score_label = FakeWidget()
+
+class TestPacing(unittest.TestCase):
+
+    def test_pacing_sets_computer_delays(self):
+        """Test that each pacing preset sets the move and extra-turn delays."""
+        manager = GameManager(3, "General", FakeGui(), pacing="Fast")
+        self.assertEqual((manager.move_delay_ms, manager.extra_turn_delay_ms), PACING["Fast"])
+        manager.set_pacing("Turbo")
+        self.assertEqual((manager.move_delay_ms, manager.extra_turn_delay_ms), (0, 0))
+
+    def test_unknown_pacing_is_rejected(self):
+        """Test that an unknown pacing name raises ValueError."""
+        manager = GameManager(3, "General", FakeGui())
+        with self.assertRaises(ValueError):
+            manager.set_pacing("Glacial")
+
+    def test_turbo_plays_computer_game_in_few_frames(self):
+        """Test that Turbo finishes a 20x20 Computer-vs-Computer game with many moves per frame."""
+        gui = FakeGui()
+        manager = GameManager(20, "General", gui, pacing="Turbo")
+        manager.reset_game(20, "General", "Computer", "Computer")
+        start = time.perf_counter()
+        manager.schedule_computer_move()
+        gui.root.run_until_idle()
+        self.assertFalse(manager.is_game_active)
+        self.assertTrue(manager.mode.board.is_full())
+        self.assertLess(gui.root.frames, 400)
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+    def test_turbo_sends_endgame_solving_players_to_the_worker(self):
+        """Test that a player that may solve endgames never moves inline on the Tk thread."""
+        gui = FakeGui()
+        manager = GameManager(5, "General", gui, pacing="Turbo")
+        manager.reset_game(5, "General", "Computer", "Computer")
+        manager.current_player.endgame = EndgameSolver()
+        manager.schedule_computer_move()
+        self.assertIsNone(manager.turbo_frame_id)
+        self.assertIsNotNone(manager.move_worker.thinking)
+        manager.end_game()
+
+    def test_reset_selects_the_computer_strategy(self):
+        """Test that a new game builds its computer players with the chosen strategy and workers."""
+        manager = GameManager(5, "General", FakeGui())
+        manager.reset_game(5, "General", "Computer", "Human", "alphabeta", 1)
+        self.assertEqual(manager.players["Blue"].strategy, "alphabeta")
+        self.assertIsNotNone(manager.players["Blue"].engine)
+        manager.reset_game(5, "General", "Computer", "Human")
+        self.assertEqual(manager.players["Blue"].strategy, "alphabeta")  # Kept until changed again
+        with self.assertRaises(ValueError):
+            manager.reset_game(5, "General", "Computer", "Human", "oracle")
+
+    def test_ending_game_cancels_pending_turbo_frame(self):
+        """Test that ending the game drops a scheduled Turbo frame."""
+        gui = FakeGui()
+        manager = GameManager(5, "Simple", gui, pacing="Turbo")
+        manager.reset_game(5, "Simple", "Computer", "Computer")
+        manager.schedule_computer_move()
+        manager.end_game()
+        gui.root.run_until_idle()
+        self.assertEqual(manager.mode.board.filled, 0)
+
+class TestGameEvents(unittest.TestCase):
+
+    def setUp(self):
+        """Create a GameManager with no GUI and record the events its rules emit."""
+        self.manager = GameManager(3, "General")
+        self.manager.reset_game(3, "General")
+        self.events = []
+        self.manager.events.subscribe(lambda kind, data: self.events.append((kind, data)))
+
+    def test_move_emits_cell_placed_and_turn_changed(self):
+        """Test that a quiet move reports the cell and hands the turn over."""
+        self.manager.mode.make_move(1, 1, "O")
+        self.assertEqual(self.events, [
+            (CELL_PLACED, {"row": 1, "col": 1, "letter": "O"}),
+            (TURN_CHANGED, {"player": "Red"}),
+        ])
+
+    def test_sos_emits_formation_and_score(self):
+        """Test that forming an SOS reports the line and the new score and keeps the turn."""
+        self.manager.mode.make_move(0, 0, "S")
+        self.manager.mode.make_move(0, 1, "O")
+        self.events.clear()
+        self.manager.mode.make_move(0, 2, "S")
+        kinds = [kind for kind, _ in self.events]
+        self.assertEqual(kinds, [CELL_PLACED, SOS_FORMED, SCORE_CHANGED])
+        self.assertEqual(self.events[1][1]["cells"], [(0, 0), (0, 1), (0, 2)])
+        self.assertEqual(self.events[2][1]["scores"], {"Blue": 1, "Red": 0})
+
+    def test_invalid_move_is_reported(self):
+        """Test that playing on an occupied cell emits INVALID_MOVE and changes nothing."""
+        self.manager.mode.make_move(0, 0, "S")
+        self.events.clear()
+        self.manager.mode.make_move(0, 0, "O")
+        self.assertEqual(self.events, [(INVALID_MOVE, {"row": 0, "col": 0, "player": "Red"})])
+
+    def test_full_board_emits_game_ended(self):
+        """Test that filling the board ends the game with the winner in the event."""
+        for row in range(3):
+            for col in range(3):
+                self.manager.mode.make_move(row, col, "O")
+        self.assertEqual(self.events[-1], (GAME_ENDED, {"winner": None, "mode": "General"}))
+        self.assertFalse(self.manager.is_game_active)
+
+class TestUndoRedo(unittest.TestCase):
+
+    def setUp(self):
+        """Start a headless General game between two humans."""
+        self.manager = GameManager(3, "General")
+        self.manager.reset_game(3, "General")
+        self.mode = self.manager.mode
+
+    def test_undo_and_redo_a_scoring_move(self):
+        """Test that undo takes back an SOS with its score and redo plays it again."""
+        for row, col, letter in [(0, 0, "S"), (1, 1, "O"), (0, 1, "O"), (2, 2, "S")]:
+            self.mode.make_move(row, col, letter)
+        self.assertEqual(self.mode.sos_count, {"Blue": 0, "Red": 1})
+        events = []
+        self.manager.events.subscribe(lambda kind, data: events.append(kind))
+        self.manager.undo_move()
+        self.assertEqual(self.mode.sos_count, {"Blue": 0, "Red": 0})
+        self.assertTrue(self.mode.board.is_empty(2, 2))
+        self.assertEqual(self.manager.current_player.color, "Red")
+        self.assertIn(CELL_CLEARED, events)
+        self.manager.redo_move()
+        self.assertEqual(self.mode.sos_count, {"Blue": 0, "Red": 1})
+        self.assertEqual(self.mode.board.get(2, 2), "S")
+
+    def test_new_move_clears_redo(self):
+        """Test that playing after an undo discards the moves that could be redone."""
+        self.mode.make_move(0, 0, "S")
+        self.manager.undo_move()
+        self.mode.make_move(1, 1, "O")
+        self.manager.redo_move()
+        self.assertTrue(self.mode.board.is_empty(0, 0))
+
+    def test_undo_reopens_finished_game(self):
+        """Test that undoing the last move of a finished game makes it active again."""
+        for row in range(3):
+            for col in range(3):
+                self.mode.make_move(row, col, "O")
+        self.assertFalse(self.manager.is_game_active)
+        self.manager.undo_move()
+        self.assertTrue(self.manager.is_game_active)
+        self.assertEqual(self.mode.board.filled, 8)
+
+class TestGameRecording(unittest.TestCase):
+
+    def test_finished_game_is_recorded(self):
+        """Test that a finished game's moves, players and SOS land in the record file once."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.sgr")
+            manager = GameManager(3, "Simple", record_path=path)
+            manager.reset_game(3, "Simple")
+            for row, col, letter in [(0, 0, "S"), (1, 1, "O"), (0, 1, "O"), (0, 2, "S")]:
+                manager.mode.make_move(row, col, letter)
+            manager.end_game()  # The GUI ends the game a second time
+            manager.record_writer.close()
+            games = list(read_games(path))
+        self.assertEqual(len(games), 1)
+        self.assertEqual(list(games[0]), [
+            (0, 0, "S", "Blue", 0), (1, 1, "O", "Red", 0), (0, 1, "O", "Blue", 0), (0, 2, "S", "Red", 1),
+        ])
+        self.assertEqual(games[0].winner(), "Red")
+
+    def test_abandoned_game_is_not_recorded(self):
+        """Test that a game ended before the rules finished it leaves no record with a made-up result."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.sgr")
+            manager = GameManager(3, "General", record_path=path)
+            manager.reset_game(3, "General")
+            manager.mode.make_move(0, 0, "S")
+            manager.end_game()  # The End Game button
+            manager.record_writer.close()
+            self.assertEqual(list(read_games(path)), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import random
+import unittest
+from game_modes import SimpleGameMode, GeneralGameMode
+
+class TestPlayUndo(unittest.TestCase):
+
+    def test_delta_records_sos_and_extra_turn(self):
+        """Test that forming an SOS is scored and keeps the turn with the mover."""
+        mode = GeneralGameMode(3, None)
+        mode.play(0, 0, "S")
+        mode.play(0, 1, "O")
+        delta = mode.play(0, 2, "S")
+        self.assertEqual(delta.player, "Blue")
+        self.assertEqual(delta.lines, ((0, 1, 2),))
+        self.assertEqual(delta.gained, 1)
+        self.assertFalse(delta.turn_passed)
+        self.assertEqual(mode.turn, "Blue")
+        self.assertEqual(mode.sos_count, {"Blue": 1, "Red": 0})
+
+    def test_undo_restores_everything(self):
+        """Test that undoing a random game move by move returns to the empty position."""
+        rng = random.Random(3)
+        mode = GeneralGameMode(5, None)
+        snapshots, deltas = [], []
+        while not mode.board.is_full():
+            snapshots.append((bytes(mode.board.cells), mode.turn, dict(mode.sos_count),
+                              dict(mode.threats.completions)))
+            row, col = mode.board.random_empty_cell(rng)
+            deltas.append(mode.play(row, col, rng.choice("SO")))
+        self.assertTrue(deltas[-1].ended)
+        for delta in reversed(deltas):
+            mode.undo(delta)
+            self.assertEqual((bytes(mode.board.cells), mode.turn, dict(mode.sos_count),
+                              dict(mode.threats.completions)), snapshots.pop())
+
+    def test_simple_game_ends_on_first_sos(self):
+        """Test that a Simple game is over as soon as an SOS is formed, and undo reopens it."""
+        mode = SimpleGameMode(3, None)
+        mode.is_game_active = True
+        mode.play(0, 0, "S")
+        mode.play(1, 1, "O")
+        delta = mode.play(2, 2, "S")
+        self.assertTrue(delta.ended)
+        self.assertFalse(mode.is_game_active)
+        mode.undo(delta)
+        self.assertTrue(mode.is_game_active)
+        self.assertEqual(mode.turn, "Blue")
+
+    def test_invalid_play_is_rejected(self):
+        """Test that playing on an occupied cell raises ValueError."""
+        mode = SimpleGameMode(3, None)
+        mode.play(1, 1, "S")
+        with self.assertRaises(ValueError):
+            mode.play(1, 1, "O")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from game_record import (GameRecordWriter, count_games, decode_moves, encode_move, move_width, read_game,
+                         read_games)
+from simulator import main, play_game
+
+class TestGameRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.sgr")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_moves_take_two_to_four_bytes(self):
+        """Test that the packed move width grows with the board."""
+        self.assertEqual([move_width(size) for size in (3, 20, 32, 33, 100, 512, 513)], [2, 2, 2, 3, 3, 3, 4])
+
+    def test_moves_round_trip(self):
+        """Test that every field of a move survives encoding on small and large boards."""
+        for size in (3, 50, 1000):
+            moves = [(size - 1, size - 1, "O", "Red", 8), (0, 1, "S", "Blue", 0), (size // 2, 0, "S", "Red", 3)]
+            data = b"".join(encode_move(size, *move) for move in moves)
+            self.assertEqual(len(data), 3 * move_width(size))
+            self.assertEqual(list(decode_moves(size, data)), moves)
+
+    def test_writer_buffers_and_appends(self):
+        """Test that games stay buffered until the threshold and a reopened file is appended to."""
+        game = [(0, 0, "S", "Blue", 0), (0, 1, "O", "Red", 0), (0, 2, "S", "Blue", 1)]
+        writer = GameRecordWriter(self.path, buffer_size=1024)
+        writer.write_game(3, "General", game)
+        self.assertEqual(os.path.getsize(self.path), 0)
+        writer.close()
+        with GameRecordWriter(self.path) as writer:
+            writer.write_game(8, "Simple", game)
+        games = list(read_games(self.path))
+        self.assertEqual([(record.size, record.mode_name, len(record)) for record in games],
+                         [(3, "General", 3), (8, "Simple", 3)])
+        self.assertEqual(list(games[1]), game)
+        self.assertEqual(games[0].scores(), {"Blue": 1, "Red": 0})
+
+    def test_reader_is_lazy(self):
+        """Test that reading yields games one at a time from a generator."""
+        with GameRecordWriter(self.path) as writer:
+            for _ in range(3):
+                writer.write_game(3, "General", [(1, 1, "O", "Blue", 0)])
+        games = read_games(self.path)
+        self.assertEqual(len(next(games)), 1)
+        self.assertEqual(sum(1 for _ in games), 2)
+
+    def test_games_are_counted_and_found_without_reading_the_rest(self):
+        """Test that a game can be counted and picked out by its position in the file."""
+        with GameRecordWriter(self.path) as writer:
+            for size in (3, 40, 5):
+                writer.write_game(size, "General", [(1, 1, "O", "Blue", 0)] * size)
+        self.assertEqual(count_games(self.path), 3)
+        record = read_game(self.path, 1)
+        self.assertEqual((record.size, len(record)), (40, 40))
+        self.assertIsNone(read_game(self.path, 3))
+
+    def test_truncated_file_is_reported(self):
+        """Test that a record cut off inside a game raises ValueError."""
+        with GameRecordWriter(self.path) as writer:
+            writer.write_game(3, "General", [(1, 1, "O", "Blue", 0), (0, 0, "S", "Red", 0)])
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ValueError):
+            list(read_games(self.path))
+        with self.assertRaises(ValueError):
+            count_games(self.path)
+
+    def test_simulator_records_every_game(self):
+        """Test that the simulator's --record option writes games matching their results."""
+        main(["--games", "4", "--size", "5", "--workers", "1", "--record", self.path])
+        games = list(read_games(self.path))
+        self.assertEqual(len(games), 4)
+        for seed, record in enumerate(games):
+            result = play_game(5, "General", seed=seed)
+            self.assertEqual(len(record), result["moves"])
+            self.assertEqual(record.scores(), result["scores"])
+            self.assertEqual(record.winner(), result["winner"])
+
+if __name__ == "__main__":
+    unittest.main()
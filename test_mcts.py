@@ -0,0 +1,58 @@
+import random
+import unittest
+from unittest import mock
+from board import Board
+from mcts import MCTSSearch
+
+class TestMCTSSearch(unittest.TestCase):
+
+    def test_simple_takes_the_win(self):
+        """Test that UCT finds the move that wins a Simple game at once."""
+        board = Board(3)
+        board.place(0, 0, "S")
+        board.place(1, 1, "O")
+        search = MCTSSearch(time_limit_ms=300, rng=random.Random(1))
+        self.assertEqual(search.choose_move(board, "Simple"), (2, 2, "S"))
+
+    def test_reports_playout_rate(self):
+        """Test that every search reports its playouts per second."""
+        search = MCTSSearch(time_limit_ms=100, rng=random.Random(2))
+        board = Board(5)
+        before = bytes(board.cells)
+        row, col, letter = search.choose_move(board, "General")
+        self.assertEqual(bytes(board.cells), before)
+        self.assertTrue(board.is_empty(row, col))
+        self.assertGreater(search.stats["playouts"], 0)
+        self.assertGreater(search.stats["playouts_per_second"], 0)
+
+    def test_subtree_is_reused_after_the_opponent_moves(self):
+        """Test that the next search starts from the subtree of the moves actually played."""
+        search = MCTSSearch(time_limit_ms=200, rng=random.Random(3))
+        board = Board(3)
+        row, col, letter = search.choose_move(board, "General")
+        board.place(row, col, letter)
+        reply = next(cell for cell in board.empty_cells())
+        board.place(*reply, "O")
+        search.choose_move(board, "General")
+        self.assertGreater(search.stats["reused_visits"], 0)
+
+    def test_unrelated_board_starts_a_fresh_tree(self):
+        """Test that a board that does not follow from the tree is searched from scratch."""
+        search = MCTSSearch(time_limit_ms=50, rng=random.Random(4))
+        search.choose_move(Board(3), "General")
+        other = Board(4)
+        other.place(0, 0, "S")
+        search.choose_move(other, "General")
+        self.assertEqual(search.stats["reused_visits"], 0)
+
+    def test_pondering_stops_at_the_tree_budget(self):
+        """Test that pondering returns on its own once the tree reaches its move budget."""
+        search = MCTSSearch(rng=random.Random(5))
+        with mock.patch("mcts.PONDER_TREE_MOVES", 2000):
+            search.ponder(Board(10), "General")  # 200 move keys per node, so 10 playouts
+        self.assertEqual(search.stats["playouts"], 10)
+        self.assertLessEqual(len(search.root.children), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import collections
+import os
+import tempfile
+import unittest
+from board import Board
+from opening_book import (OpeningBook, best_entries, book_path, build_book, load_book, tally_game,
+                          write_book)
+from symmetry import SymmetricHash
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.books = []
+
+    def tearDown(self):
+        for book in self.books:
+            book.close()
+        self.directory.cleanup()
+
+    def write(self, entries, size=5, plies=4):
+        """Write entries to a General book in the temporary directory and open it."""
+        path = book_path("General", size, self.directory.name)
+        write_book(path, size, "General", plies, entries)
+        self.books.append(OpeningBook(path))
+        return self.books[-1]
+
+    def test_symmetric_openings_share_statistics(self):
+        """Test that openings in opposite corners are tallied as the same move."""
+        stats = collections.defaultdict(lambda: collections.defaultdict(lambda: [0, 0.0]))
+        tally_game(stats, 5, 4, [[0, 0, "S", "Blue", 0], [2, 2, "O", "Red", 0]], "Blue")
+        tally_game(stats, 5, 4, [[4, 4, "S", "Blue", 0]], "Draw")
+        tally_game(stats, 5, 4, [[0, 1, "O", "Blue", 0]], "Red")
+        entries = best_entries(stats, min_games=2)
+        self.assertEqual(len(entries), 1)
+        key, move, games, score = entries[0]
+        self.assertEqual(key, SymmetricHash(5).canonical()[0])
+        self.assertEqual((games, score), (2, 750))
+
+    def test_find_uses_the_sorted_index(self):
+        """Test that every stored hash is found and absent ones are not."""
+        entries = [(key * 7919, key % 50 << 2 | 1, 5, 600) for key in range(1, 500)]
+        book = self.write(entries)
+        self.assertEqual(len(book), 499)
+        for key, move, games, score in entries[::37]:
+            self.assertEqual(book.find(key), (move, games, score))
+        self.assertIsNone(book.find(7919 * 1000))
+        self.assertIsNone(book.find(3))
+
+    def test_probe_maps_the_move_into_the_board_frame(self):
+        """Test that a book move is played in the orientation of the position asked about."""
+        board = Board(5)
+        board.place(0, 0, "S")
+        hashes = SymmetricHash.of_board(board)
+        key, transform = hashes.canonical()
+        book = self.write([(key, hashes.to_canonical(1 << 2 | 2, transform), 9, 800)])
+        self.assertEqual(book.probe(board), (0, 1, "O"))
+
+        rotated = Board(5)
+        rotated.place(4, 4, "S")
+        row, col, letter = book.probe(rotated)
+        self.assertEqual(letter, "O")
+        self.assertIn((row, col), [(4, 3), (3, 4)])
+
+    def test_probe_stops_after_the_book_plies(self):
+        """Test that positions deeper than the book's plies are out of book."""
+        board = Board(5)
+        for col in range(4):
+            board.place(0, col, "S")
+        book = self.write([(SymmetricHash.of_board(board).canonical()[0], 4 << 2 | 1, 9, 800)], plies=4)
+        self.assertIsNone(book.probe(board))
+
+    def test_self_play_builds_a_loadable_book(self):
+        """Test that a small self-play run writes a book the loader can read."""
+        entries = build_book(30, 4, "Simple", plies=2, workers=1, min_games=1)
+        write_book(book_path("Simple", 4, self.directory.name), 4, "Simple", 2, entries)
+        book = load_book("Simple", 4, self.directory.name)
+        self.books.append(book)
+        self.assertEqual(book.plies, 2)
+        self.assertIsNotNone(book.probe(Board(4)))
+        self.assertIsNone(load_book("Simple", 5, self.directory.name))
+
+    def test_bad_file_is_rejected(self):
+        """Test that a file that is not a book is refused."""
+        path = os.path.join(self.directory.name, "junk.book")
+        with open(path, "wb") as file:
+            file.write(b"x" * 40)
+        with self.assertRaises(ValueError):
+            OpeningBook(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from board import Board
+from parallel import RootParallelSearch, merge_depths, shutdown_pool
+from player import ComputerPlayer
+
+class TestRootParallelSearch(unittest.TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the shared worker pool once the tests are done."""
+        shutdown_pool()
+
+    def test_small_board_falls_back_to_serial(self):
+        """Test that small boards are searched in this process."""
+        board = Board(3)
+        board.place(0, 0, "S")
+        board.place(0, 1, "O")
+        search = RootParallelSearch("alphabeta", time_limit=0.2, workers=4)
+        self.assertEqual(search.choose_move(board, "Simple"), (0, 2, "S"))
+        self.assertFalse(search.last_parallel)
+
+    def test_alphabeta_root_split_finds_the_best_move(self):
+        """Test that merged worker results pick the move that scores most."""
+        board = Board(7)
+        for col, letter in enumerate("SO"):
+            board.place(3, col, letter)
+        board.place(5, 2, "S")
+        board.place(4, 2, "O")
+        search = RootParallelSearch("alphabeta", time_limit=0.3, workers=2)
+        self.assertEqual(search.choose_move(board, "General"), (3, 2, "S"))
+        self.assertTrue(search.last_parallel)
+
+    def test_merge_compares_values_at_a_common_depth(self):
+        """Test that a worker's deeper, higher value does not outrank values from the shared depth."""
+        shallow = {1: (4, 3), 2: (4, 1)}
+        deep = {1: (8, 2), 2: (8, 0), 3: (8, 5)}
+        self.assertEqual(merge_depths([shallow, deep]), 4)
+        # A worker that finished no depth only offers its fallback move
+        self.assertEqual(merge_depths([{0: (12, 0)}, deep]), 12)
+
+    def test_heuristic_players_stay_serial(self):
+        """Test that extra workers never send the heuristic strategy to the process pool."""
+        self.assertIsNone(ComputerPlayer("Blue", "Blue", None, "heuristic", workers=4).engine)
+        self.assertIsInstance(ComputerPlayer("Blue", "Blue", None, "alphabeta", workers=4).engine,
+                              RootParallelSearch)
+
+    def test_mcts_merges_visit_counts(self):
+        """Test that root-parallel MCTS returns a legal move."""
+        board = Board(7)
+        search = RootParallelSearch("mcts", time_limit=0.2, workers=2)
+        row, col, letter = search.choose_move(board, "General")
+        self.assertTrue(board.is_empty(row, col))
+        self.assertIn(letter, ("S", "O"))
+        # Playouts from every worker are kept for tuning
+        self.assertEqual(search.totals["searches"], 1)
+        self.assertGreater(search.totals["playouts"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import random
+import tempfile
+import unittest
+from board import Board
+from game_record import GameRecordWriter, read_games
+from replay import Replay
+from simulator import play_game
+
+class TestReplay(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Record one 20x20 General game and read it back."""
+        result = play_game(20, "General", seed=3, endgame_cells=0, record=True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.sgr")
+            with GameRecordWriter(path) as writer:
+                writer.write_game(20, "General", result["record"])
+            cls.record = next(read_games(path))
+        cls.result = result
+
+    def position_after(self, moves):
+        """Plays the first moves of the record on a fresh board."""
+        board = Board(20)
+        for row, col, letter, _, _ in list(self.record)[:moves]:
+            board.place(row, col, letter)
+        return bytes(board.cells)
+
+    def test_seeking_matches_replaying_from_the_start(self):
+        """Test that random seeks land on the same position as a full replay."""
+        replay = Replay(self.record, keyframe_interval=32)
+        self.assertEqual(len(replay), 400)
+        rng = random.Random(0)
+        for target in [400, 0, 399, 1] + [rng.randrange(401) for _ in range(30)]:
+            replay.seek(target)
+            self.assertEqual(bytes(replay.board.cells), self.position_after(target))
+            self.assertLess(replay.steps, 32)
+
+    def test_changes_cover_exactly_the_differing_cells(self):
+        """Test that seek reports every cell whose letter changed and no others."""
+        replay = Replay(self.record, keyframe_interval=16)
+        replay.seek(150)
+        before = bytes(replay.board.cells)
+        changed, _, _ = replay.seek(90)
+        after = bytes(replay.board.cells)
+        expected = {divmod(index, 20) for index in range(400) if before[index] != after[index]}
+        self.assertEqual(set(changed), expected)
+        self.assertEqual(len(changed), 60)
+
+    def test_lines_and_scores_follow_the_position(self):
+        """Test that SOS lines appear and disappear with seeking and scores match the result."""
+        replay = Replay(self.record)
+        _, added, removed = replay.seek(400)
+        self.assertEqual(removed, [])
+        self.assertEqual(len(added), sum(self.result["scores"].values()))
+        self.assertEqual(replay.scores_at(), self.result["scores"])
+        _, added, removed = replay.seek(0)
+        self.assertEqual(added, [])
+        self.assertEqual(len(removed), sum(self.result["scores"].values()))
+        self.assertEqual(replay.scores_at(), {"Blue": 0, "Red": 0})
+        self.assertIsNone(replay.last_player())
+
+if __name__ == "__main__":
+    unittest.main()
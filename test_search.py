@@ -0,0 +1,97 @@
+import random
+import unittest
+from unittest import mock
+from board import Board
+from search import AlphaBetaSearch, TranspositionTable
+
+def exhaustive_value(board, sudden_death):
+    """Plain minimax over every move, returning the value for the side to move."""
+    if board.is_full():
+        return 0
+    best = None
+    for row, col in board.empty_cells():
+        for letter in "SO":
+            board.place(row, col, letter)
+            gained = board.count_sos_at(row, col)
+            if gained and sudden_death:
+                value = 1
+            elif gained:
+                value = gained + exhaustive_value(board, sudden_death)
+            else:
+                value = -exhaustive_value(board, sudden_death)
+            board.clear(row, col)
+            best = value if best is None else max(best, value)
+    return best
+
+class TestAlphaBetaSearch(unittest.TestCase):
+
+    def random_position(self, seed, empties):
+        """Fill a 3x3 board randomly, leaving the given number of empty cells."""
+        rng = random.Random(seed)
+        board = Board(3)
+        cells = [(row, col) for row in range(3) for col in range(3)]
+        rng.shuffle(cells)
+        for row, col in cells[empties:]:
+            board.place(row, col, rng.choice("SO"))
+        return board
+
+    def test_general_move_is_optimal(self):
+        """Test that the chosen General move achieves the exhaustive minimax value."""
+        search = AlphaBetaSearch(time_limit=5.0)
+        for seed in range(8):
+            board = self.random_position(seed, empties=5)
+            row, col, letter = search.choose_move(board, "General")
+            self.assertTrue(board.is_empty(row, col))
+            board.place(row, col, letter)
+            gained = board.count_sos_at(row, col)
+            achieved = gained + exhaustive_value(board, False) if gained else -exhaustive_value(board, False)
+            board.clear(row, col)
+            self.assertEqual(achieved, exhaustive_value(board, False))
+
+    def test_simple_takes_the_win(self):
+        """Test that Simple mode plays the move that wins immediately."""
+        board = Board(4)
+        board.place(2, 0, "S")
+        board.place(2, 1, "O")
+        move = AlphaBetaSearch(time_limit=2.0).choose_move(board, "Simple")
+        self.assertEqual(move, (2, 2, "S"))
+
+    def test_search_leaves_board_untouched(self):
+        """Test that searching works on a copy of the board."""
+        board = self.random_position(3, empties=6)
+        before = bytes(board.cells)
+        AlphaBetaSearch(time_limit=0.2).choose_move(board, "General")
+        self.assertEqual(bytes(board.cells), before)
+
+    def test_time_budget_is_respected(self):
+        """Test that a large board still returns a legal move close to the budget."""
+        board = Board(12)
+        search = AlphaBetaSearch(time_limit=0.3)
+        row, col, letter = search.choose_move(board, "General")
+        self.assertTrue(board.is_empty(row, col))
+        self.assertGreaterEqual(search.completed_depth, 1)
+
+    def test_pondering_stops_at_the_node_budget(self):
+        """Test that pondering gives up deepening after PONDER_NODES nodes."""
+        search = AlphaBetaSearch()
+        with mock.patch("search.PONDER_NODES", 2048):
+            search.ponder(Board(8), "General")
+        self.assertEqual(search.nodes, 2048)
+        self.assertGreaterEqual(search.completed_depth, 1)
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_replacement_prefers_depth_within_a_search(self):
+        """Test that a shallower entry cannot evict a deeper one from the same search."""
+        table = TranspositionTable(size_bits=2)
+        table.store(0b100, 5, 3, 0, 8)
+        table.store(0b1000, 2, 1, 0, 9)  # Same slot, shallower
+        self.assertIsNone(table.probe(0b1000))
+        table.new_search()
+        table.store(0b1000, 2, 1, 0, 9)  # Earlier-search entries always yield
+        self.assertEqual(table.probe(0b1000), (2, 1, 0, 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from bitboard import BitBoard
+from simulator import SimulatedGame, play_game, simulate
+from sparse_board import SparseBoard
+
+class TestSimulator(unittest.TestCase):
+
+    def test_general_game_fills_the_board(self):
+        """Test that a General game plays every cell and reports consistent scores."""
+        result = play_game(5, "General", seed=1)
+        self.assertEqual(result["moves"], 25)
+        blue, red = result["scores"]["Blue"], result["scores"]["Red"]
+        expected = "Blue" if blue > red else "Red" if red > blue else "Draw"
+        self.assertEqual(result["winner"], expected)
+
+    def test_simple_game_ends_at_first_sos(self):
+        """Test that a Simple game stops with one SOS for the winner, or fills the board in a draw."""
+        for seed in range(10):
+            result = play_game(4, "Simple", seed=seed)
+            if result["winner"] == "Draw":
+                self.assertEqual(result["moves"], 16)
+            else:
+                self.assertGreaterEqual(result["scores"][result["winner"]], 1)
+
+    def test_same_seed_replays_the_same_game(self):
+        """Test that seeding makes results reproducible."""
+        first = play_game(6, "General", seed=42)
+        second = play_game(6, "General", seed=42)
+        self.assertEqual((first["scores"], first["moves"]), (second["scores"], second["moves"]))
+
+    def test_simulate_streams_every_game(self):
+        """Test that a serial batch yields one result per game."""
+        results = list(simulate(70, board_size=3, mode_name="Simple", workers=1))
+        self.assertEqual(sorted(result["seed"] for result in results), list(range(70)))
+
+    def test_mcts_playout_rate_is_reported(self):
+        """Test that results sum the MCTS players' playouts and report their rate."""
+        result = play_game(3, "General", "mcts", "heuristic", time_limit=0.01, seed=2)
+        self.assertGreater(result["mcts"]["searches"], 0)
+        self.assertGreater(result["mcts"]["playouts"], 0)
+        self.assertGreater(result["mcts"]["playouts_per_second"], 0)
+        self.assertEqual(play_game(3, "General", seed=2)["mcts"]["playouts"], 0)
+
+    def test_board_type_selects_the_backend(self):
+        """Test that games run on any backend and that huge boards default to the sparse one."""
+        self.assertIsInstance(SimulatedGame(1000, "General").board, SparseBoard)
+        self.assertIsInstance(SimulatedGame(8, "General", "bitboard").board, BitBoard)
+        for board_type in ("sparse", "bitboard"):
+            result = play_game(5, "General", seed=1, board_type=board_type)
+            self.assertEqual(result["moves"], 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import random
+import unittest
+from board import Board, DIRECTIONS
+from game_modes import GeneralGameMode
+from player import ComputerPlayer
+from sos_numpy import np, board_array, count_sos, move_maps, total_sos
+from threats import ThreatMap
+
+def random_board(size, moves, rng):
+    """Fill some cells of a new board with random letters."""
+    board = Board(size)
+    for _ in range(moves):
+        row, col = board.random_empty_cell(rng)
+        board.place(row, col, rng.choice("SO"))
+    return board
+
+def count_direction(board, direction):
+    """Count SOS lines along one direction by checking every start cell."""
+    dx, dy = direction
+    count = 0
+    for row in range(board.size):
+        for col in range(board.size):
+            cells = [(row + k * dx, col + k * dy) for k in range(3)]
+            if all(board.is_valid_position(r, c) for r, c in cells):
+                if "".join(board.get(r, c) for r, c in cells) == "SOS":
+                    count += 1
+    return count
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestSOSNumpy(unittest.TestCase):
+
+    def setUp(self):
+        """Build a batch of random boards of mixed fullness."""
+        rng = random.Random(11)
+        self.boards = [random_board(7, rng.randrange(50), rng) for _ in range(40)]
+        self.positions = board_array(self.boards)
+
+    def test_board_array_shape(self):
+        """Test that boards become an (N, n, n) int8 array."""
+        self.assertEqual(self.positions.shape, (40, 7, 7))
+        self.assertEqual(self.positions.dtype, np.int8)
+
+    def test_counts_per_direction_match_board(self):
+        """Test that the per-direction counts match a cell-by-cell scan of every board."""
+        counts = count_sos(self.positions)
+        for board, board_counts in zip(self.boards, counts):
+            self.assertEqual(list(board_counts), [count_direction(board, d) for d in DIRECTIONS])
+            self.assertEqual(board_counts.sum(), board.count_all_sos())
+
+    def test_move_maps_match_threat_map(self):
+        """Test that the completion and set-up maps agree with ThreatMap for every move."""
+        completions, setups = move_maps(self.positions)
+        for number, board in enumerate(self.boards):
+            threats = ThreatMap(board)
+            for index in range(len(board.cells)):
+                row, col = board.position(index)
+                for letter_code, code in enumerate((1, 2)):
+                    key = index << 2 | code
+                    self.assertEqual(completions[number, letter_code, row, col], threats.completions.get(key, 0))
+                    self.assertEqual(setups[number, letter_code, row, col], threats.poisoned.get(key, 0))
+
+    def test_total_sos(self):
+        """Test that total_sos counts every line on a single board."""
+        self.assertEqual(total_sos(self.boards[-1]), self.boards[-1].count_all_sos())
+
+    def test_final_scores_match_the_board(self):
+        """Test that every SOS on a finished General board was credited to exactly one player."""
+        rng = random.Random(12)
+        for _ in range(5):
+            mode = GeneralGameMode(6, None)
+            while not mode.board.is_full():
+                row, col = mode.board.random_empty_cell(rng)
+                mode.play(row, col, rng.choice("SO"))
+            self.assertEqual(mode.sos_count["Blue"] + mode.sos_count["Red"], total_sos(mode.board))
+
+    def test_vectorized_player_takes_best_completion(self):
+        """Test that the vectorized strategy plays the move completing the most SOS."""
+        mode = GeneralGameMode(5, None)
+        for row, col, letter in [(0, 0, "S"), (0, 1, "O"), (1, 2, "O"), (2, 2, "S")]:
+            mode.board.place(row, col, letter)
+        player = ComputerPlayer("Computer", "Blue", None, "vectorized")
+        self.assertEqual(player.choose_move(mode), (0, 2, "S"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import random
+import unittest
+from board import Board
+from game_modes import GeneralGameMode
+from player import ComputerPlayer
+from sparse_board import SparseBoard
+from threats import ThreatMap
+
+class TestSparseBoard(unittest.TestCase):
+
+    def test_matches_dense_board_through_a_game(self):
+        """Test that SOS lines, counts and threats agree with the dense board move by move."""
+        rng = random.Random(7)
+        dense, sparse = Board(6), SparseBoard(6)
+        dense_threats, sparse_threats = ThreatMap(dense), ThreatMap(sparse)
+        while not dense.is_full():
+            row, col = dense.random_empty_cell(rng)
+            letter = rng.choice("SO")
+            dense.place(row, col, letter)
+            sparse.place(row, col, letter)
+            self.assertEqual(sparse.sos_lines_at(row, col), dense.sos_lines_at(row, col))
+            self.assertEqual(sparse.count_all_sos(), dense.count_all_sos())
+            self.assertEqual(sparse_threats.completions, dense_threats.completions)
+            self.assertEqual(sparse_threats.poisoned, dense_threats.poisoned)
+        self.assertTrue(sparse.is_full())
+
+    def test_memory_follows_moves_not_area(self):
+        """Test that a huge board stores only the cells that hold letters."""
+        board = SparseBoard(100000)
+        board.place(5, 5, "S")
+        board.place(99999, 99999, "O")
+        self.assertEqual(len(board.cells), 2)
+        self.assertEqual(board.get(500, 500), " ")
+        self.assertEqual(len(board.cells), 2)
+        board.clear(5, 5)
+        self.assertEqual(board.occupied_indices(), [99999 * 100000 + 99999])
+        self.assertEqual(len(board.chunks), 1)
+
+    def test_occupied_in_region(self):
+        """Test that the spatial index finds exactly the letters inside a rectangle."""
+        board = SparseBoard(1000)
+        for row, col in [(0, 0), (15, 16), (17, 17), (40, 40), (999, 0)]:
+            board.place(row, col, "S")
+        self.assertEqual(board.occupied_in(10, 10, 40, 39), [(15, 16), (17, 17)])
+        self.assertEqual(board.occupied_in(0, 0, 999, 999), [(0, 0), (15, 16), (17, 17), (40, 40), (999, 0)])
+
+    def test_random_empty_cell_avoids_letters(self):
+        """Test that rejection sampling only returns empty cells and None on a full board."""
+        board = SparseBoard(3)
+        rng = random.Random(1)
+        for _ in range(8):
+            row, col = board.random_empty_cell(rng)
+            board.place(row, col, "O")
+        self.assertEqual(board.random_empty_cell(rng), board.empty_cells()[0])
+        board.place(*board.empty_cells()[0], "O")
+        self.assertIsNone(board.random_empty_cell(rng))
+
+    def test_computer_plays_on_huge_board(self):
+        """Test that a ComputerPlayer takes an SOS on a 1000x1000 sparse board."""
+        mode = GeneralGameMode(1000, None, "sparse")
+        mode.board.place(500, 500, "S")
+        mode.board.place(500, 501, "O")
+        for strategy in ("heuristic", "alphabeta"):
+            player = ComputerPlayer("Computer", "Blue", None, strategy, time_limit=0.05)
+            self.assertEqual(player.choose_move(mode), (500, 502, "S"))
+        self.assertEqual(len(mode.board.cells), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import random
+import unittest
+from board import Board
+from game_modes import GeneralGameMode
+from player import ComputerPlayer
+from search import AlphaBetaSearch
+from symmetry import PositionCache, SymmetricHash, position_cache, symmetry_maps
+
+class TestSymmetricHash(unittest.TestCase):
+
+    def place_all(self, size, letters):
+        """Return a board with the given {(row, col): letter} placed."""
+        board = Board(size)
+        for (row, col), letter in letters.items():
+            board.place(row, col, letter)
+        return board
+
+    def test_canonical_hash_ignores_rotation_and_reflection(self):
+        """Test that every symmetric image of a position has the same canonical hash."""
+        letters = {(0, 0): "S", (0, 1): "O", (2, 3): "S", (1, 2): "O"}
+        key = SymmetricHash.of_board(self.place_all(4, letters)).canonical()[0]
+        for mapping in symmetry_maps(4):
+            image = {divmod(mapping[row * 4 + col], 4): letter for (row, col), letter in letters.items()}
+            self.assertEqual(SymmetricHash.of_board(self.place_all(4, image)).canonical()[0], key)
+
+    def test_different_positions_hash_differently(self):
+        """Test that S and O in the same cell give different canonical hashes."""
+        first = SymmetricHash.of_board(self.place_all(3, {(0, 0): "S"})).canonical()[0]
+        second = SymmetricHash.of_board(self.place_all(3, {(0, 0): "O"})).canonical()[0]
+        self.assertNotEqual(first, second)
+
+    def test_toggle_is_incremental(self):
+        """Test that placing then removing a letter restores the hashes."""
+        hashes = SymmetricHash.of_board(self.place_all(3, {(1, 1): "O"}))
+        before = list(hashes.hashes)
+        hashes.toggle(2, 1)
+        self.assertNotEqual(hashes.hashes, before)
+        hashes.toggle(2, 1)
+        self.assertEqual(hashes.hashes, before)
+
+    def test_moves_round_trip_through_canonical_frame(self):
+        """Test that from_canonical undoes to_canonical for every transform."""
+        hashes = SymmetricHash(5)
+        for transform in range(8):
+            for move in range(0, 25 * 4, 3):
+                canonical = hashes.to_canonical(move, transform)
+                self.assertEqual(hashes.from_canonical(canonical, transform), move)
+
+    def test_equivalent_moves_share_a_canonical_key(self):
+        """Test that the four corners of an empty board are the same canonical move."""
+        hashes = SymmetricHash(4)
+        corners = {hashes.canonical_move(index << 2 | 1) for index in (0, 3, 12, 15)}
+        self.assertEqual(len(corners), 1)
+        self.assertNotEqual(hashes.canonical_move(1 << 2 | 1), corners.pop())
+
+    def test_without_symmetry_only_identity_is_hashed(self):
+        """Test that symmetric=False keeps a single hash with the identity transform."""
+        hashes = SymmetricHash.of_board(self.place_all(3, {(0, 1): "S"}), symmetric=False)
+        self.assertEqual(len(hashes.hashes), 1)
+        self.assertEqual(hashes.canonical()[1], 0)
+
+class TestPositionCache(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_dropped(self):
+        """Test that a full cache evicts the entry used longest ago."""
+        cache = PositionCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+class TestSymmetricSearch(unittest.TestCase):
+
+    def test_symmetry_searches_fewer_nodes(self):
+        """Test that canonical hashing shrinks a full 3x3 General search without changing its value."""
+        results = []
+        for symmetric in (True, False):
+            search = AlphaBetaSearch(time_limit=30.0, symmetry=symmetric)
+            search.choose_move(Board(3), "General")
+            results.append((search.nodes, search.best_value))
+        self.assertEqual(results[0][1], results[1][1])
+        self.assertLess(results[0][0], results[1][0])
+
+    def test_solved_position_is_shared_through_the_cache(self):
+        """Test that a second player reuses a rotated position solved by the first."""
+        position_cache.clear()
+        rng = random.Random(3)
+        letters = {index: rng.choice("SO") for index in rng.sample(range(25), 19)}
+        first = GeneralGameMode(5, None)
+        rotated = GeneralGameMode(5, None)
+        quarter_turn = symmetry_maps(5)[1]
+        for index, letter in letters.items():
+            first.board.place(*divmod(index, 5), letter)
+            rotated.board.place(*divmod(quarter_turn[index], 5), letter)
+        ComputerPlayer("Blue", "Blue", None, strategy="alphabeta", endgame_cells=0).choose_move(first)
+        self.assertGreater(len(position_cache), 0)
+
+        move = ComputerPlayer("Red", "Red", None, strategy="alphabeta", endgame_cells=0).choose_move(rotated)
+        self.assertEqual(position_cache.hits, 1)
+        self.assertTrue(rotated.board.is_empty(move[0], move[1]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import random
+import tempfile
+import unittest
+from board import Board, EMPTY
+from search import AlphaBetaSearch
+from tablebase import Tablebase, load_tablebase, main, position_index, tablebase_path
+
+class TestTablebase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        main(["--size", "3", "--out", cls.directory.name])
+        cls.tables = {mode: Tablebase(tablebase_path(mode, 3, cls.directory.name)) for mode in ("Simple", "General")}
+
+    @classmethod
+    def tearDownClass(cls):
+        for table in cls.tables.values():
+            table.close()
+        cls.directory.cleanup()
+
+    def random_position(self, rng, empties):
+        """Fill a 3x3 board randomly, leaving the given number of empty cells."""
+        board = Board(3)
+        cells = list(range(9))
+        rng.shuffle(cells)
+        for index in cells[empties:]:
+            board.set_code(index, rng.choice((1, 2)))
+        return board
+
+    def test_position_index_is_base_three(self):
+        """Test that cell i is digit i of the index."""
+        board = Board(3)
+        self.assertEqual(position_index(board.cells), 0)
+        board.place(0, 1, "O")
+        board.place(2, 2, "S")
+        self.assertEqual(position_index(board.cells), 2 * 3 + 1 * 3 ** 8)
+
+    def test_values_match_full_search(self):
+        """Test that stored values and moves agree with a search to the end of the game."""
+        rng = random.Random(7)
+        for mode in ("Simple", "General"):
+            for _ in range(12):
+                board = self.random_position(rng, rng.randint(3, 7))
+                entry = self.tables[mode].probe(board)
+                if mode == "Simple" and board.count_all_sos():
+                    self.assertIsNone(entry)
+                    continue
+                search = AlphaBetaSearch(time_limit=30.0, symmetry=False)
+                search.choose_move(board, mode)
+                move, value = entry
+                if mode == "Simple":
+                    # Search scores wins by how soon they come; the table only keeps the result
+                    self.assertEqual(value, (search.best_value > 0) - (search.best_value < 0))
+                else:
+                    self.assertEqual(value, search.best_value)
+                self.assertEqual(board.cells[move >> 2], EMPTY)
+
+    def test_full_board_has_no_move(self):
+        """Test that a full board probes as finished."""
+        board = self.random_position(random.Random(1), 0)
+        self.assertIsNone(self.tables["General"].probe(board))
+
+    def test_header_is_checked(self):
+        """Test that a file that is not a tablebase is rejected."""
+        path = os.path.join(self.directory.name, "junk.tb")
+        with open(path, "wb") as file:
+            file.write(b"not a tablebase at all")
+        with self.assertRaises(ValueError):
+            Tablebase(path)
+
+    def test_missing_table_loads_as_none(self):
+        """Test that sizes without a built table fall back to None."""
+        self.assertIsNone(load_tablebase("General", 3, self.directory.name + "-missing"))
+        self.assertIsNone(load_tablebase("General", 9, self.directory.name))
+        self.assertEqual(load_tablebase("Simple", 3, self.directory.name).mode_name, "Simple")
+
+if __name__ == "__main__":
+    unittest.main()
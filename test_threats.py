@@ -0,0 +1,116 @@
+import random
+import unittest
+from board import Board
+from threats import ThreatMap
+
+class TestThreatMap(unittest.TestCase):
+
+    def brute_force_completions(self, board):
+        """Probe every empty cell with both letters on a scratch copy."""
+        scratch = board.copy()
+        expected = {}
+        for row, col in board.empty_cells():
+            for letter in "SO":
+                scratch.place(row, col, letter)
+                count = scratch.count_sos_at(row, col)
+                scratch.clear(row, col)
+                if count:
+                    expected[(row, col, letter)] = count
+        return expected
+
+    def tracked_completions(self, board, threats):
+        """Read every scoring move out of the threat map."""
+        return {
+            (row, col, letter): threats.completions_at(row, col, letter)
+            for row, col in board.empty_cells()
+            for letter in "SO"
+            if threats.completions_at(row, col, letter)
+        }
+
+    def test_matches_brute_force_through_a_game(self):
+        """Test that incremental updates match a full probe after every move and undo."""
+        rng = random.Random(3)
+        board = Board(6)
+        threats = ThreatMap(board)
+        played = []
+        for _ in range(60):
+            if played and rng.random() < 0.2:
+                board.clear(*played.pop())
+            elif not board.is_full():
+                row, col = board.random_empty_cell(rng)
+                board.place(row, col, rng.choice("SO"))
+                played.append((row, col))
+            self.assertEqual(self.tracked_completions(board, threats), self.brute_force_completions(board))
+
+    def test_best_completion_prefers_most_lines(self):
+        """Test that the best completion is the move finishing the most SOS lines."""
+        board = Board(5)
+        threats = ThreatMap(board)
+        board.place(0, 0, "S")
+        board.place(0, 1, "O")
+        board.place(2, 0, "S")
+        board.place(1, 1, "O")
+        # An S at (0, 2) finishes the top row and the anti-diagonal through (1, 1)
+        self.assertEqual(threats.best_completion(), (0, 2, "S", 2))
+        self.assertEqual(threats.completions_at(2, 2, "S"), 1)
+        self.assertEqual(threats.completions_at(0, 2, "O"), 0)
+
+    def brute_force_poisoned(self, board):
+        """Place every letter on a scratch copy and look for lines left one letter short."""
+        scratch = board.copy()
+        expected = set()
+        for row, col in board.empty_cells():
+            for letter in "SO":
+                scratch.place(row, col, letter)
+                for triple in scratch.triples_at(scratch.index(row, col)):
+                    letters = [scratch.get(*scratch.position(cell)) for cell in triple]
+                    missing = [i for i, text in enumerate(letters) if text == " "]
+                    if len(missing) == 1 and all(
+                            letters[i] == "SOS"[i] for i in range(3) if i != missing[0]):
+                        expected.add((row, col, letter))
+                scratch.clear(row, col)
+        return expected
+
+    def test_poisoned_matches_brute_force(self):
+        """Test that the poisoned-move index matches a full probe as the board fills up."""
+        rng = random.Random(11)
+        board = Board(5)
+        threats = ThreatMap(board)
+        while not board.is_full():
+            row, col = board.random_empty_cell(rng)
+            board.place(row, col, rng.choice("SO"))
+            tracked = {
+                (row, col, letter)
+                for row, col in board.empty_cells()
+                for letter in "SO"
+                if threats.is_poisoned(row, col, letter)
+            }
+            self.assertEqual(tracked, self.brute_force_poisoned(board))
+
+    def test_random_safe_move_avoids_poisoned_moves(self):
+        """Test that safe moves never set up an SOS and None is returned on a full board."""
+        rng = random.Random(5)
+        board = Board(3)
+        threats = ThreatMap(board)
+        board.place(1, 1, "O")
+        for _ in range(30):
+            row, col, letter = threats.random_safe_move(rng)
+            self.assertFalse(threats.is_poisoned(row, col, letter))
+            self.assertEqual(letter, "O")  # Any S next to the centre O sets up S O _
+        for row, col in board.empty_cells():
+            board.place(row, col, "O")
+        self.assertIsNone(threats.random_safe_move(rng))
+
+    def test_built_from_existing_board(self):
+        """Test that a threat map attached to a partly filled board starts in sync."""
+        board = Board(3)
+        board.place(1, 0, "S")
+        board.place(1, 1, "O")
+        threats = ThreatMap(board)
+        self.assertEqual(threats.best_completion(), (1, 2, "S", 1))
+        board.place(1, 2, "O")
+        self.assertFalse(threats.has_completions())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from board import Board, S, O
+from game_record import GameRecordWriter, read_games
+from simulator import play_game
+from sos_numpy import np
+from symmetry import symmetry_maps
+from training_data import export, game_arrays, iter_batches, main, open_shards, record_from_result
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestTrainingData(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def records(self, games, size=5, mode_name="General"):
+        """Simulate games and return their records."""
+        return [record_from_result(play_game(size, mode_name, seed=seed, endgame_cells=0, record=True))
+                for seed in range(games)]
+
+    def test_positions_describe_the_game(self):
+        """Test that each row holds the board, mover, scores and result before that move."""
+        record = self.records(1)[0]
+        arrays = game_arrays(record)
+        moves = list(record)
+        self.assertEqual(len(arrays["to_move"]), len(moves))
+        board = Board(5)
+        scores = {"Blue": 0, "Red": 0}
+        winner = record.winner()
+        for number, (row, col, letter, player, sos) in enumerate(moves):
+            self.assertEqual(bytes(arrays["planes"][number].astype(np.uint8)), bytes(board.cells))
+            self.assertEqual(arrays["to_move"][number], ("Blue", "Red").index(player))
+            self.assertEqual(tuple(arrays["scores"][number]), (scores["Blue"], scores["Red"]))
+            expected = 0 if winner == "Draw" else 1 if winner == player else -1
+            self.assertEqual(arrays["outcome"][number], expected)
+            board.place(row, col, letter)
+            scores[player] += sos
+
+    def test_augmentation_adds_every_symmetry(self):
+        """Test that augmenting repeats each position under the 8 board symmetries."""
+        record = self.records(1)[0]
+        plain, augmented = game_arrays(record), game_arrays(record, augment=True)
+        count = len(plain["outcome"])
+        self.assertEqual(len(augmented["planes"]), 8 * count)
+        position = plain["planes"][count - 1]
+        for transform, mapping in enumerate(symmetry_maps(5)):
+            image = augmented["planes"][transform * count + count - 1]
+            for index in range(25):
+                self.assertEqual(image[mapping[index]], position[index])
+        self.assertTrue((augmented["outcome"][count:2 * count] == plain["outcome"]).all())
+
+    def test_export_shards_and_reads_memory_mapped(self):
+        """Test that positions are split into fixed-size shards and read back through mmap."""
+        records = self.records(6)
+        others = self.records(1, size=4) + self.records(2, mode_name="Simple")
+        stats = export(records + others, self.directory.name, 5, shard_positions=40)
+        self.assertEqual(stats["games"], 6)
+        self.assertEqual(stats["skipped"], 3)
+        self.assertEqual(stats["positions"], 6 * 25)
+        shards = open_shards(self.directory.name)
+        self.assertEqual(len(shards), stats["shards"])
+        self.assertEqual([len(shard["outcome"]) for shard in shards], [40, 40, 40, 30])
+        self.assertIsInstance(shards[0]["planes"], np.memmap)
+        self.assertEqual(shards[0]["planes"].shape, (40, 3, 5, 5))
+        # Every cell is exactly one of S, O or empty
+        self.assertTrue((shards[1]["planes"].sum(axis=1) == 1).all())
+        first = game_arrays(records[0])["planes"][3].reshape(5, 5)
+        self.assertTrue((shards[0]["planes"][3, 0] == (first == S)).all())
+        self.assertTrue((shards[0]["planes"][3, 1] == (first == O)).all())
+
+    def test_batches_cover_every_position(self):
+        """Test that batching, shuffled or not, visits each position once."""
+        export(self.records(4), self.directory.name, 5, shard_positions=32)
+        for rng in (None, np.random.default_rng(0)):
+            batches = list(iter_batches(self.directory.name, 10, rng))
+            self.assertEqual(sum(len(batch["to_move"]) for batch in batches), 100)
+            self.assertTrue(all(len(batch["planes"]) <= 10 for batch in batches))
+
+    def test_command_line_exports_record_files(self):
+        """Test that record files given on the command line are exported, keeping only --mode games."""
+        path = os.path.join(self.directory.name, "games.sgr")
+        with GameRecordWriter(path) as writer:
+            for record in self.records(2):
+                writer.write_game(5, "General", record)
+            for record in self.records(1, mode_name="Simple"):
+                writer.write_game(5, "Simple", record)
+        out = os.path.join(self.directory.name, "data")
+        main(["--records", path, "--size", "5", "--augment", "--out", out])
+        self.assertEqual(sum(len(shard["outcome"]) for shard in open_shards(out)), 2 * 25 * 8)
+        self.assertEqual(len(list(read_games(path))), 3)
+
+if __name__ == "__main__":
+    unittest.main()
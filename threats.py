@@ -0,0 +1,129 @@
+import random
+
+from board import CODES, LETTERS, EMPTY, S, O
+
+# An S can end two lines in each of the four directions; an O sits in the middle of at most four
+MAX_COMPLETIONS = 8
+
+# Random probes tried before a safe move is searched for by scanning the empty cells
+SAFE_MOVE_ATTEMPTS = 16
+
+
+class ThreatMap:
+    """Incremental map of (cell, letter) moves to the SOS lines they would complete or set up."""
+
+    def __init__(self, board):
+        self.board = board
+        self.completions = {}  # (index << 2 | letter code) -> completions, only for scoring moves
+        # (index << 2 | letter code) -> lines the move leaves one letter short (S_S, SO_, _OS),
+        # only for poisoned moves that hand the next player an SOS
+        self.poisoned = {}
+        # buckets[k] holds the move keys that complete exactly k lines
+        self.buckets = [set() for _ in range(MAX_COMPLETIONS + 1)]
+        for index in board.occupied_indices():
+            self.on_cell_changed(index)
+        board.attach(self)
+
+    def count_cell(self, index):
+        """Returns (S completions, S set-ups, O completions, O set-ups) for an empty cell.
+
+        A completion finishes an SOS line; a set-up leaves a line one letter short (S_S, SO_, _OS).
+        """
+        cells = self.board.cells
+        ends, middles = self.board.roles_at(index)
+        s_done = s_setups = o_done = o_setups = 0
+        # Lines the cell would end with an S
+        for middle, other in ends:
+            middle_code, other_code = cells[middle], cells[other]
+            if middle_code == O:
+                if other_code == S:
+                    s_done += 1
+                elif other_code == EMPTY:
+                    s_setups += 1
+            elif middle_code == EMPTY and other_code == S:
+                s_setups += 1
+        # Lines the cell would centre with an O
+        for first, last in middles:
+            first_code, last_code = cells[first], cells[last]
+            if first_code == S:
+                if last_code == S:
+                    o_done += 1
+                elif last_code == EMPTY:
+                    o_setups += 1
+            elif first_code == EMPTY and last_code == S:
+                o_setups += 1
+        return s_done, s_setups, o_done, o_setups
+
+    def count_completions(self, index, code):
+        """Counts the SOS lines that placing the letter code at the empty cell would complete."""
+        counts = self.count_cell(index)
+        return counts[0] if code == S else counts[2]
+
+    def update(self, key, done, setups):
+        """Stores a move's completion and set-up counts, moving it between completion buckets."""
+        previous = self.completions.get(key, 0)
+        if previous != done:
+            if previous:
+                self.buckets[previous].discard(key)
+            if done:
+                self.completions[key] = done
+                self.buckets[done].add(key)
+            else:
+                del self.completions[key]
+        if setups:
+            self.poisoned[key] = setups
+        elif key in self.poisoned:
+            del self.poisoned[key]
+
+    def on_cell_changed(self, index):
+        """Refreshes every cell within two steps that shares a line with the changed cell."""
+        cells = self.board.cells
+        update = self.update
+        for cell in self.board.neighbours_at(index):
+            if cells[cell] == EMPTY:
+                s_done, s_setups, o_done, o_setups = self.count_cell(cell)
+            else:
+                s_done = s_setups = o_done = o_setups = 0
+            update(cell << 2 | S, s_done, s_setups)
+            update(cell << 2 | O, o_done, o_setups)
+
+    def completions_at(self, row, col, letter):
+        """Returns how many SOS lines placing the letter at the position would complete."""
+        return self.completions.get((row * self.board.size + col) << 2 | CODES[letter], 0)
+
+    def best_completion(self):
+        """Returns (row, col, letter, count) for a move completing the most lines, or None."""
+        for count in range(MAX_COMPLETIONS, 0, -1):
+            if self.buckets[count]:
+                key = next(iter(self.buckets[count]))
+                row, col = self.board.position(key >> 2)
+                return row, col, LETTERS[key & 3], count
+        return None
+
+    def has_completions(self):
+        """Checks if any move on the board would complete an SOS."""
+        return bool(self.completions)
+
+    def is_poisoned(self, row, col, letter):
+        """Checks if placing the letter at the position would set up an SOS for the next player."""
+        return ((row * self.board.size + col) << 2 | CODES[letter]) in self.poisoned
+
+    def random_safe_move(self, rng=random):
+        """Returns a random (row, col, letter) that sets up no SOS, or None if every move does."""
+        board = self.board
+        empty_count = board.size * board.size - board.filled
+        if not empty_count or len(self.poisoned) >= 2 * empty_count:
+            return None
+        # Most moves are safe until late in the game, so sampling usually succeeds at once
+        for _ in range(SAFE_MOVE_ATTEMPTS):
+            row, col = board.random_empty_cell(rng)
+            letter = "S" if rng.random() < 0.5 else "O"
+            if not self.is_poisoned(row, col, letter):
+                return row, col, letter
+        safe_moves = [
+            (row, col, letter)
+            for row, col in board.empty_cells()
+            for letter in "SO"
+            if not self.is_poisoned(row, col, letter)
+        ]
+        return rng.choice(safe_moves) if safe_moves else None
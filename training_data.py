@@ -0,0 +1,200 @@
+import argparse
+import glob
+import os
+import re
+
+from board import CODES, EMPTY, S, O
+from game_record import GameRecord, encode_move, read_games
+from simulator import simulate
+from sos_numpy import np, require_numpy
+from symmetry import inverse_maps
+
+# Positions per shard; a shard's arrays are the only data held in memory while exporting
+SHARD_POSITIONS = 1 << 16
+
+# Arrays saved for every shard: S/O/empty planes, side to move (0 Blue, 1 Red),
+# scores before the move (Blue, Red) and the final result for the side to move (1, 0 or -1)
+ARRAYS = ("planes", "to_move", "scores", "outcome")
+
+PLAYERS = ("Blue", "Red")
+
+
+def shard_path(directory, number, name):
+    """Returns the .npy file holding one array of one shard."""
+    return os.path.join(directory, f"shard_{number:05d}_{name}.npy")
+
+
+def record_from_result(result):
+    """Returns the GameRecord of a simulator result played with record=True."""
+    size = result["board_size"]
+    data = b"".join(encode_move(size, *move) for move in result["record"])
+    return GameRecord(size, result["mode"], data)
+
+
+def game_arrays(record, augment=False):
+    """Returns the arrays (as in ARRAYS, planes still flat codes) for the position before every move.
+
+    With augment set, each position is repeated under all 8 rotations and reflections.
+    """
+    size = record.size
+    moves = list(record)
+    cells = bytearray(size * size)
+    boards = bytearray()
+    to_move, scores, outcome = [], [], []
+    score = dict.fromkeys(PLAYERS, 0)
+    winner = record.winner()
+    for row, col, letter, player, sos in moves:
+        boards += cells
+        to_move.append(PLAYERS.index(player))
+        scores.append((score["Blue"], score["Red"]))
+        outcome.append(0 if winner == "Draw" else 1 if winner == player else -1)
+        cells[row * size + col] = CODES[letter]
+        score[player] += sos
+
+    arrays = {
+        "planes": np.frombuffer(bytes(boards), dtype=np.int8).reshape(len(moves), size * size),
+        "to_move": np.array(to_move, dtype=np.int8),
+        "scores": np.array(scores, dtype=np.int16).reshape(len(moves), 2),
+        "outcome": np.array(outcome, dtype=np.int8),
+    }
+    if augment:
+        # inverse_maps gives, for each cell of the transformed board, the cell it came from
+        transforms = np.array(inverse_maps(size), dtype=np.intp)
+        arrays["planes"] = arrays["planes"][:, transforms].transpose(1, 0, 2).reshape(-1, size * size)
+        for name in ("to_move", "scores", "outcome"):
+            arrays[name] = np.concatenate([arrays[name]] * len(transforms))
+    return arrays
+
+
+class ShardWriter:
+    """Collects positions into fixed-size buffers and saves each full buffer as one shard of .npy files."""
+
+    def __init__(self, directory, size, shard_positions=SHARD_POSITIONS):
+        require_numpy()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.size = size
+        self.shard_positions = shard_positions
+        self.buffers = {
+            "planes": np.empty((shard_positions, size * size), dtype=np.int8),
+            "to_move": np.empty(shard_positions, dtype=np.int8),
+            "scores": np.empty((shard_positions, 2), dtype=np.int16),
+            "outcome": np.empty(shard_positions, dtype=np.int8),
+        }
+        self.filled = 0
+        self.shards = 0
+        self.positions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, arrays):
+        """Appends rows of game_arrays output, saving shards as the buffers fill."""
+        count = len(arrays["to_move"])
+        start = 0
+        while start < count:
+            take = min(count - start, self.shard_positions - self.filled)
+            for name, buffer in self.buffers.items():
+                buffer[self.filled:self.filled + take] = arrays[name][start:start + take]
+            self.filled += take
+            start += take
+            if self.filled == self.shard_positions:
+                self.flush()
+        self.positions += count
+
+    def flush(self):
+        """Saves the buffered positions as the next shard."""
+        if not self.filled:
+            return
+        rows = self.filled
+        codes = self.buffers["planes"][:rows].reshape(rows, self.size, self.size)
+        planes = np.stack([codes == S, codes == O, codes == EMPTY], axis=1).astype(np.uint8)
+        np.save(shard_path(self.directory, self.shards, "planes"), planes)
+        for name in ("to_move", "scores", "outcome"):
+            np.save(shard_path(self.directory, self.shards, name), self.buffers[name][:rows])
+        self.shards += 1
+        self.filled = 0
+
+    def close(self):
+        """Saves the last, partly filled shard."""
+        self.flush()
+
+
+def export(records, directory, size, mode_name="General", augment=False, shard_positions=SHARD_POSITIONS):
+    """Writes the positions of every record of the given board size and mode as shards; returns counts.
+
+    Scores and outcomes mean different things in Simple and General games, so one export
+    holds a single mode.
+    """
+    games = skipped = 0
+    with ShardWriter(directory, size, shard_positions) as writer:
+        for record in records:
+            if record.size != size or record.mode_name != mode_name or not len(record):
+                skipped += 1
+                continue
+            writer.add(game_arrays(record, augment))
+            games += 1
+    return {"games": games, "skipped": skipped, "positions": writer.positions, "shards": writer.shards}
+
+
+def open_shards(directory):
+    """Returns every shard in a directory, in order, as a dict of read-only memory-mapped arrays."""
+    require_numpy()
+    numbers = sorted(
+        int(re.match(r"shard_(\d+)_planes\.npy$", os.path.basename(path)).group(1))
+        for path in glob.glob(os.path.join(directory, "shard_*_planes.npy"))
+    )
+    return [{name: np.load(shard_path(directory, number, name), mmap_mode="r") for name in ARRAYS}
+            for number in numbers]
+
+
+def iter_batches(directory, batch_size, rng=None):
+    """Yields dicts of in-memory arrays with up to batch_size positions, one shard at a time.
+
+    Given a NumPy Generator as rng, shards and the positions within each are shuffled.
+    """
+    shards = open_shards(directory)
+    if rng is not None:
+        shards = [shards[index] for index in rng.permutation(len(shards))]
+    for shard in shards:
+        count = len(shard["outcome"])
+        order = rng.permutation(count) if rng is not None else None
+        for start in range(0, count, batch_size):
+            if order is None:
+                yield {name: np.asarray(array[start:start + batch_size]) for name, array in shard.items()}
+            else:
+                rows = np.sort(order[start:start + batch_size])  # Sorted rows read the file in order
+                yield {name: array[rows] for name, array in shard.items()}
+
+
+def main(argv=None):
+    """Exports training data from game record files or freshly simulated games."""
+    parser = argparse.ArgumentParser(description="Export SOS positions as sharded NumPy training data.")
+    parser.add_argument("--records", nargs="*", default=[], help="game record files to export")
+    parser.add_argument("--simulate", type=int, default=0, help="also export this many newly simulated games")
+    parser.add_argument("--size", type=int, default=8, help="board size (games of other sizes are skipped)")
+    parser.add_argument("--mode", choices=["Simple", "General"], default="General",
+                        help="mode to export and to simulate (games of the other mode are skipped)")
+    parser.add_argument("--strategy", default="heuristic", help="strategy of simulated games")
+    parser.add_argument("--workers", type=int, default=None, help="simulator worker processes (default: all cores)")
+    parser.add_argument("--augment", action="store_true", help="add all 8 rotations and reflections")
+    parser.add_argument("--shard-positions", type=int, default=SHARD_POSITIONS, help="positions per shard")
+    parser.add_argument("--out", required=True, help="directory to write the shards to")
+    args = parser.parse_args(argv)
+
+    def records():
+        for path in args.records:
+            yield from read_games(path)
+        if args.simulate:
+            for result in simulate(args.simulate, args.size, args.mode, args.strategy, args.strategy,
+                                   workers=args.workers, record=True):
+                yield record_from_result(result)
+
+    print(export(records(), args.out, args.size, args.mode, args.augment, args.shard_positions))
+
+
+if __name__ == "__main__":
+    main()